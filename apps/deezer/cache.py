@@ -0,0 +1,252 @@
+import json
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict, namedtuple
+import redis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Two-tier cache for Deezer responses, used by DeezerClient and
+# AsyncDeezerClient:
+#   1. a per-process LRU (no network hop at all for hot tracks and searches),
+#   2. a Redis tier shared by every worker, so one worker's fetch serves all.
+# Each entry is fresh until `fresh_until`; between that and `stale_until` it
+# is still served, while a background thread refetches it
+# (stale-while-revalidate). Not-found answers are cached too, under the
+# shorter DEEZER_CACHE_NEGATIVE_TTL. Failures (timeouts, 5xx) are never cached.
+
+KEY_PREFIX = 'deezer'
+
+Entry = namedtuple('Entry', ['value', 'fresh_until', 'stale_until'])
+
+
+def make_key(endpoint, value):
+    """
+    'search', '  Daft   PUNK ' -> 'deezer:search:daft punk'
+    """
+    normalized = ' '.join(str(value).split()).lower()
+    return f'{KEY_PREFIX}:{endpoint}:{normalized}'
+
+
+class LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, now):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry.stale_until <= now:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class RedisTier:
+    """
+    Redis errors only disable the tier for `retry_after` seconds; the local
+    tier and Deezer itself keep working.
+    """
+
+    def __init__(self, client, retry_after=30):
+        self.client = client
+        self.retry_after = retry_after
+        self.down_until = 0
+
+    def _available(self):
+        return time.monotonic() >= self.down_until
+
+    def _failed(self, e):
+        logger.warning("Deezer cache: Redis unavailable: %s", e)
+        self.down_until = time.monotonic() + self.retry_after
+
+    def get(self, key):
+        if not self._available():
+            return None
+        try:
+            raw = self.client.get(key)
+        except redis.RedisError as e:
+            self._failed(e)
+            return None
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return Entry(data['v'], data['f'], data['s'])
+
+    def set(self, key, entry):
+        if not self._available():
+            return
+        ttl_ms = int((entry.stale_until - time.time()) * 1000)
+        if ttl_ms <= 0:
+            return
+        data = json.dumps({'v': entry.value, 'f': entry.fresh_until, 's': entry.stale_until})
+        try:
+            self.client.set(key, data, px=ttl_ms)
+        except redis.RedisError as e:
+            self._failed(e)
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=f'{KEY_PREFIX}:*'))
+            if keys:
+                self.client.delete(*keys)
+        except redis.RedisError as e:
+            self._failed(e)
+
+
+class TieredCache:
+    def __init__(self, local, shared=None):
+        self.local = local
+        self.shared = shared
+        self.counters = Counter()
+        self.counters_lock = threading.Lock()
+        self.refreshing = set()
+        self.refreshing_lock = threading.Lock()
+
+    def _count(self, name):
+        with self.counters_lock:
+            self.counters[name] += 1
+
+    def stats(self):
+        """
+        Counters since process start: local_hits, redis_hits, stale_hits,
+        negative_hits, misses, refreshes.
+        """
+        with self.counters_lock:
+            return dict(self.counters)
+
+    def _lookup(self, key, now):
+        entry = self.local.get(key, now)
+        if entry is not None:
+            return entry, 'local_hits'
+        if self.shared is not None:
+            entry = self.shared.get(key)
+            if entry is not None and now < entry.stale_until:
+                self.local.set(key, entry)
+                return entry, 'redis_hits'
+        return None, None
+
+    def _store(self, key, value, ttl):
+        now = time.time()
+        if value is None:
+            ttl = settings.DEEZER_CACHE_NEGATIVE_TTL
+        stale = settings.DEEZER_CACHE_STALE_TTL
+        entry = Entry(value, now + ttl, now + ttl + stale)
+        self.local.set(key, entry)
+        if self.shared is not None:
+            self.shared.set(key, entry)
+
+    def _fetch(self, key, fetch, ttl):
+        value, cacheable = fetch()
+        if cacheable:
+            self._store(key, value, ttl)
+        return value
+
+    def _refresh(self, key, fetch, ttl):
+        try:
+            self._fetch(key, fetch, ttl)
+        except Exception:
+            logger.exception("Deezer cache: refreshing %s failed", key)
+        finally:
+            with self.refreshing_lock:
+                self.refreshing.discard(key)
+
+    def _revalidate(self, key, fetch, ttl):
+        with self.refreshing_lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+        self._count('refreshes')
+        threading.Thread(target=self._refresh, args=(key, fetch, ttl), daemon=True).start()
+
+    def get_or_fetch(self, key, fetch, ttl):
+        """
+        `fetch()` returns (value, cacheable); value None with cacheable True
+        is a not-found answer and gets negative-cached.
+        """
+        now = time.time()
+        entry, tier = self._lookup(key, now)
+        if entry is None:
+            self._count('misses')
+            return self._fetch(key, fetch, ttl)
+        return self._hit(key, entry, tier, now, fetch, ttl)
+
+    async def aget_or_fetch(self, key, fetch, afetch, ttl):
+        """
+        get_or_fetch for coroutines: a miss awaits `afetch()`, which returns
+        the same (value, cacheable). Redis is only used from a worker thread,
+        and stale entries are refreshed in the background with `fetch()`.
+        """
+        now = time.time()
+        entry, tier = self.local.get(key, now), 'local_hits'
+        if entry is None:
+            entry, tier = await sync_to_async(self._lookup, thread_sensitive=False)(key, now)
+        if entry is None:
+            self._count('misses')
+            value, cacheable = await afetch()
+            if cacheable:
+                await sync_to_async(self._store, thread_sensitive=False)(key, value, ttl)
+            return value
+        return self._hit(key, entry, tier, now, fetch, ttl)
+
+    def _hit(self, key, entry, tier, now, fetch, ttl):
+        if now >= entry.fresh_until:
+            self._count('stale_hits')
+            self._revalidate(key, fetch, ttl)
+        else:
+            self._count(tier)
+        if entry.value is None:
+            self._count('negative_hits')
+        return entry.value
+
+    def clear(self):
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+        with self.counters_lock:
+            self.counters.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """
+    Process-wide cache, or None when DEEZER_CACHE_ENABLED is off.
+    """
+    global _cache
+    if not settings.DEEZER_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                shared = None
+                if settings.DEEZER_CACHE_REDIS:
+                    client = redis.Redis(
+                        host=settings.REDIS_HOST,
+                        port=int(settings.REDIS_PORT),
+                        socket_timeout=settings.DEEZER_CACHE_REDIS_TIMEOUT,
+                        socket_connect_timeout=settings.DEEZER_CACHE_REDIS_TIMEOUT,
+                    )
+                    shared = RedisTier(client)
+                _cache = TieredCache(LRUCache(settings.DEEZER_CACHE_SIZE), shared)
+    return _cache
@@ -1,41 +1,267 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .cache import get_cache, make_key
+
+logger = logging.getLogger(__name__)
 
 DEEZER_API_URL = "https://api.deezer.com"
 
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Deezer's "no data" error code, returned with HTTP 200 for unknown ids.
+NOT_FOUND_CODE = 800
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _base_url():
+    return _setting('DEEZER_API_URL', DEEZER_API_URL).rstrip('/')
+
+
+def _timeout():
+    return _setting('DEEZER_TIMEOUT', (3.05, 10))
+
+
+def _parse(status_code, payload):
+    """
+    Deezer answers some failures (unknown id, quota) with HTTP 200 and an
+    {"error": {...}} body; treat those like any other failure.
+    """
+    if status_code != 200:
+        return None
+    if isinstance(payload, dict) and 'error' in payload:
+        return None
+    return payload
+
+
+def _is_not_found(status_code, payload):
+    if status_code == 404:
+        return True
+    error = payload.get('error') if isinstance(payload, dict) else None
+    return isinstance(error, dict) and error.get('code') == NOT_FOUND_CODE
+
+
+def _retry():
+    """
+    Retry policy of both clients: up to DEEZER_MAX_RETRIES retries of
+    429/5xx and connection errors, exponential backoff, Retry-After honoured.
+    """
+    return Retry(
+        total=_setting('DEEZER_MAX_RETRIES', 3),
+        backoff_factor=_setting('DEEZER_BACKOFF_FACTOR', 0.3),
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Process-wide pooled session: keeps connections to Deezer alive between
+    requests and retries 429/5xx with exponential backoff.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = _setting('DEEZER_POOL_SIZE', 10)
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=_retry())
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
 
 class DeezerClient:
-    def __init__(self):
-        pass
+    """
+    Responses go through the tiered cache (apps/deezer/cache.py) unless
+    DEEZER_CACHE_ENABLED is off or `cache=False` is passed.
+    """
+
+    def __init__(self, session=None, timeout=None, cache=None):
+        self.session = session or get_session()
+        self.timeout = timeout or _timeout()
+        self.cache = get_cache() if cache is None else (cache or None)
+
+    def _fetch(self, path, params=None):
+        """
+        Returns (payload, cacheable): payload is None on any failure, and
+        cacheable is False for failures that are worth retrying later.
+        """
+        url = f"{_base_url()}{path}"
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            payload = response.json() if response.status_code in (200, 404) else None
+        except (requests.RequestException, ValueError) as e:
+            logger.warning("Deezer request %s failed: %s", path, e)
+            return None, False
+        result = _parse(response.status_code, payload)
+        return result, result is not None or _is_not_found(response.status_code, payload)
+
+    def _get(self, endpoint, value, path, params=None):
+        if self.cache is None:
+            return self._fetch(path, params)[0]
+        return self.cache.get_or_fetch(
+            make_key(endpoint, value),
+            lambda: self._fetch(path, params),
+            settings.DEEZER_CACHE_TTL[endpoint],
+        )
 
     def get_track(self, track_id):
         """
         Get a track by its ID from Deezer.
         """
-        url = f"{DEEZER_API_URL}/track/{track_id}"
-        response = requests.get(url)
-        return response.json() if response.status_code == 200 else None
+        return self._get('track', track_id, f"/track/{track_id}")
+
+    def get_tracks(self, track_ids):
+        """
+        Several tracks at once, fetched concurrently over the pooled session;
+        returns {track_id: track or None}.
+        """
+        track_ids = list(dict.fromkeys(track_ids))
+        if len(track_ids) <= 1:
+            return {track_id: self.get_track(track_id) for track_id in track_ids}
+        workers = min(len(track_ids), _setting('DEEZER_POOL_SIZE', 10))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(track_ids, executor.map(self.get_track, track_ids)))
 
     def get_album(self, album_id):
         """
         Get an album by its ID from Deezer.
         """
-        url = f"{DEEZER_API_URL}/album/{album_id}"
-        response = requests.get(url)
-        return response.json() if response.status_code == 200 else None
+        return self._get('album', album_id, f"/album/{album_id}")
 
     def get_artist(self, artist_id):
         """
         Get an artist by their ID from Deezer.
         """
-        url = f"{DEEZER_API_URL}/artist/{artist_id}"
-        response = requests.get(url)
-        return response.json() if response.status_code == 200 else None
+        return self._get('artist', artist_id, f"/artist/{artist_id}")
 
     def search_tracks(self, query):
         """
-        Search for tracks by name or keyword.
+        Search for tracks by name or keyword. Queries differing only in case
+        or whitespace share a cache entry.
+        """
+        query = ' '.join(query.split())
+        return self._get('search', query, "/search", params={'q': query})
+
+
+class AsyncDeezerClient:
+    """
+    DeezerClient's API as coroutines, over an httpx.AsyncClient with the same
+    timeouts, retry policy (_retry) and response cache. Use it as an async
+    context manager: the connection pool lives as long as the block, since an
+    httpx pool is bound to the event loop it was opened on.
+    """
+
+    def __init__(self, client=None, timeout=None, cache=None):
+        self.client = client
+        self.owns_client = client is None
+        self.timeout = timeout or _timeout()
+        self.cache = get_cache() if cache is None else (cache or None)
+        self.sync = DeezerClient(timeout=self.timeout, cache=False)
+
+    async def __aenter__(self):
+        if self.owns_client:
+            connect, read = self.timeout if isinstance(self.timeout, tuple) else (self.timeout, self.timeout)
+            pool_size = _setting('DEEZER_POOL_SIZE', 10)
+            self.client = httpx.AsyncClient(
+                timeout=httpx.Timeout(read, connect=connect),
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self.owns_client:
+            await self.client.aclose()
+            self.client = None
+
+    async def _fetch(self, path, params=None):
+        """
+        Same (payload, cacheable) as DeezerClient._fetch, retrying like the
+        pooled session does.
         """
-        url = f"{DEEZER_API_URL}/search"
-        params = {'q': query}
-        response = requests.get(url, params=params)
-        return response.json() if response.status_code == 200 else None
+        url = f"{_base_url()}{path}"
+        retry = _retry()
+        for attempt in range(retry.total + 1):
+            last = attempt == retry.total
+            delay = retry.backoff_factor * (2 ** attempt)
+            try:
+                response = await self.client.get(url, params=params)
+            except httpx.HTTPError as e:
+                if last:
+                    logger.warning("Deezer request %s failed: %s", path, e)
+                    return None, False
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code in retry.status_forcelist and not last:
+                retry_after = response.headers.get('Retry-After', '')
+                if retry.respect_retry_after_header and retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+                await asyncio.sleep(delay)
+                continue
+
+            try:
+                payload = response.json() if response.status_code in (200, 404) else None
+            except ValueError as e:
+                logger.warning("Deezer request %s failed: %s", path, e)
+                return None, False
+            result = _parse(response.status_code, payload)
+            return result, result is not None or _is_not_found(response.status_code, payload)
+
+    async def _get(self, endpoint, value, path, params=None):
+        if self.cache is None:
+            return (await self._fetch(path, params))[0]
+        return await self.cache.aget_or_fetch(
+            make_key(endpoint, value),
+            lambda: self.sync._fetch(path, params),
+            lambda: self._fetch(path, params),
+            settings.DEEZER_CACHE_TTL[endpoint],
+        )
+
+    async def get_track(self, track_id):
+        return await self._get('track', track_id, f"/track/{track_id}")
+
+    async def get_tracks(self, track_ids):
+        """
+        Several tracks at once, fetched concurrently; returns
+        {track_id: track or None}.
+        """
+        track_ids = list(dict.fromkeys(track_ids))
+        tracks = await asyncio.gather(*(self.get_track(track_id) for track_id in track_ids))
+        return dict(zip(track_ids, tracks))
+
+    async def get_album(self, album_id):
+        return await self._get('album', album_id, f"/album/{album_id}")
+
+    async def get_artist(self, artist_id):
+        return await self._get('artist', artist_id, f"/artist/{artist_id}")
+
+    async def search_tracks(self, query):
+        query = ' '.join(query.split())
+        return await self._get('search', query, "/search", params={'q': query})
+
+
+async def fetch_tracks(track_ids):
+    """
+    AsyncDeezerClient.get_tracks with a pool opened for the call; sync code
+    runs it with async_to_sync.
+    """
+    async with AsyncDeezerClient() as client:
+        return await client.get_tracks(track_ids)
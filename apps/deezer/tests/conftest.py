@@ -0,0 +1,26 @@
+import fakeredis
+import pytest
+from apps.deezer.cache import get_cache
+from apps.deezer.tests.stub_server import DeezerStubServer
+
+
+@pytest.fixture
+def deezer_stub(settings):
+    stub = DeezerStubServer().start()
+    settings.DEEZER_API_URL = stub.url
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture(autouse=True)
+def deezer_cache(monkeypatch):
+    cache = get_cache()
+    if cache is not None and cache.shared is not None:
+        # In-memory Redis so the shared tier is exercised without a server
+        monkeypatch.setattr(cache.shared, 'client', fakeredis.FakeRedis(server=fakeredis.FakeServer()))
+        monkeypatch.setattr(cache.shared, 'down_until', 0)
+    if cache is not None:
+        cache.clear()
+    yield cache
+    if cache is not None:
+        cache.clear()
@@ -0,0 +1,60 @@
+import json
+import threading
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+class DeezerStubServer:
+    """
+    Minimal local stand-in for api.deezer.com.
+
+    Responses are queued per path with `add(path, status, body)`; once a
+    path's queue is down to one response it keeps serving that one. Unknown
+    paths get Deezer's own "no data" error body with HTTP 200.
+    """
+
+    def __init__(self):
+        self.responses = defaultdict(deque)
+        self.requests = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                stub.requests.append(self.path)
+                queue = stub.responses.get(parsed.path)
+                if queue:
+                    status, body = queue.popleft() if len(queue) > 1 else queue[0]
+                else:
+                    status, body = 200, {'error': {'type': 'DataException', 'message': 'no data', 'code': 800}}
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    def add(self, path, status, body):
+        self.responses[path].append((status, body))
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,168 @@
+import time
+import httpx
+import pytest
+from apps.deezer.deezer_client import AsyncDeezerClient, DeezerClient, fetch_tracks
+
+
+TRACK = {"id": 3135556, "title": "Harder, Better, Faster, Stronger", "artist": {"name": "Daft Punk"}}
+
+
+def test_deezer_client_get_track(deezer_stub):
+    """
+        # Fetch a track through the pooled session
+        # Ensure the stub payload is returned
+    """
+    deezer_stub.add("/track/3135556", 200, TRACK)
+
+    assert DeezerClient().get_track(3135556) == TRACK
+
+
+def test_deezer_client_retries_server_errors(deezer_stub):
+    """
+        # Stub answers 503 then 200
+        # Ensure the client retries and returns the track
+    """
+    deezer_stub.add("/track/3135556", 503, {})
+    deezer_stub.add("/track/3135556", 200, TRACK)
+
+    assert DeezerClient().get_track(3135556) == TRACK
+    assert len(deezer_stub.requests) == 2
+
+
+def test_deezer_client_error_payload(deezer_stub):
+    """
+        # Deezer answers an unknown id with 200 and an error body
+        # Ensure the client returns None
+    """
+    assert DeezerClient().get_track(1) is None
+
+
+def test_deezer_client_unreachable(settings):
+    """
+        # Deezer cannot be reached
+        # Ensure the client returns None instead of raising
+    """
+    settings.DEEZER_API_URL = "http://127.0.0.1:9"
+
+    assert DeezerClient(timeout=0.5).get_track(1) is None
+
+
+def test_deezer_client_caches_tracks(deezer_stub, deezer_cache):
+    """
+        # Fetch the same track twice
+        # Ensure Deezer is called once and the second answer comes from the local tier
+    """
+    deezer_stub.add("/track/3135556", 200, TRACK)
+
+    assert DeezerClient().get_track(3135556) == TRACK
+    assert DeezerClient().get_track(3135556) == TRACK
+    assert len(deezer_stub.requests) == 1
+    assert deezer_cache.stats() == {'misses': 1, 'local_hits': 1}
+
+
+def test_deezer_client_shared_tier(deezer_stub, deezer_cache):
+    """
+        # Local tier is empty (another worker) but Redis has the track
+        # Ensure Deezer is not called again
+    """
+    deezer_stub.add("/track/3135556", 200, TRACK)
+    DeezerClient().get_track(3135556)
+    deezer_cache.local.clear()
+
+    assert DeezerClient().get_track(3135556) == TRACK
+    assert len(deezer_stub.requests) == 1
+    assert deezer_cache.stats()['redis_hits'] == 1
+
+
+def test_deezer_client_negative_cache(deezer_stub, deezer_cache):
+    """
+        # Unknown track requested twice
+        # Ensure the not-found answer is cached
+    """
+    assert DeezerClient().get_track(1) is None
+    assert DeezerClient().get_track(1) is None
+    assert len(deezer_stub.requests) == 1
+    assert deezer_cache.stats()['negative_hits'] == 1
+
+
+def test_deezer_client_search_normalized(deezer_stub):
+    """
+        # Same search with different case and spacing
+        # Ensure both share one cache entry
+    """
+    results = {"data": [TRACK], "total": 1}
+    deezer_stub.add("/search", 200, results)
+
+    assert DeezerClient().search_tracks("Daft Punk") == results
+    assert DeezerClient().search_tracks("  daft   PUNK ") == results
+    assert deezer_stub.requests == ["/search?q=Daft+Punk"]
+
+
+def test_deezer_client_stale_while_revalidate(deezer_stub, deezer_cache, settings):
+    """
+        # Cached track is past its TTL
+        # Ensure the stale copy is served while it is refreshed in the background
+    """
+    settings.DEEZER_CACHE_TTL = {**settings.DEEZER_CACHE_TTL, 'track': 0}
+    renamed = {**TRACK, "title": "Around the World"}
+    deezer_stub.add("/track/3135556", 200, TRACK)
+    deezer_stub.add("/track/3135556", 200, renamed)
+
+    assert DeezerClient().get_track(3135556) == TRACK
+    assert DeezerClient().get_track(3135556) == TRACK
+    for _ in range(100):
+        if not deezer_cache.refreshing:
+            break
+        time.sleep(0.01)
+
+    assert DeezerClient().get_track(3135556) == renamed
+    assert deezer_cache.stats()['refreshes'] >= 1
+
+
+def test_deezer_client_get_tracks(deezer_stub):
+    """
+        # Fetch two known ids, one repeated, and an unknown id at once
+        # Ensure every distinct id is requested once and unknown ids map to None
+    """
+    other = {**TRACK, "id": 3135553, "title": "One More Time"}
+    deezer_stub.add("/track/3135556", 200, TRACK)
+    deezer_stub.add("/track/3135553", 200, other)
+
+    tracks = DeezerClient(cache=False).get_tracks([3135556, 3135553, 3135556, 1])
+    assert tracks == {3135556: TRACK, 3135553: other, 1: None}
+    assert len(deezer_stub.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_async_deezer_client_retries_and_caches(deezer_cache, settings):
+    """
+        # Fetch a track twice through the async client, first answer is a 503
+        # Ensure it retries, and the second call is a cache hit without any request
+    """
+    settings.DEEZER_BACKOFF_FACTOR = 0
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        if len(requests) == 1:
+            return httpx.Response(503, json={})
+        return httpx.Response(200, json=TRACK)
+
+    transport = httpx.MockTransport(handler)
+    async with AsyncDeezerClient(httpx.AsyncClient(transport=transport)) as client:
+        assert await client.get_track(3135556) == TRACK
+        assert await client.get_track(3135556) == TRACK
+
+    assert requests == ["/track/3135556", "/track/3135556"]
+    assert deezer_cache.stats() == {'misses': 1, 'local_hits': 1}
+
+
+@pytest.mark.asyncio
+async def test_fetch_tracks(deezer_stub):
+    """
+        # Fetch a known and an unknown id through the async client's pool
+        # Ensure the track is returned and the unknown id maps to None
+    """
+    deezer_stub.add("/track/3135556", 200, TRACK)
+
+    assert await fetch_tracks([3135556, 1]) == {3135556: TRACK, 1: None}
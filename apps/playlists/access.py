@@ -0,0 +1,145 @@
+import json
+import logging
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
+from apps.playlists import licensing
+from apps.playlists.models import Playlist
+
+
+logger = logging.getLogger(__name__)
+
+# "Can user U read / write / vote on playlist P", answered by one query:
+# the playlist row plus two EXISTS subqueries on the users_saved and
+# invited_users join tables (both indexed on (playlist_id, user_id)).
+#
+# Decisions are cached in Redis, one hash per playlist
+# (playlist_access:<playlist> -> user -> decision) so invalidating a playlist
+# is a single DEL. They only depend on the creator, visibility, license and
+# the two memberships, never on the track list, so track mutations (and
+# revision bumps) keep them; changes to any of those drop the hash (see
+# apps/playlists/signals.py). For 'location_time' licenses the decision also
+# carries the vote window and geofence (licensing.rules), so a vote is checked
+# against the cached instants instead of recomputing them; a window that has
+# closed since is recomputed by resolving again with refresh=True.
+
+READ = 'read'
+WRITE = 'write'
+VOTE = 'vote'
+
+KEY_PREFIX = 'playlist_access'
+
+_client = None
+
+
+def cache_key(playlist_id):
+    return f'{KEY_PREFIX}:{playlist_id}'
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=int(settings.REDIS_PORT),
+            socket_timeout=settings.PLAYLIST_ACCESS_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.PLAYLIST_ACCESS_REDIS_TIMEOUT,
+        )
+    return _client
+
+
+def _member_of(field, user_id):
+    through = field.through
+    return through.objects.filter(**{
+        field.field.m2m_field_name(): OuterRef('pk'),
+        f'{field.field.m2m_reverse_field_name()}_id': user_id,
+    })
+
+
+def access_queryset(user_id):
+    return Playlist.objects.annotate(
+        is_saved=Exists(_member_of(Playlist.users_saved, user_id)),
+        is_invited=Exists(_member_of(Playlist.invited_users, user_id)),
+    )
+
+
+def decide(playlist, user_id):
+    """
+    Write access is granted on the same terms as read access: playlists are
+    collaborative, anyone who can see one may edit its tracks. VOTE is the
+    invitation part of the license, see licensing.vote_denial for the rest.
+    """
+    read = playlist.public or playlist.creator_id == user_id or playlist.is_saved
+    vote = playlist.license_type != 'invite_only' or playlist.is_invited
+    return {READ: read, WRITE: read, VOTE: vote, **licensing.rules(playlist, timezone.now())}
+
+
+def _cached(playlist_id, user_id):
+    if not settings.PLAYLIST_ACCESS_CACHE_ENABLED:
+        return None
+    try:
+        raw = get_client().hget(cache_key(playlist_id), str(user_id))
+    except redis.RedisError as e:
+        logger.warning("Playlist access cache unavailable: %s", e)
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+def _store(playlist_id, user_id, decision):
+    if not settings.PLAYLIST_ACCESS_CACHE_ENABLED:
+        return
+    key = cache_key(playlist_id)
+    try:
+        pipe = get_client().pipeline()
+        pipe.hset(key, str(user_id), json.dumps(decision))
+        pipe.expire(key, settings.PLAYLIST_ACCESS_CACHE_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning("Playlist access cache unavailable: %s", e)
+
+
+def _drop(playlist_id):
+    try:
+        get_client().delete(cache_key(playlist_id))
+    except redis.RedisError as e:
+        logger.warning("Playlist access cache unavailable: %s", e)
+
+
+def invalidate(playlist_id):
+    """
+    Drop every cached decision for a playlist. Done again after commit so a
+    request that read the old state in the meantime cannot re-cache it.
+    """
+    if not settings.PLAYLIST_ACCESS_CACHE_ENABLED:
+        return
+    _drop(playlist_id)
+    transaction.on_commit(lambda: _drop(playlist_id))
+
+
+def resolve(user, playlist_id, refresh=False):
+    """
+    Returns (playlist, decision), or (None, None) if the playlist does not
+    exist. On a cache hit the playlist is a lazy object, loaded on first
+    attribute access. The mutations and votes use it straight away, so for
+    them a hit only saves the membership subqueries and the license rules;
+    views that need nothing but the id (next_up, playlist_presence) skip the
+    playlist query altogether (see test_next_up_cached_access_queries).
+    """
+    decision = None if refresh else _cached(playlist_id, user.pk)
+    if decision is not None:
+        return SimpleLazyObject(lambda: Playlist.objects.get(id=playlist_id)), decision
+
+    playlist = access_queryset(user.pk).filter(id=playlist_id).first()
+    if playlist is None:
+        return None, None
+    decision = decide(playlist, user.pk)
+    _store(playlist_id, user.pk, decision)
+    return playlist, decision
+
+
+def can_access(user, playlist_id, action):
+    _, decision = resolve(user, playlist_id)
+    return decision is not None and decision[action]
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Playlist, PlaylistTrack
+from .models import Playlist, PlaylistTrack, Vote
 from apps.tracks.models import Track
 
 class PlaylistTrackInline(admin.TabularInline):
@@ -21,7 +21,7 @@ class PlaylistAdmin(admin.ModelAdmin):
     inlines = [PlaylistTrackInline]
 
     def voted_users_display(self, obj):
-        return ", ".join([user.username for user in obj.users_already_voted.all()])
+        return ", ".join([vote.user.username for vote in obj.votes.select_related('user')])
     voted_users_display.short_description = "Users Voted"
 
 class PlaylistTrackAdmin(admin.ModelAdmin):
@@ -39,5 +39,11 @@ def track_artist(self, obj):
     def track_points(self, obj):
         return obj.track.points
     
+class VoteAdmin(admin.ModelAdmin):
+    list_display = ['playlist', 'user', 'playlist_track', 'created_at']
+    list_filter = ['playlist']
+    raw_id_fields = ['playlist', 'user', 'playlist_track']
+
 admin.site.register(Playlist, PlaylistAdmin)
 admin.site.register(PlaylistTrack, PlaylistTrackAdmin)
+admin.site.register(Vote, VoteAdmin)
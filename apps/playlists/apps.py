@@ -4,3 +4,6 @@
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.playlists'
+
+    def ready(self):
+        from apps.playlists import signals  # noqa: F401
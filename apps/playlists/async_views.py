@@ -0,0 +1,101 @@
+import json
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed, Throttled
+from rest_framework.settings import api_settings
+from . import broadcast, mutations
+from .decorators import get_user_coordinates
+
+
+# Async versions of the playlist mutation views, same URLs shape, bodies and
+# responses as views.py. Django's async ORM has no transactions and runs each
+# query through its own sync_to_async call, so instead the token check, the
+# access check and the mutation share a single worker-thread hop; the deltas
+# committed there are then awaited with group_send on the event loop instead
+# of each going back through async_to_sync.
+#
+# Served with settings.PLAYLIST_ASYNC_VIEWS, in place of the sync views and
+# under async/... (see urls.py). Being plain Django views they run the token
+# check and DRF's DEFAULT_THROTTLE_CLASSES themselves, in the same order as
+# APIView: a request is authenticated first, then throttled.
+
+
+def _authenticate(request):
+    auth = get_authorization_header(request).split()
+    if len(auth) != 2 or auth[0].lower() != b'token':
+        raise AuthenticationFailed('Authentication credentials were not provided.')
+    user, _ = TokenAuthentication().authenticate_credentials(auth[1].decode())
+    return user
+
+
+def _check_throttles(request):
+    """
+    Like APIView.check_throttles: every throttle records the request, and
+    Throttled is raised with the longest wait if any of them refused it.
+    """
+    throttles = [throttle_class() for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES]
+    refused = [throttle for throttle in throttles if not throttle.allow_request(request, None)]
+    if refused:
+        waits = [throttle.wait() for throttle in refused]
+        raise Throttled(max((wait for wait in waits if wait is not None), default=None))
+
+
+def _apply(request, playlist_id, action, data):
+    try:
+        request.user = _authenticate(request)
+        _check_throttles(request)
+    except AuthenticationFailed as e:
+        return JsonResponse({'detail': str(e.detail)}, status=401), []
+    except Throttled as e:
+        response = JsonResponse({'detail': str(e.detail)}, status=429)
+        if e.wait is not None:
+            response['Retry-After'] = '%d' % e.wait
+        return response, []
+
+    with broadcast.deferred_sends() as outbox:
+        body, status_code = mutations.apply(action, request.user, playlist_id, data, get_user_coordinates(request))
+    return JsonResponse(body, status=status_code), outbox
+
+
+async def _handle(request, playlist_id, action):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    response, outbox = await sync_to_async(_apply)(request, playlist_id, action, data)
+    await broadcast.send_all(outbox)
+    return response
+
+
+@csrf_exempt
+@require_POST
+async def add_track(request, playlist_id):
+    return await _handle(request, playlist_id, mutations.ADD)
+
+
+@csrf_exempt
+@require_POST
+async def add_tracks_bulk(request, playlist_id):
+    return await _handle(request, playlist_id, mutations.ADD_BULK)
+
+
+@csrf_exempt
+@require_POST
+async def move_track_in_playlist(request, playlist_id):
+    return await _handle(request, playlist_id, mutations.MOVE)
+
+
+@csrf_exempt
+@require_POST
+async def delete_track_from_playlist(request, playlist_id):
+    return await _handle(request, playlist_id, mutations.REMOVE)
+
+
+@csrf_exempt
+@require_POST
+async def vote_for_track(request, playlist_id):
+    return await _handle(request, playlist_id, mutations.VOTE)
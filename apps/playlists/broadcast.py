@@ -0,0 +1,219 @@
+import json
+import threading
+from contextlib import contextmanager
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models import F
+from apps.playlists.models import Playlist, PlaylistTrack
+from apps.tracks.models import Track
+
+try:
+    import orjson
+except ImportError:  # optional: json is used without it
+    orjson = None
+
+
+# Delta protocol for the playlist_{id} channel group.
+#
+# Every mutation bumps Playlist.revision and sends one small op instead of the
+# whole track list:
+#   insert  {'track': <track entry>}
+#   insert_many  {'tracks': [<track entry>, ...]}  appended in this order
+#   move    {'tracks': [{'id', 'position'}, ...]}
+#   remove  {'id': <playlist_track_id>}
+#   points  {'tracks': [{'id', 'points', 'position'}, ...]}
+#   meta    {'fields': ['name', 'public', 'shared_with', ...]}  refetch the info
+# A client that sees a revision other than last + 1 asks for a snapshot over
+# the socket ({"type": "snapshot", "revision": <last seen>}).
+#
+# Channel-layer messages carry the client-facing JSON in 'text', encoded once
+# here rather than by each of the group's consumers, which forward it as is.
+
+OP_INSERT = 'insert'
+OP_INSERT_MANY = 'insert_many'
+OP_MOVE = 'move'
+OP_REMOVE = 'remove'
+OP_POINTS = 'points'
+OP_META = 'meta'
+
+_local = threading.local()
+
+
+def group_name(playlist_id):
+    return f'playlist_{playlist_id}'
+
+
+def bump_revision(playlist_id):
+    """
+    Atomically increment the playlist revision and return the new value.
+    Must run inside the mutation's transaction so revisions follow commit order.
+    """
+    Playlist.objects.filter(id=playlist_id).update(revision=F('revision') + 1)
+    return Playlist.objects.filter(id=playlist_id).values_list('revision', flat=True).get()
+
+
+def track_entry(pt):
+    """
+    Wire format of a PlaylistTrack; expects `track` to be select_related.
+    """
+    return {
+        'id': pt.id,
+        'position': pt.position,
+        'points': pt.points,
+        'track': {
+            'id': pt.track.id,
+            'deezer_track_id': pt.track.deezer_track_id,
+            'name': pt.track.name,
+            'artist': pt.track.artist,
+            'album': pt.track.album,
+            'url': pt.track.url,
+            'picture_small': pt.track.picture_small,
+            'picture_medium': pt.track.picture_medium,
+        },
+    }
+
+
+TRACK_FIELDS = ('id', 'deezer_track_id', 'name', 'artist', 'album', 'url', 'picture_small', 'picture_medium')
+
+
+def snapshot(playlist_id):
+    """
+    Revision and tracks of a playlist, or None if it does not exist. Both come
+    from one statement (playlist LEFT JOIN its tracks) and so from one
+    database snapshot: a mutation committing meanwhile cannot leave tracks
+    newer than the revision reported.
+    """
+    rows = Playlist.objects.filter(id=playlist_id).order_by('tracks__position').values_list(
+        'revision', 'tracks__id', 'tracks__position', 'tracks__points',
+        *(f'tracks__track__{field}' for field in TRACK_FIELDS),
+    )
+    revision = None
+    tracks = []
+    for revision, pt_id, position, points, *track in rows:
+        if pt_id is not None:
+            track = Track(**dict(zip(TRACK_FIELDS, track)))
+            tracks.append(track_entry(PlaylistTrack(id=pt_id, position=position, points=points, track=track)))
+    if revision is None:
+        return None
+    return {'revision': revision, 'tracks': tracks}
+
+
+def encode(payload):
+    if orjson is not None:
+        return orjson.dumps(payload).decode()
+    return json.dumps(payload)
+
+
+def delta_payload(playlist_id, revision, op, data):
+    return {
+        'type': 'playlist_delta',
+        'playlist_id': int(playlist_id),
+        'revision': revision,
+        'op': op,
+        'data': data,
+    }
+
+
+def voting_payload(playlist_id, state, opens_at, closes_at):
+    return {
+        'type': 'playlist_voting',
+        'playlist_id': int(playlist_id),
+        'state': state,
+        'opens_at': opens_at,
+        'closes_at': closes_at,
+    }
+
+
+def update_payload(playlist_id, data):
+    return {
+        'playlist_id': playlist_id,
+        'type': 'playlist_update',
+        'data': data,
+    }
+
+
+def send_delta(playlist_id, revision, op, data):
+    """
+    Queue the op for the playlist group once the surrounding transaction
+    commits, so listeners never see a revision that was rolled back.
+    """
+    message = {
+        'type': 'playlist.delta',
+        'playlist_id': int(playlist_id),
+        'revision': revision,
+        'op': op,
+        'text': encode(delta_payload(playlist_id, revision, op, data)),
+    }
+    group_send_on_commit(playlist_id, message)
+
+
+def publish(playlist_id, op, data):
+    """
+    Bump the revision and broadcast one op; returns the new revision.
+    """
+    with transaction.atomic():
+        revision = bump_revision(playlist_id)
+        send_delta(playlist_id, revision, op, data)
+    return revision
+
+
+def send_voting_state(playlist_id, state, opens_at, closes_at):
+    """
+    "Voting opened/closed" notice for location_time playlists; not part of
+    the delta sequence, so no revision bump.
+    """
+    opens_at = opens_at.isoformat() if opens_at else None
+    closes_at = closes_at.isoformat() if closes_at else None
+    message = {
+        'type': 'playlist.voting',
+        'playlist_id': int(playlist_id),
+        'state': state,
+        'text': encode(voting_payload(playlist_id, state, opens_at, closes_at)),
+    }
+    group_send_on_commit(playlist_id, message)
+
+
+def send_update(playlist_id, data):
+    """
+    Free-form playlist_update notice (e.g. a user was invited).
+    """
+    message = {
+        'type': 'playlist.update',
+        'playlist_id': playlist_id,
+        'text': encode(update_payload(playlist_id, data)),
+    }
+    group_send_on_commit(playlist_id, message)
+
+
+def group_send_on_commit(playlist_id, message):
+    def _send():
+        outbox = getattr(_local, 'outbox', None)
+        if outbox is not None:
+            outbox.append((group_name(playlist_id), message))
+        else:
+            async_to_sync(get_channel_layer().group_send)(group_name(playlist_id), message)
+
+    transaction.on_commit(_send)
+
+
+@contextmanager
+def deferred_sends():
+    """
+    Collect the messages committed inside the block instead of sending them
+    from this thread. Async callers run the mutation in a worker thread and
+    await send_all() on the event loop, rather than hopping back to it with
+    async_to_sync for every message.
+    """
+    previous = getattr(_local, 'outbox', None)
+    _local.outbox = outbox = []
+    try:
+        yield outbox
+    finally:
+        _local.outbox = previous
+
+
+async def send_all(outbox):
+    layer = get_channel_layer()
+    for group, message in outbox:
+        await layer.group_send(group, message)
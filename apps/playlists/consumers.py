@@ -1,22 +1,152 @@
+import asyncio
 import json
+from django.conf import settings
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from . import mutations, presence
+from .access import READ, resolve
+from .broadcast import (
+    deferred_sends, delta_payload, encode, send_all, snapshot, update_payload, voting_payload,
+)
+from .outbox import RESYNC, Outbox
+
+
+# Besides the broadcasts, a connected client can mutate the playlist over the
+# socket:
+#   {"type": "command", "id": <request id>, "action": "add" | "move" | "remove" | "vote",
+#    "data": {<same body as the HTTP endpoint>}, "latitude": .., "longitude": ..}
+# and gets back {"type": "ack", "id": <request id>, "status": <HTTP status>,
+# "data": <HTTP response body>}. The resulting delta reaches every socket of
+# the group, this one included, as usual.
+
+
+def command_coordinates(message):
+    try:
+        return (float(message['latitude']), float(message['longitude']))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def run_command(user, playlist_id, action, data, latlon):
+    with deferred_sends() as outbox:
+        body, status = mutations.apply(action, user, playlist_id, data, latlon)
+    return body, status, outbox
+
 
 class PlaylistConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         self.playlist_id = self.scope['url_route']['kwargs']['playlist_id']
         self.group_name = f'playlist_{self.playlist_id}'
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close()
+            return
+        playlist, decision = await database_sync_to_async(resolve)(user, self.playlist_id)
+        if playlist is None or not decision[READ]:
+            await self.close()
+            return
         print(f"WebSocket connected to playlist {self.playlist_id}")
+        self.outbox = Outbox(self.group_name, settings.PLAYLIST_WS_MAX_PENDING_DELTAS)
         await self.channel_layer.group_add(self.group_name, self.channel_name)
-        await self.accept()
+        await self.accept(self.scope.get('auth_subprotocol'))
+        self.writer = asyncio.create_task(self.write_outbox())
+        presence.tracker.join(int(self.playlist_id), self.channel_name)
+        self.present = True
 
     async def disconnect(self, close_code):
         print(f"WebSocket disconnected {close_code}")
+        writer = getattr(self, 'writer', None)
+        if writer:
+            writer.cancel()
+        if getattr(self, 'present', False):
+            presence.tracker.leave(int(self.playlist_id), self.channel_name)
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
-    async def playlist_update(self, event):
-        print(f"Sending playlist update to the client: {event}")
+    async def write_outbox(self):
+        """
+        Sends the group messages queued by the handlers below, at the pace
+        the client reads them.
+        """
+        while True:
+            kind, text = await self.outbox.get()
+            if kind == RESYNC:
+                data = await database_sync_to_async(snapshot)(self.playlist_id)
+                if data is None:
+                    continue
+                self.outbox.resynced(data['revision'])
+                text = encode({
+                    'type': 'playlist_snapshot',
+                    'playlist_id': int(self.playlist_id),
+                    'requested_revision': None,
+                    'revision': data['revision'],
+                    'data': data['tracks'],
+                })
+            await self.send(text_data=text)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            message = json.loads(text_data or '')
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+
+        if message.get('type') == 'command':
+            await self.command(message)
+        elif message.get('type') == 'snapshot':
+            # Client detected a revision gap; send the current state so it can resync
+            data = await database_sync_to_async(snapshot)(self.playlist_id)
+            if data is None:
+                await self.send(text_data=json.dumps({'type': 'error', 'error': 'Playlist not found'}))
+                return
+            await self.send(text_data=json.dumps({
+                'type': 'playlist_snapshot',
+                'playlist_id': int(self.playlist_id),
+                'requested_revision': message.get('revision'),
+                'revision': data['revision'],
+                'data': data['tracks'],
+            }))
+
+    async def command(self, message):
+        action = message.get('action')
+        data = message.get('data', {})
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            body, status = {'detail': 'Authentication credentials were not provided.'}, 401
+        elif action not in mutations.ACTIONS:
+            body, status = {'error': f'Unknown action: {action}'}, 400
+        elif not isinstance(data, dict):
+            body, status = {'error': 'data must be an object'}, 400
+        else:
+            body, status, outbox = await database_sync_to_async(run_command)(
+                user, self.playlist_id, action, data, command_coordinates(message)
+            )
+            await send_all(outbox)
+
         await self.send(text_data=json.dumps({
-            'playlist_id': event['playlist_id'],
-            'type': 'playlist_update',
-            'data': event['data'],
+            'type': 'ack',
+            'id': message.get('id'),
+            'status': status,
+            'data': body,
         }))
+
+    # Group messages carry the encoded text (broadcast.encode); the fallbacks
+    # are for messages sent without it.
+
+    async def playlist_update(self, event):
+        self.outbox.put_update(
+            event.get('text') or encode(update_payload(event['playlist_id'], event['data']))
+        )
+
+    async def playlist_delta(self, event):
+        self.outbox.put_delta(event['revision'], event.get('text') or encode(
+            delta_payload(event['playlist_id'], event['revision'], event['op'], event['data'])
+        ))
+
+    async def playlist_voting(self, event):
+        self.outbox.put_voting(event.get('text') or encode(
+            voting_payload(event['playlist_id'], event['state'], event['opens_at'], event['closes_at'])
+        ))
+
+    async def playlist_presence(self, event):
+        self.outbox.put_presence(event['text'])
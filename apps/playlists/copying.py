@@ -0,0 +1,100 @@
+from django.db import connection, transaction
+from apps.playlists.broadcast import OP_INSERT_MANY, publish, track_entry
+from apps.playlists.models import Playlist, PlaylistTrack, POSITION_GAP
+from apps.playlists.ordering import next_position
+from apps.playlists import ranking
+
+
+# Copy tracks between playlists in SQL: one statement whatever the playlist
+# sizes, instead of loading every PlaylistTrack row into Python. Used by
+# Playlist.duplicate / merge / append_from.
+#
+# duplicate copies the rows as they are (positions and points). merge and
+# append_from append the tracks of the sources after the target's own:
+# tracks already in the target, or in an earlier source, are skipped; the
+# others keep their relative order (sources in the given order, each in
+# playlist order) and get fresh positions POSITION_GAP apart in the same
+# INSERT. Votes do not carry over, so appended tracks start at 0 points.
+
+COPY_TRACKS_SQL = f"""
+    INSERT INTO {PlaylistTrack._meta.db_table} (playlist_id, track_id, position, points)
+    SELECT %s, track_id, position, points
+    FROM {PlaylistTrack._meta.db_table}
+    WHERE playlist_id = %s
+"""
+
+APPEND_TRACKS_SQL = f"""
+    INSERT INTO {PlaylistTrack._meta.db_table} (playlist_id, track_id, position, points)
+    SELECT %(target)s, track_id,
+           %(start)s + ROW_NUMBER() OVER (ORDER BY source_order, position, id) * {POSITION_GAP}, 0
+    FROM (
+        SELECT DISTINCT ON (pt.track_id) pt.track_id, source.source_order, pt.position, pt.id
+        FROM {PlaylistTrack._meta.db_table} pt
+        JOIN unnest(%(sources)s::bigint[]) WITH ORDINALITY AS source(playlist_id, source_order)
+            ON source.playlist_id = pt.playlist_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {PlaylistTrack._meta.db_table} existing
+            WHERE existing.playlist_id = %(target)s AND existing.track_id = pt.track_id
+        )
+        ORDER BY pt.track_id, source.source_order, pt.position, pt.id
+    ) first_copy
+    RETURNING id
+"""
+
+
+def copy_tracks(source_id, target_id):
+    """
+    Copy every track of `source_id` with its position and points into the
+    empty playlist `target_id`; returns the number of tracks copied.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(COPY_TRACKS_SQL, [target_id, source_id])
+        return cursor.rowcount
+
+
+# Playlist fields a duplicate takes from its source: metadata and every
+# licensing setting, so a copy of a location_time playlist enforces the same
+# window and area. Not copied: invited users (the source owner's
+# invitations), who saved it, the revision and the derived vote_opens_at /
+# vote_closes_at / geohash, which save() recomputes.
+DUPLICATED_FIELDS = (
+    'name', 'description', 'public', 'event', 'auto_order',
+    'license_type', 'vote_start_time', 'vote_end_time', 'timezone',
+    'latitude', 'longitude', 'allowed_radius_meters',
+)
+
+
+def duplicate(source, user, **overrides):
+    """
+    New playlist owned by `user` with the DUPLICATED_FIELDS and tracks of
+    `source`, saved in the user's playlists; `overrides` replace playlist
+    fields (None keeps the source value). Returns (playlist, number of tracks).
+    """
+    fields = {field: getattr(source, field) for field in DUPLICATED_FIELDS}
+    fields.update({field: value for field, value in overrides.items() if value is not None})
+    with transaction.atomic():
+        playlist = Playlist.objects.create(creator=user, **fields)
+        count = copy_tracks(source.id, playlist.id)
+        user.saved_playlists.add(playlist)
+    return playlist, count
+
+
+def append_tracks(target_id, source_ids):
+    """
+    Append the tracks of `source_ids` to `target_id` as described above and
+    broadcast them as one insert_many delta. Returns the new PlaylistTracks
+    in playlist order.
+    """
+    source_ids = [source_id for source_id in dict.fromkeys(source_ids) if source_id != target_id]
+    if not source_ids:
+        return []
+    with transaction.atomic():
+        ranking.lock_playlist(target_id)
+        start = next_position(target_id) - POSITION_GAP
+        with connection.cursor() as cursor:
+            cursor.execute(APPEND_TRACKS_SQL, {'target': target_id, 'start': start, 'sources': source_ids})
+            ids = [row[0] for row in cursor.fetchall()]
+        added = list(PlaylistTrack.objects.filter(id__in=ids).select_related('track').order_by('position'))
+        if added:
+            publish(target_id, OP_INSERT_MANY, {'tracks': [track_entry(pt) for pt in added]})
+    return added
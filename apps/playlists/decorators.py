@@ -1,10 +1,9 @@
 from functools import wraps
 from rest_framework.response import Response
 from rest_framework import status
-from apps.playlists.models import Playlist
-from datetime import datetime, timedelta
-from django.shortcuts import get_object_or_404
-from geopy.distance import geodesic
+from apps.playlists.access import READ, VOTE, resolve
+from apps.playlists.licensing import vote_denial, window_expired
+from django.utils import timezone
 
 
 def get_user_coordinates(request):
@@ -15,23 +14,49 @@ def get_user_coordinates(request):
     except (TypeError, ValueError):
         return None
 
+def playlist_access(user, playlist_id):
+    """
+    (playlist, None) if `user` can use the playlist, else (None, (body, status)).
+    """
+    if not playlist_id:
+        return None, ({'error': 'Missing playlist id'}, 400)
+    playlist, decision = resolve(user, playlist_id)
+    if playlist is None:
+        return None, ({'error': 'Playlist not found'}, 404)
+    if not decision[READ]:
+        return None, ({'error': 'Permission denied for this playlist'}, 403)
+    return playlist, None
+
+
+def vote_access(user, playlist_id, latlon):
+    """
+    Same as playlist_access() for a vote under the playlist's license.
+    """
+    playlist, decision = resolve(user, playlist_id)
+    if playlist is None:
+        return None, ({"detail": "Playlist not found"}, status.HTTP_404_NOT_FOUND)
+    now_ts = timezone.now().timestamp()
+    if window_expired(decision, now_ts):
+        playlist, decision = resolve(user, playlist_id, refresh=True)
+
+    denial = vote_denial(decision, decision[VOTE], latlon, now_ts)
+    if denial:
+        return None, ({"detail": denial}, status.HTTP_403_FORBIDDEN)
+    return playlist, None
+
+
 def check_access_to_playlist(view_func):
+    """
+    The playlist loaded for the check is handed to the view as
+    request.playlist.
+    """
     @wraps(view_func)
     def _wrapped_view(request, *args, **kwargs):
-        user = request.user
-        playlist_id = kwargs.get('playlist_id')
-        print('check_access_to_playlist')
-        if not playlist_id:
-            return Response({'error': 'Missing playlist id'}, status=400)
-
-        try:
-            playlist = Playlist.objects.get(id=playlist_id)
-        except Playlist.DoesNotExist:
-            return Response({'error': 'Playlist not found'}, status=404)
-        print(playlist.public)
-        if user not in playlist.users_saved.all() and not playlist.public and playlist.creator != user:
-            return Response({'error': 'Permission denied for this playlist'}, status=403)
+        playlist, error = playlist_access(request.user, kwargs.get('playlist_id'))
+        if error:
+            return Response(*error)
 
+        request.playlist = playlist
         return view_func(request, *args, **kwargs)
     return _wrapped_view
 
@@ -39,68 +64,10 @@ def _wrapped_view(request, *args, **kwargs):
 def check_license(view_func):
     @wraps(view_func)
     def _wrapped_view(request, *args, **kwargs):
-        user = request.user
-        playlist_id = kwargs.get("playlist_id")
-        playlist = get_object_or_404(Playlist, id=playlist_id)
-        latlon = get_user_coordinates(request)
-        print(latlon)
-        print(playlist.license_type)
-
-        if playlist.license_type == "open":
-            return view_func(request, *args, **kwargs)
-
-        elif playlist.license_type == "invite_only":
-            if user.is_authenticated and user in playlist.invited_users.all():
-                return view_func(request, *args, **kwargs)
-            return Response(
-                {"detail": "You are not invited to vote on this playlist."},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-
-        elif playlist.license_type == "location_time":
-            now = datetime.now().time()
-            print(now)
-            #change later for Singapore time properly
-            now = (datetime.utcnow() + timedelta(hours=8)).time()
-            print(now)
-
-            if not (playlist.vote_start_time and playlist.vote_end_time):
-                return Response(
-                    {"detail": "Voting time window not configured."},
-                    status=status.HTTP_403_FORBIDDEN,
-                )
-            if not (playlist.vote_start_time <= now <= playlist.vote_end_time):
-                return Response(
-                    {"detail": "Voting is not allowed at this time."},
-                    status=status.HTTP_403_FORBIDDEN,
-                )
-
-            latlon = get_user_coordinates(request)
-            print(latlon)
-            if not latlon:
-                return Response(
-                    {"detail": "User location is missing."},
-                    status=status.HTTP_403_FORBIDDEN,
-                )
-
-            if not (playlist.latitude and playlist.longitude and playlist.allowed_radius_meters):
-                return Response(
-                    {"detail": "Playlist location settings not configured."},
-                    status=status.HTTP_403_FORBIDDEN,
-                )
-
-            distance = geodesic(latlon, (playlist.latitude, playlist.longitude)).meters
-            if distance > playlist.allowed_radius_meters:
-                return Response(
-                    {"detail": "You are not within the allowed voting area."},
-                    status=status.HTTP_403_FORBIDDEN,
-                )
-
-            return view_func(request, *args, **kwargs)
-
-        return Response(
-            {"detail": "Voting not allowed under current license settings."},
-            status=status.HTTP_403_FORBIDDEN,
-        )
+        playlist, error = vote_access(request.user, kwargs.get("playlist_id"), get_user_coordinates(request))
+        if error:
+            return Response(*error)
+        request.playlist = playlist
+        return view_func(request, *args, **kwargs)
 
-    return _wrapped_view
\ No newline at end of file
+    return _wrapped_view
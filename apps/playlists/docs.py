@@ -45,6 +45,113 @@
 )
 
 
+save_shared_playlist_schema = extend_schema(
+    methods=["POST"],
+    summary="Save a copy of a playlist",
+    description="Creates a playlist owned by the user with the tracks of the given playlist, "
+                "in the same order and with their points.",
+    parameters=[
+        OpenApiParameter(name="playlist_id", location=OpenApiParameter.PATH, type=int, required=True),
+    ],
+    request=SaveSharedPlaylistRequestSerializer,
+    responses={
+        201: OpenApiResponse(
+            response=SaveSharedPlaylistResponseSerializer,
+            description="Copy created",
+            examples=[
+                OpenApiExample(
+                    "Success",
+                    value={"message": "Playlist saved successfully.", "playlist_id": 12, "track_count": 200}
+                )
+            ]
+        ),
+        401: OpenApiResponse(
+            description="Unauthorized",
+            response=UnauthorizedResponseSerializer,
+            examples=[
+                OpenApiExample(
+                    name="Unauthorized",
+                    value={"detail": "Authentication credentials were not provided."},
+                )
+            ]
+        ),
+        403: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="No access to this playlist",
+            examples=[
+                OpenApiExample("Permission Denied", value={"error": "Permission denied for this playlist"})
+            ]
+        ),
+        404: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Playlist not found",
+            examples=[
+                OpenApiExample("Not Found", value={"error": "Playlist not found"})
+            ]
+        ),
+    }
+)
+
+
+merge_playlists_schema = extend_schema(
+    methods=["POST"],
+    summary="Append the tracks of other playlists",
+    description="Appends the tracks of the source playlists, in the given order, after the playlist's own. "
+                "Tracks it already has (or that appear in an earlier source) are skipped; the others keep "
+                "their relative order and start with 0 points. Listeners get a single insert_many delta.",
+    parameters=[
+        OpenApiParameter(name="playlist_id", location=OpenApiParameter.PATH, type=int, required=True),
+    ],
+    request=MergePlaylistsRequestSerializer,
+    responses={
+        200: OpenApiResponse(
+            response=MergePlaylistsResponseSerializer,
+            description="Tracks appended",
+            examples=[
+                OpenApiExample(
+                    "Success",
+                    value={"message": "Playlists merged successfully.", "track_ids": [42, 7, 13]}
+                )
+            ]
+        ),
+        400: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Invalid source_ids",
+            examples=[
+                OpenApiExample("Invalid", value={"error": "source_ids must be a non-empty list of playlist ids"})
+            ]
+        ),
+        401: OpenApiResponse(
+            description="Unauthorized",
+            response=UnauthorizedResponseSerializer,
+            examples=[
+                OpenApiExample(
+                    name="Unauthorized",
+                    value={"detail": "Authentication credentials were not provided."},
+                )
+            ]
+        ),
+        403: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="No access to the playlist or to one of the sources",
+            examples=[
+                OpenApiExample(
+                    "Source Denied",
+                    value={"error": "Permission denied for this playlist", "playlist_id": 12}
+                )
+            ]
+        ),
+        404: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Playlist or source not found",
+            examples=[
+                OpenApiExample("Source Missing", value={"error": "Playlist not found", "playlist_id": 12})
+            ]
+        ),
+    }
+)
+
+
 get_playlist_info_schema = extend_schema(
     methods=["GET"],
     summary="Get playlist details",
@@ -54,7 +161,14 @@
             required=True,
             location=OpenApiParameter.PATH,
             type=int,
-        )
+        ),
+        OpenApiParameter(
+            name="If-None-Match",
+            location=OpenApiParameter.HEADER,
+            type=str,
+            required=False,
+            description='ETag of a previous response ("<playlist_id>-<revision>-<digest>"); 304 if neither the playlist nor its tracks and users changed',
+        ),
     ],
     responses={
         200: OpenApiResponse(
@@ -85,6 +199,7 @@
                 )
             ]
         ),
+        304: OpenApiResponse(description="Not modified since the ETag given in If-None-Match"),
         404: OpenApiResponse(
             response=ErrorResponseSerializer,
             description="Playlist not found",
@@ -136,6 +251,15 @@
                 )
             ]
         ),
+        400: OpenApiResponse(
+            description="auto_order is not a valid boolean",
+            examples=[
+                OpenApiExample(
+                    "Invalid auto_order",
+                    value={"auto_order": ["Must be a valid boolean."]}
+                )
+            ]
+        ),
         403: OpenApiResponse(
             response=ErrorResponseSerializer,
             description="User does not have permission to update this playlist",
@@ -243,7 +367,14 @@
             location=OpenApiParameter.PATH,
             type=int,
             required=True,
-        )
+        ),
+        OpenApiParameter(
+            name="If-None-Match",
+            location=OpenApiParameter.HEADER,
+            type=str,
+            required=False,
+            description='ETag of a previous response ("<playlist_id>-<revision>-<digest>"); 304 if neither the playlist nor its tracks and users changed',
+        ),
     ],
     responses={
         200: OpenApiResponse(
@@ -276,6 +407,7 @@
                 )
             ]
         ),
+        304: OpenApiResponse(description="Not modified since the ETag given in If-None-Match"),
         404: OpenApiResponse(
             response=ErrorResponseSerializer,
             description="Playlist not found",
@@ -364,6 +496,63 @@
 )
 
 
+add_tracks_bulk_schema = extend_schema(
+    methods=["POST"],
+    summary="Add several tracks to playlist",
+    description="Appends the tracks in request order with a single broadcast. Ids are track ids or Deezer "
+                "ids; unknown ones are fetched from Deezer. Tracks already in the playlist are skipped.",
+    parameters=[
+        OpenApiParameter(name="playlist_id", location=OpenApiParameter.PATH, type=int, required=True),
+    ],
+    request=AddTracksBulkRequestSerializer,
+    responses={
+        201: OpenApiResponse(
+            response=AddTracksBulkResponseSerializer,
+            description="Tracks added",
+            examples=[
+                OpenApiExample(
+                    "Success",
+                    value={"status": "tracks added", "track_ids": [42, 43], "skipped": [7], "not_found": ["1"]}
+                )
+            ]
+        ),
+        200: OpenApiResponse(
+            response=AddTracksBulkResponseSerializer,
+            description="Every track was already in the playlist",
+        ),
+        400: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Invalid track_ids",
+            examples=[
+                OpenApiExample("Not a list", value={"error": "track_ids must be a non-empty list"}),
+                OpenApiExample("Too many", value={"error": "At most 500 tracks per request"}),
+            ]
+        ),
+        401: OpenApiResponse(
+            description="Unauthorized",
+            response=UnauthorizedResponseSerializer,
+            examples=[
+                OpenApiExample(
+                    name="Unauthorized",
+                    value={"detail": "Authentication credentials were not provided."},
+                )
+            ]
+        ),
+        403: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="No access to this playlist",
+        ),
+        404: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Playlist not found, or none of the tracks exist",
+            examples=[
+                OpenApiExample("Deezer Missing", value={"error": "Tracks not found on Deezer", "not_found": ["1"]})
+            ]
+        ),
+    }
+)
+
+
 move_track_in_playlist_schema = extend_schema(
     methods=["POST"],
     summary="Reorder tracks in a playlist",
@@ -483,9 +672,36 @@
 )
 
 
+LISTING_PARAMETERS = [
+    OpenApiParameter(
+        name="cursor",
+        location=OpenApiParameter.QUERY,
+        type=int,
+        required=False,
+        description="Return playlists with an id greater than this value (use next_cursor from the previous page).",
+    ),
+    OpenApiParameter(
+        name="limit",
+        location=OpenApiParameter.QUERY,
+        type=int,
+        required=False,
+        description="Page size, capped by PLAYLIST_MAX_PAGE_SIZE. Without cursor or limit the full list is returned; "
+                    "with only a cursor the page size defaults to PLAYLIST_PAGE_SIZE.",
+    ),
+    OpenApiParameter(
+        name="include_tracks",
+        location=OpenApiParameter.QUERY,
+        type=str,
+        required=False,
+        description="true (default), false, count or preview(n).",
+    ),
+]
+
+
 get_user_saved_playlists_schema = extend_schema(
     methods=["GET"],
     summary="Get user saved or created playlists",
+    parameters=LISTING_PARAMETERS,
     responses={
         200: OpenApiResponse(
             response=UserSavedPlaylistsResponseSerializer,
@@ -508,6 +724,7 @@
 get_all_shared_playlists_schema = extend_schema(
     methods=["GET"],
     summary="Get all shared public playlists",
+    parameters=LISTING_PARAMETERS,
     responses={
         200: OpenApiResponse(
             response=SharedPlaylistsResponseSerializer,
@@ -710,13 +927,16 @@
             ]
         ),
         404: OpenApiResponse(
-            description="Playlist not found",
-            response=ErrorDetailSerializer,
+            description="Playlist not found, or the track was removed before the vote was recorded",
             examples=[
                 OpenApiExample(
                     name="Not found",
                     value={"detail": "Playlist not found"},
-                )
+                ),
+                OpenApiExample(
+                    name="Track Missing",
+                    value={"error": "Track not found in playlist"},
+                ),
             ]
         ),
         401: OpenApiResponse(
@@ -736,6 +956,7 @@
 get_user_saved_events_schema = extend_schema(
     methods=["GET"],
     summary="Get user saved events",
+    parameters=LISTING_PARAMETERS,
     responses={
         200: EventsResponseSerializer,
         401: OpenApiResponse(
@@ -755,6 +976,7 @@
 get_all_shared_events_schema = extend_schema(
     methods=["GET"],
     summary="Get all shared events",
+    parameters=LISTING_PARAMETERS,
     responses={
         200: AllSharedEventsResponseSerializer,
         401: OpenApiResponse(
@@ -768,4 +990,169 @@
             ]
         ),
     },
-)
\ No newline at end of file
+)
+
+next_up_schema = extend_schema(
+    methods=["GET"],
+    summary="Get the next tracks to be played",
+    description="Top of the playlist in play order. For events with auto_order the order follows the votes.",
+    parameters=[
+        OpenApiParameter(
+            name="playlist_id",
+            location=OpenApiParameter.PATH,
+            type=int,
+            required=True,
+        ),
+        OpenApiParameter(
+            name="limit",
+            location=OpenApiParameter.QUERY,
+            type=int,
+            required=False,
+            description="Number of tracks (default 5, max 50).",
+        ),
+    ],
+    responses={
+        200: NextUpResponseSerializer,
+        400: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Invalid limit",
+            examples=[
+                OpenApiExample(
+                    name="Invalid limit",
+                    value={"error": "limit must be an integer"},
+                )
+            ]
+        ),
+        401: OpenApiResponse(
+            description="Unauthorized",
+            response=UnauthorizedResponseSerializer,
+            examples=[
+                OpenApiExample(
+                    name="Unauthorized",
+                    value={"detail": "Authentication credentials were not provided."},
+                )
+            ]
+        ),
+        403: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="No access to this playlist",
+            examples=[
+                OpenApiExample(
+                    name="Permission denied",
+                    value={"error": "Permission denied for this playlist"},
+                )
+            ]
+        ),
+    },
+)
+
+
+votable_events_schema = extend_schema(
+    methods=["GET"],
+    summary="Events the user can vote in right now",
+    description=(
+        "Events visible to the user whose license currently accepts their vote: open events, "
+        "invite_only events they are invited to, and location_time events whose voting window is "
+        "open and whose area contains the user's coordinates."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="X-User-Latitude",
+            location=OpenApiParameter.HEADER,
+            type=float,
+            required=False,
+        ),
+        OpenApiParameter(
+            name="X-User-Longitude",
+            location=OpenApiParameter.HEADER,
+            type=float,
+            required=False,
+        ),
+    ],
+    responses={
+        200: VotableEventsResponseSerializer,
+        401: OpenApiResponse(
+            description="Unauthorized",
+            response=UnauthorizedResponseSerializer,
+            examples=[
+                OpenApiExample(
+                    name="Unauthorized",
+                    value={"detail": "Authentication credentials were not provided."},
+                )
+            ]
+        ),
+    },
+)
+
+
+nearby_events_schema = extend_schema(
+    methods=["GET"],
+    summary="Public events near a location",
+    description="Public events within `radius` meters of (lat, lon), closest first.",
+    parameters=[
+        OpenApiParameter(name="lat", location=OpenApiParameter.QUERY, type=float, required=True),
+        OpenApiParameter(name="lon", location=OpenApiParameter.QUERY, type=float, required=True),
+        OpenApiParameter(
+            name="radius",
+            location=OpenApiParameter.QUERY,
+            type=float,
+            required=False,
+            description="Meters (default 5000, max 50000).",
+        ),
+        OpenApiParameter(name="offset", location=OpenApiParameter.QUERY, type=int, required=False),
+        OpenApiParameter(
+            name="limit",
+            location=OpenApiParameter.QUERY,
+            type=int,
+            required=False,
+            description="Page size (default 20, max 100).",
+        ),
+    ],
+    responses={
+        200: NearbyEventsResponseSerializer,
+        400: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Invalid parameters",
+            examples=[
+                OpenApiExample(
+                    "Missing coordinates",
+                    value={"error": "lat and lon are required numbers."},
+                )
+            ]
+        ),
+    },
+)
+
+
+playlist_presence_schema = extend_schema(
+    methods=["GET"],
+    summary="Live listeners of a playlist",
+    description="Number of websocket connections to the playlist room. Connected clients also "
+                "receive `presence` messages when it changes.",
+    parameters=[
+        OpenApiParameter(name="playlist_id", location=OpenApiParameter.PATH, type=int, required=True),
+    ],
+    responses={
+        200: PlaylistPresenceResponseSerializer,
+        403: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="No access to this playlist",
+            examples=[
+                OpenApiExample(
+                    name="Permission denied",
+                    value={"error": "Permission denied for this playlist"},
+                )
+            ]
+        ),
+        503: OpenApiResponse(
+            response=ErrorResponseSerializer,
+            description="Presence store unavailable",
+            examples=[
+                OpenApiExample(
+                    name="Unavailable",
+                    value={"error": "Presence is unavailable"},
+                )
+            ]
+        ),
+    },
+)
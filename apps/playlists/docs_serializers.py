@@ -25,6 +25,29 @@ class PlaylistCreateResponseSerializer(serializers.Serializer):
     playlist_id = serializers.UUIDField()
 
 
+#save_shared_playlist
+class SaveSharedPlaylistRequestSerializer(serializers.Serializer):
+    name = serializers.CharField(required=False, help_text="Defaults to the name of the saved playlist")
+    description = serializers.CharField(required=False, allow_blank=True)
+    public = serializers.BooleanField(required=False, default=False)
+
+
+class SaveSharedPlaylistResponseSerializer(serializers.Serializer):
+    message = serializers.CharField()
+    playlist_id = serializers.IntegerField()
+    track_count = serializers.IntegerField()
+
+
+#merge_playlists
+class MergePlaylistsRequestSerializer(serializers.Serializer):
+    source_ids = serializers.ListField(child=serializers.IntegerField())
+
+
+class MergePlaylistsResponseSerializer(serializers.Serializer):
+    message = serializers.CharField()
+    track_ids = serializers.ListField(child=serializers.IntegerField())
+
+
 #get_playlist_info
 class TrackSerializer(serializers.Serializer):
     name = serializers.CharField()
@@ -57,6 +80,8 @@ class PlaylistUpdateSerializer(serializers.Serializer):
     description = serializers.CharField(required=False)
     public = serializers.BooleanField(required=False)
     license_type = serializers.CharField(required=False)
+    event = serializers.BooleanField(required=False)
+    auto_order = serializers.BooleanField(required=False)
 
 
 class PlaylistUpdateResponseSerializer(serializers.Serializer):
@@ -91,6 +116,17 @@ class AddTrackSuccessSerializer(serializers.Serializer):
     track_id = serializers.IntegerField()
 
 
+#add_tracks_bulk
+class AddTracksBulkRequestSerializer(serializers.Serializer):
+    track_ids = serializers.ListField(child=serializers.CharField(), help_text="Track ids or Deezer track ids")
+
+class AddTracksBulkResponseSerializer(serializers.Serializer):
+    status = serializers.CharField()
+    track_ids = serializers.ListField(child=serializers.IntegerField())
+    skipped = serializers.ListField(child=serializers.IntegerField())
+    not_found = serializers.ListField(child=serializers.CharField())
+
+
 #move_track_in_playlist
 class MoveTrackRequestSerializer(serializers.Serializer):
     range_start = serializers.IntegerField()
@@ -124,11 +160,13 @@ class PlaylistSerializer(serializers.Serializer):
 
 class UserSavedPlaylistsResponseSerializer(serializers.Serializer):
     playlists = PlaylistSerializer(many=True)
+    next_cursor = serializers.IntegerField(required=False)
 
 
 #get_all_shared_playlists
 class SharedPlaylistsResponseSerializer(serializers.Serializer):
     playlists = PlaylistSerializer(many=True)
+    next_cursor = serializers.IntegerField(required=False)
 
 
 #change_visibility
@@ -186,8 +224,62 @@ class EventSerializer(serializers.Serializer):
 
 class EventsResponseSerializer(serializers.Serializer):
     events = EventSerializer(many=True)
+    next_cursor = serializers.IntegerField(required=False)
 
 
 #get_all_shared_events
 class AllSharedEventsResponseSerializer(serializers.Serializer):
-    events = EventSerializer(many=True)
\ No newline at end of file
+    events = EventSerializer(many=True)
+    next_cursor = serializers.IntegerField(required=False)
+
+
+#next_up
+class NextUpTrackInfoSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    deezer_track_id = serializers.CharField()
+    name = serializers.CharField()
+    artist = serializers.CharField()
+    album = serializers.CharField(allow_null=True)
+    url = serializers.CharField()
+    picture_small = serializers.CharField()
+    picture_medium = serializers.CharField()
+
+class NextUpTrackSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    position = serializers.IntegerField()
+    points = serializers.IntegerField()
+    track = NextUpTrackInfoSerializer()
+
+class NextUpResponseSerializer(serializers.Serializer):
+    playlist_id = serializers.IntegerField()
+    tracks = NextUpTrackSerializer(many=True)
+
+
+#votable_events
+class VotableEventSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    license_type = serializers.CharField()
+
+class VotableEventsResponseSerializer(serializers.Serializer):
+    events = VotableEventSerializer(many=True)
+
+
+#nearby_events
+class NearbyEventSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    license_type = serializers.CharField()
+    latitude = serializers.FloatField()
+    longitude = serializers.FloatField()
+    distance = serializers.IntegerField(help_text="Meters")
+
+class NearbyEventsResponseSerializer(serializers.Serializer):
+    events = NearbyEventSerializer(many=True)
+    next_offset = serializers.IntegerField(required=False)
+
+
+#playlist_presence
+class PlaylistPresenceResponseSerializer(serializers.Serializer):
+    playlist_id = serializers.IntegerField()
+    listeners = serializers.IntegerField(help_text="Websocket connections to the playlist room")
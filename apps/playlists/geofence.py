@@ -0,0 +1,65 @@
+import math
+from collections import namedtuple
+from functools import lru_cache
+from geopy.distance import geodesic
+
+
+# Cheap "is (lat, lon) within radius of the event" test for location_time
+# licenses. A bounding box rejects most far-away points with four float
+# comparisons; inside it the haversine (spherical) distance decides, and the
+# exact ellipsoidal geodesic is only solved when the point lies within
+# BOUNDARY_MARGIN of the radius, where the sphere could give the wrong answer.
+
+EARTH_RADIUS_M = 6371008.8
+# Spherical and WGS-84 distances differ by at most ~0.56%
+BOUNDARY_MARGIN = 0.006
+
+Geofence = namedtuple('Geofence', ['lat', 'lon', 'radius', 'min_lat', 'max_lat', 'min_lon', 'max_lon'])
+
+
+def degrees_for(meters):
+    """
+    Latitude span of `meters` (upper bound, margin included).
+    """
+    return math.degrees(meters * (1 + BOUNDARY_MARGIN) / EARTH_RADIUS_M)
+
+
+@lru_cache(maxsize=4096)
+def build(lat, lon, radius):
+    dlat = degrees_for(radius)
+    cos_lat = math.cos(math.radians(lat))
+    # Near the poles (or across the antimeridian) skip the longitude test
+    dlon = dlat / cos_lat if cos_lat > 0.01 else 360
+    return Geofence(lat, lon, radius, lat - dlat, lat + dlat, lon - dlon, lon + dlon)
+
+
+def fence_for(playlist):
+    """
+    Geofence of a playlist, or None if its location is not configured.
+    Cached on the (lat, lon, radius) values, so edits are picked up.
+    """
+    if playlist.latitude is None or playlist.longitude is None or not playlist.allowed_radius_meters:
+        return None
+    return build(playlist.latitude, playlist.longitude, playlist.allowed_radius_meters)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def contains(fence, lat, lon):
+    if not (fence.min_lat <= lat <= fence.max_lat):
+        return False
+    if fence.min_lon >= -180 and fence.max_lon <= 180 and not (fence.min_lon <= lon <= fence.max_lon):
+        return False
+
+    distance = haversine(fence.lat, fence.lon, lat, lon)
+    if distance <= fence.radius * (1 - BOUNDARY_MARGIN):
+        return True
+    if distance > fence.radius * (1 + BOUNDARY_MARGIN):
+        return False
+    return geodesic((lat, lon), (fence.lat, fence.lon)).meters <= fence.radius
@@ -0,0 +1,79 @@
+import math
+
+
+# Minimal geohash (https://en.wikipedia.org/wiki/Geohash): Playlist.geohash
+# stores the full-precision hash and a B-tree (LIKE prefix) index over it
+# turns "events near (lat, lon)" into a few prefix scans, see
+# apps/playlists/nearby.py.
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+PRECISION = 9  # cells of about 4.8m x 4.8m
+METERS_PER_DEGREE = 111_195
+
+
+def encode(lat, lon, precision=PRECISION):
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            rng[0] = mid
+        else:
+            bits = bits * 2
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """
+    (height, width) of a cell in degrees.
+    """
+    lat_bits = (5 * precision) // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180 / 2 ** lat_bits, 360 / 2 ** lon_bits
+
+
+def precision_for(radius, lat):
+    """
+    Longest prefix whose cells are at least `radius` meters on each side at
+    latitude `lat`, so a circle of that radius fits in the 3x3 block of cells
+    around its centre.
+    """
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    for precision in range(PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        if min(height, width * cos_lat) * METERS_PER_DEGREE >= radius:
+            return precision
+    return 0
+
+
+def covering(lat, lon, radius):
+    """
+    Prefixes of the cell containing (lat, lon) and its 8 neighbours. An
+    empty string means the radius is too large to narrow anything down.
+    """
+    precision = precision_for(radius, lat)
+    if precision == 0:
+        return {''}
+    height, width = cell_size(precision)
+    prefixes = set()
+    for dy in (-1, 0, 1):
+        cell_lat = lat + dy * height
+        if not -90 <= cell_lat <= 90:
+            continue
+        for dx in (-1, 0, 1):
+            cell_lon = (lon + dx * width + 180) % 360 - 180
+            prefixes.add(encode(cell_lat, cell_lon, precision))
+    return prefixes
@@ -0,0 +1,120 @@
+from django.db.models import ExpressionWrapper, F, FloatField, Q
+from django.utils import timezone
+from apps.playlists import geofence, vote_window
+from apps.playlists.models import Playlist
+
+
+# Vote license evaluation, shared by the check_license decorator (one vote)
+# and the votable events endpoint (many events at once).
+
+NOT_INVITED = "You are not invited to vote on this playlist."
+WINDOW_NOT_CONFIGURED = "Voting time window not configured."
+WINDOW_CLOSED = "Voting is not allowed at this time."
+LOCATION_MISSING = "User location is missing."
+LOCATION_NOT_CONFIGURED = "Playlist location settings not configured."
+OUTSIDE_AREA = "You are not within the allowed voting area."
+NOT_ALLOWED = "Voting not allowed under current license settings."
+
+
+def rules(playlist, now):
+    """
+    What a vote on `playlist` depends on besides the voter, in a form that
+    can be cached with the access decision: the current or next vote window
+    as epoch seconds and the geofence as (lat, lon, radius).
+    """
+    window = vote_window.current(playlist, now) if playlist.license_type == 'location_time' else None
+    fence = geofence.fence_for(playlist)
+    return {
+        'license_type': playlist.license_type,
+        'window': [int(window[0].timestamp()), int(window[1].timestamp())] if window else None,
+        'fence': [fence.lat, fence.lon, fence.radius] if fence else None,
+    }
+
+
+def window_expired(license_rules, now_ts):
+    """
+    The cached window has closed, so the next one must be computed.
+    """
+    return license_rules['window'] is not None and now_ts > license_rules['window'][1]
+
+
+def vote_denial(license_rules, invited, latlon, now_ts):
+    """
+    Why a vote is refused, or None if it is allowed. `license_rules` is the
+    output of rules(), usually read from the cached access decision.
+    """
+    license_type = license_rules['license_type']
+    if license_type == 'open':
+        return None
+    if license_type == 'invite_only':
+        return None if invited else NOT_INVITED
+    if license_type != 'location_time':
+        return NOT_ALLOWED
+
+    window = license_rules['window']
+    if window is None:
+        return WINDOW_NOT_CONFIGURED
+    if not (window[0] <= now_ts <= window[1]):
+        return WINDOW_CLOSED
+    if not latlon:
+        return LOCATION_MISSING
+    if license_rules['fence'] is None:
+        return LOCATION_NOT_CONFIGURED
+    if not geofence.contains(geofence.build(*license_rules['fence']), *latlon):
+        return OUTSIDE_AREA
+    return None
+
+
+def evaluate(playlists, voters, now=None):
+    """
+    Batch evaluation: `voters` is a list of (user_id, (lat, lon) or None).
+    Returns {user_id: [ids of the playlists that user can vote in now]}.
+    Invitations are read in one query and windows are computed once per
+    playlist, not once per voter.
+    """
+    now = now or timezone.now()
+    now_ts = now.timestamp()
+    playlist_rules = [(p.id, rules(p, now)) for p in playlists]
+    invite_only = [playlist_id for playlist_id, r in playlist_rules if r['license_type'] == 'invite_only']
+    invited = set()
+    if invite_only:
+        invited = set(
+            Playlist.invited_users.through.objects
+            .filter(playlist_id__in=invite_only, customuser_id__in=[user_id for user_id, _ in voters])
+            .values_list('playlist_id', 'customuser_id')
+        )
+
+    return {
+        user_id: [
+            playlist_id for playlist_id, r in playlist_rules
+            if vote_denial(r, (playlist_id, user_id) in invited, latlon, now_ts) is None
+        ]
+        for user_id, latlon in voters
+    }
+
+
+def votable_events(user, latlon, now=None):
+    """
+    Events visible to `user` that they can vote in right now. Location
+    restricted events are pre-filtered in SQL on the latitude band of their
+    radius before the geofence test.
+    """
+    from apps.playlists.access import access_queryset
+
+    events = (
+        access_queryset(user.pk)
+        .filter(event=True)
+        .filter(Q(public=True) | Q(creator_id=user.pk) | Q(is_saved=True))
+    )
+    if latlon:
+        band = ExpressionWrapper(F('allowed_radius_meters') * geofence.degrees_for(1), output_field=FloatField())
+        events = events.filter(
+            ~Q(license_type='location_time')
+            | Q(latitude__gte=latlon[0] - band, latitude__lte=latlon[0] + band)
+        )
+    else:
+        events = events.exclude(license_type='location_time')
+
+    events = list(events.order_by('id'))
+    allowed = set(evaluate(events, [(user.pk, latlon)], now)[user.pk])
+    return [p for p in events if p.id in allowed]
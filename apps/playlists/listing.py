@@ -0,0 +1,147 @@
+import re
+from django.conf import settings
+from django.db.models import Count, F, Prefetch, Window
+from django.db.models.functions import RowNumber
+from django.http import JsonResponse
+from apps.playlists.models import PlaylistTrack
+
+
+PREVIEW_RE = re.compile(r'^preview(?:\((\d+)\))?$')
+
+
+class ListingParamError(ValueError):
+    pass
+
+
+def parse_listing_params(request):
+    """
+    Read cursor, limit and include_tracks from the query string.
+
+    Pagination is opt-in: when neither cursor nor limit is sent, limit is
+    None and the whole listing is returned, as before keyset pagination.
+
+    include_tracks accepts:
+    - 'true' (default): every track of each playlist
+    - 'false': no tracks at all
+    - 'count': only the number of tracks
+    - 'preview(n)' or 'preview' with ?preview=n: the first n tracks
+    """
+    default_limit = getattr(settings, 'PLAYLIST_PAGE_SIZE', 50)
+    max_limit = getattr(settings, 'PLAYLIST_MAX_PAGE_SIZE', 200)
+
+    paginated = 'cursor' in request.GET or 'limit' in request.GET
+    try:
+        cursor = int(request.GET.get('cursor', 0) or 0)
+        limit = int(request.GET.get('limit', default_limit))
+    except (TypeError, ValueError):
+        raise ListingParamError('cursor and limit must be integers.')
+    if cursor < 0 or limit < 1:
+        raise ListingParamError('cursor must be >= 0 and limit >= 1.')
+    limit = min(limit, max_limit) if paginated else None
+
+    mode = request.GET.get('include_tracks', 'true').lower()
+    preview = None
+    match = PREVIEW_RE.match(mode)
+    if match:
+        try:
+            preview = int(match.group(1) or request.GET.get('preview', 3))
+        except (TypeError, ValueError):
+            raise ListingParamError('preview must be an integer.')
+        if preview < 1:
+            raise ListingParamError('preview must be >= 1.')
+        mode = 'preview'
+    elif mode not in ('true', 'false', 'count'):
+        raise ListingParamError("include_tracks must be one of true, false, count, preview(n).")
+
+    return cursor, limit, mode, preview
+
+
+def _track_entry(pt):
+    return {'name': pt.track.name, 'artist': pt.track.artist}
+
+
+def _preview_tracks(playlist_ids, size):
+    """
+    First `size` tracks of every playlist in one query, using ROW_NUMBER()
+    partitioned by playlist.
+    """
+    rows = (
+        PlaylistTrack.objects
+        .filter(playlist_id__in=playlist_ids)
+        .select_related('track')
+        .annotate(rank=Window(
+            expression=RowNumber(),
+            partition_by=[F('playlist_id')],
+            order_by=F('position').asc(),
+        ))
+        .filter(rank__lte=size)
+        .order_by('playlist_id', 'position')
+    )
+    previews = {pid: [] for pid in playlist_ids}
+    for pt in rows:
+        previews[pt.playlist_id].append(_track_entry(pt))
+    return previews
+
+
+def list_playlists(queryset, cursor, limit, mode, preview=None, fields=()):
+    """
+    Keyset-paginated listing shared by the saved/public playlist and event
+    endpoints. A page costs at most two queries whatever the catalog size:
+    one for the playlists (creator joined in) and one for their tracks.
+
+    A limit of None returns every playlist after the cursor.
+
+    Returns (items, next_cursor).
+    """
+    queryset = queryset.select_related('creator').filter(id__gt=cursor).order_by('id').distinct()
+    if mode == 'count':
+        queryset = queryset.annotate(track_count=Count('tracks', distinct=True))
+    elif mode == 'true':
+        queryset = queryset.prefetch_related(
+            Prefetch('tracks', queryset=PlaylistTrack.objects.select_related('track').order_by('position'))
+        )
+
+    playlists = list(queryset if limit is None else queryset[:limit + 1])
+    next_cursor = None
+    if limit is not None and len(playlists) > limit:
+        playlists = playlists[:limit]
+        next_cursor = playlists[-1].id
+
+    previews = {}
+    if mode == 'preview' and playlists:
+        previews = _preview_tracks([p.id for p in playlists], preview)
+
+    items = []
+    for playlist in playlists:
+        item = {
+            'id': playlist.id,
+            'name': playlist.name,
+            'description': playlist.description,
+            'public': playlist.public,
+            'creator': playlist.creator.username,
+        }
+        for field in fields:
+            item[field] = getattr(playlist, field)
+
+        if mode == 'true':
+            item['tracks'] = [_track_entry(pt) for pt in playlist.tracks.all()]
+        elif mode == 'count':
+            item['track_count'] = playlist.track_count
+        elif mode == 'preview':
+            item['tracks'] = previews.get(playlist.id, [])
+        items.append(item)
+
+    return items, next_cursor
+
+
+def playlist_listing_response(request, queryset, key, fields=()):
+    try:
+        cursor, limit, mode, preview = parse_listing_params(request)
+    except ListingParamError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    items, next_cursor = list_playlists(queryset, cursor, limit, mode, preview, fields)
+    body = {key: items}
+    if next_cursor is not None:
+        body['next_cursor'] = next_cursor
+    return JsonResponse(body)
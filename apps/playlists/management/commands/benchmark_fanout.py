@@ -0,0 +1,65 @@
+import json
+import time
+from django.core.management.base import BaseCommand
+from apps.playlists import broadcast
+from apps.playlists.broadcast import OP_INSERT, OP_INSERT_MANY, delta_payload, track_entry
+from apps.playlists.models import PlaylistTrack
+from apps.tracks.models import Track
+
+
+def sample_delta(tracks):
+    """
+    The insert delta mutations.add_track (one track) or add_tracks (several)
+    broadcasts, built from unsaved rows with the same track_entry.
+    """
+    entries = [
+        track_entry(PlaylistTrack(id=i, position=i * 1024, points=i % 7, track=Track(
+            id=i,
+            deezer_track_id=str(3_000_000 + i),
+            name=f'Track {i}',
+            artist=f'Artist {i % 40}',
+            album=f'Album {i % 90}',
+            url=f'https://www.deezer.com/track/{3_000_000 + i}',
+            picture_small=f'https://cdn-images.dzcdn.net/images/cover/{i:032x}/56x56-000000-80-0-0.jpg',
+            picture_medium=f'https://cdn-images.dzcdn.net/images/cover/{i:032x}/250x250-000000-80-0-0.jpg',
+        )))
+        for i in range(tracks)
+    ]
+    if len(entries) == 1:
+        return delta_payload(1, 42, OP_INSERT, {'track': entries[0]})
+    return delta_payload(1, 42, OP_INSERT_MANY, {'tracks': entries})
+
+
+class Command(BaseCommand):
+    help = ("Encoding cost of one playlist broadcast vs listener count: json.dumps in every consumer "
+            "against encoding once in the broadcast (orjson when installed).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--listeners', type=int, nargs='+', default=[1, 10, 100, 1000, 2000],
+                            help='Listener counts to measure.')
+        parser.add_argument('--tracks', type=int, default=100,
+                            help='Tracks in the broadcast payload: 1 is an add_track insert, more an add_bulk insert_many.')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs per measurement; the fastest is reported.')
+
+    def handle(self, *args, **options):
+        payload = sample_delta(max(options['tracks'], 1))
+        size = len(broadcast.encode(payload))
+        encoder = 'orjson' if broadcast.orjson is not None else 'json'
+        self.stdout.write(f"payload {size} bytes, encode-once uses {encoder}")
+        self.stdout.write(f"{'listeners':>9}  {'per consumer':>12}  {'once':>9}  {'speedup':>7}")
+
+        for listeners in options['listeners']:
+            per_consumer = self.best(lambda: [json.dumps(payload) for _ in range(listeners)], options['repeat'])
+            once = self.best(lambda: broadcast.encode(payload), options['repeat'])
+            self.stdout.write(
+                f"{listeners:>9}  {per_consumer * 1000:>10.2f}ms  {once * 1000:>7.3f}ms  {per_consumer / once:>6.0f}x"
+            )
+
+    def best(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
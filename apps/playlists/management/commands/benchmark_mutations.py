@@ -0,0 +1,124 @@
+import asyncio
+import math
+import time
+import uuid
+import httpx
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.urls import path, reverse
+from rest_framework.authtoken.models import Token
+from apps.playlists import async_views, views
+from apps.playlists.models import Playlist, PlaylistTrack, POSITION_GAP
+from apps.tracks.models import Track
+
+
+User = get_user_model()
+
+ROUTES = {
+    'add': 'add_track',
+    'move': 'move_track_in_playlist',
+    'vote': 'vote_for_track',
+}
+
+# This module doubles as the URLconf of the benchmark, so both view sets are
+# served side by side whatever PLAYLIST_ASYNC_VIEWS is set to.
+urlpatterns = [
+    path(f'{label}/<int:playlist_id>/{name}/', getattr(module, name), name=f'{name}_{label}')
+    for label, module in (('sync', views), ('async', async_views))
+    for name in ROUTES.values()
+]
+
+
+def percentile(sorted_values, p):
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = ("p50/p99 latency of the sync and async playlist mutation views under the same concurrent load. "
+            "Requests go through core.asgi.application in-process; test data is created and removed.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--op', choices=sorted(ROUTES), default='move',
+                            help='Mutation to benchmark.')
+        parser.add_argument('--requests', type=int, default=500,
+                            help='Requests per view.')
+        parser.add_argument('--concurrency', type=int, default=50,
+                            help='Requests in flight at once.')
+        parser.add_argument('--tracks', type=int, default=20,
+                            help='Tracks in the benchmark playlist.')
+
+    def handle(self, *args, **options):
+        self.prefix = f'bench-{uuid.uuid4().hex[:8]}'
+        try:
+            runs = [(label, *self.prepare(options, f"{ROUTES[options['op']]}_{label}")) for label in ('sync', 'async')]
+            with override_settings(ROOT_URLCONF=__name__):
+                asyncio.run(self.compare(runs, options['concurrency']))
+        finally:
+            User.objects.filter(username__startswith=self.prefix).delete()
+            Track.objects.filter(deezer_track_id__startswith=self.prefix).delete()
+
+    async def compare(self, runs, concurrency):
+        from core.asgi import application
+
+        transport = httpx.ASGITransport(app=application)
+        async with httpx.AsyncClient(transport=transport, base_url='http://localhost') as client:
+            for label, url, bodies, tokens in runs:
+                started = time.perf_counter()
+                latencies, statuses = await self.load(client, url, bodies, tokens, concurrency)
+                self.report(label, latencies, statuses, time.perf_counter() - started)
+
+    def prepare(self, options, route):
+        """
+        A fresh playlist per run and one user per request: votes need it, and
+        the per-user throttle would otherwise turn most requests into 429s.
+        """
+        run = f'{self.prefix}-{uuid.uuid4().hex[:4]}'
+        count = options['requests']
+        users = User.objects.bulk_create(User(username=f'{run}-{i}') for i in range(count))
+        tokens = Token.objects.bulk_create(Token(user=user, key=Token.generate_key()) for user in users)
+        tokens = [token.key for token in tokens]
+
+        playlist = Playlist.objects.create(name=run, creator=users[0], license_type='open', public=True)
+        tracks = Track.objects.bulk_create(
+            Track(name=f'{run}-{i}', artist='Benchmark', deezer_track_id=f'{run}-{i}')
+            for i in range(options['tracks'] + (count if options['op'] == 'add' else 0))
+        )
+        PlaylistTrack.objects.bulk_create(
+            PlaylistTrack(playlist=playlist, track=track, position=i * POSITION_GAP)
+            for i, track in enumerate(tracks[:options['tracks']])
+        )
+
+        if options['op'] == 'add':
+            bodies = [{'track_id': track.id} for track in tracks[options['tracks']:]]
+        elif options['op'] == 'move':
+            bodies = [{'range_start': 0, 'insert_before': options['tracks']}] * count
+        else:
+            bodies = [{'range_start': i % options['tracks']} for i in range(count)]
+        return reverse(route, urlconf=__name__, args=[playlist.id]), bodies, tokens
+
+    async def load(self, client, url, bodies, tokens, concurrency):
+        latencies = []
+        statuses = {}
+        queue = asyncio.Queue()
+        for i, body in enumerate(bodies):
+            queue.put_nowait((body, tokens[i % len(tokens)]))
+
+        async def worker():
+            while not queue.empty():
+                body, token = queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.post(url, json=body, headers={'Authorization': f'Token {token}'})
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return sorted(latencies), statuses
+
+    def report(self, label, latencies, statuses, elapsed):
+        self.stdout.write(
+            f"{label:>5}: {len(latencies)} requests in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s)  "
+            f"p50 {percentile(latencies, 50) * 1000:.1f}ms  p99 {percentile(latencies, 99) * 1000:.1f}ms  "
+            f"statuses {dict(sorted(statuses.items()))}"
+        )
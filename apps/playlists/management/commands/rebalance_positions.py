@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from apps.playlists.models import PlaylistTrack, POSITION_GAP
+from apps.playlists.ordering import min_gap, rebalance
+
+
+class Command(BaseCommand):
+    help = "Respread PlaylistTrack positions to POSITION_GAP intervals for playlists whose gaps got too small."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--playlist', type=int, action='append', dest='playlists',
+                            help='Only rebalance this playlist id (can be repeated).')
+        parser.add_argument('--min-gap', type=int, default=POSITION_GAP // 64,
+                            help='Rebalance playlists whose smallest gap is below this value.')
+        parser.add_argument('--all', action='store_true',
+                            help='Rebalance every playlist regardless of its gaps.')
+
+    def handle(self, *args, **options):
+        playlist_ids = options['playlists']
+        if not playlist_ids:
+            playlist_ids = PlaylistTrack.objects.order_by().values_list('playlist_id', flat=True).distinct()
+
+        rebalanced = 0
+        for playlist_id in playlist_ids:
+            gap = min_gap(playlist_id)
+            if not options['all'] and (gap is None or gap >= options['min_gap']):
+                continue
+            count = rebalance(playlist_id)
+            rebalanced += 1
+            self.stdout.write(f"Playlist {playlist_id}: {count} tracks rebalanced (smallest gap was {gap})")
+
+        self.stdout.write(self.style.SUCCESS(f"{rebalanced} playlist(s) rebalanced"))
@@ -0,0 +1,30 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.playlists import vote_buffer
+
+
+class Command(BaseCommand):
+    help = "Flush votes buffered in Redis to Postgres and broadcast coalesced scores (VOTE_BUFFER_ENABLED mode)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tick-ms', type=int, default=settings.VOTE_BUFFER_TICK_MS,
+                            help='Interval between flushes in milliseconds.')
+        parser.add_argument('--batch', type=int, default=settings.VOTE_BUFFER_FLUSH_BATCH,
+                            help='Maximum votes written per playlist per tick.')
+        parser.add_argument('--once', action='store_true',
+                            help='Replay inflight batches, flush once and exit.')
+
+    def handle(self, *args, **options):
+        replayed = vote_buffer.replay_inflight()
+        if replayed:
+            self.stdout.write(f"Replayed {replayed} inflight vote(s)")
+
+        tick = options['tick_ms'] / 1000
+        while True:
+            started = time.monotonic()
+            flushed = vote_buffer.flush_all(options['batch'])
+            if options['once']:
+                self.stdout.write(self.style.SUCCESS(f"{flushed} vote(s) flushed"))
+                return
+            time.sleep(max(0, tick - (time.monotonic() - started)))
@@ -0,0 +1,27 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.playlists import vote_window
+
+
+class Command(BaseCommand):
+    help = "Roll location_time vote windows forward and broadcast 'voting opened/closed' to playlist groups."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-sleep', type=float, default=settings.VOTE_SCHEDULER_MAX_SLEEP,
+                            help='Longest pause between checks in seconds, so edited windows are picked up.')
+        parser.add_argument('--once', action='store_true',
+                            help='Check once and exit.')
+
+    def handle(self, *args, **options):
+        while True:
+            sent = vote_window.tick()
+            if options['once']:
+                self.stdout.write(self.style.SUCCESS(f"{sent} voting state change(s) broadcast"))
+                return
+            # Sleep until the next precomputed open/close instant
+            now = timezone.now()
+            wake = vote_window.next_due(now)
+            pause = options['max_sleep'] if wake is None else (wake - now).total_seconds()
+            time.sleep(min(max(pause, 0), options['max_sleep']))
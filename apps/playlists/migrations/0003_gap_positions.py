@@ -0,0 +1,45 @@
+# Generated by Django 5.1 on 2026-10-18 06:10
+
+import django.db.models.constraints
+from django.db import migrations, models
+
+
+POSITION_GAP = 1024
+
+
+def spread_positions(apps, schema_editor):
+    PlaylistTrack = apps.get_model('playlists', 'PlaylistTrack')
+    playlist_ids = PlaylistTrack.objects.order_by().values_list('playlist_id', flat=True).distinct()
+    for playlist_id in playlist_ids:
+        ids = PlaylistTrack.objects.filter(playlist_id=playlist_id).order_by('position', 'id').values_list('id', flat=True)
+        rows = [PlaylistTrack(id=pk, position=(i + 1) * POSITION_GAP) for i, pk in enumerate(ids)]
+        PlaylistTrack.objects.bulk_update(rows, ['position'], batch_size=1000)
+
+
+def compact_positions(apps, schema_editor):
+    PlaylistTrack = apps.get_model('playlists', 'PlaylistTrack')
+    playlist_ids = PlaylistTrack.objects.order_by().values_list('playlist_id', flat=True).distinct()
+    for playlist_id in playlist_ids:
+        ids = PlaylistTrack.objects.filter(playlist_id=playlist_id).order_by('position', 'id').values_list('id', flat=True)
+        rows = [PlaylistTrack(id=pk, position=i) for i, pk in enumerate(ids)]
+        PlaylistTrack.objects.bulk_update(rows, ['position'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playlists', '0002_playlist_event'),
+        ('tracks', '0002_track_picture_medium_track_picture_small'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='playlisttrack',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='playlisttrack',
+            constraint=models.UniqueConstraint(deferrable=django.db.models.constraints.Deferrable['DEFERRED'], fields=('playlist', 'position'), name='unique_playlist_position'),
+        ),
+        migrations.RunPython(spread_positions, compact_positions),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-18 06:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playlists', '0003_gap_positions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playlist',
+            name='revision',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
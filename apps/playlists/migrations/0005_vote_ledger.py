@@ -0,0 +1,54 @@
+# Generated by Django 5.1 on 2026-10-18 06:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_already_voted(apps, schema_editor):
+    Playlist = apps.get_model('playlists', 'Playlist')
+    Vote = apps.get_model('playlists', 'Vote')
+    Through = Playlist.users_already_voted.through
+    Vote.objects.bulk_create(
+        [Vote(playlist_id=row.playlist_id, user_id=row.customuser_id) for row in Through.objects.all()],
+        ignore_conflicts=True,
+    )
+
+
+def restore_already_voted(apps, schema_editor):
+    Playlist = apps.get_model('playlists', 'Playlist')
+    Vote = apps.get_model('playlists', 'Vote')
+    Through = Playlist.users_already_voted.through
+    Through.objects.bulk_create(
+        [Through(playlist_id=vote.playlist_id, customuser_id=vote.user_id) for vote in Vote.objects.all()],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playlists', '0004_playlist_revision'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Vote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('playlist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='playlists.playlist')),
+                ('playlist_track', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='votes', to='playlists.playlisttrack')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='playlist_votes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('playlist', 'user'), name='unique_vote_per_playlist')],
+            },
+        ),
+        migrations.RunPython(copy_already_voted, restore_already_voted),
+        migrations.RemoveField(
+            model_name='playlist',
+            name='users_already_voted',
+        ),
+    ]
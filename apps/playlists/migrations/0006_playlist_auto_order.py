@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-18 06:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playlists', '0005_vote_ledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playlist',
+            name='auto_order',
+            field=models.BooleanField(default=False),
+        ),
+    ]
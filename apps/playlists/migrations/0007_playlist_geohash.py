@@ -0,0 +1,58 @@
+# Generated by Django 5.1 on 2026-10-18 06:36
+
+from django.db import migrations, models
+
+
+# Frozen copy of apps.playlists.geohash.encode at precision 9 as of this
+# migration, so later changes to the app code cannot change what it does.
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+PRECISION = 9
+
+
+def encode(lat, lon):
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < PRECISION:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            rng[0] = mid
+        else:
+            bits = bits * 2
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def fill_geohash(apps, schema_editor):
+    Playlist = apps.get_model('playlists', 'Playlist')
+    playlists = list(Playlist.objects.filter(latitude__isnull=False, longitude__isnull=False))
+    for playlist in playlists:
+        playlist.geohash = encode(playlist.latitude, playlist.longitude)
+    Playlist.objects.bulk_update(playlists, ['geohash'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playlists', '0006_playlist_auto_order'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playlist',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, max_length=9, null=True),
+        ),
+        migrations.RunPython(fill_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.1 on 2026-10-18 06:40
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Frozen copy of vote_window.next_window as of this migration, so later
+# changes to the app code cannot change what it does.
+def next_window(start, end, tz_name, now):
+    try:
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        tz = ZoneInfo('UTC')
+    today = now.astimezone(tz).date()
+    crosses_midnight = end <= start
+    for day in (today - timedelta(days=1), today, today + timedelta(days=1)):
+        opens = datetime.combine(day, start, tzinfo=tz)
+        closes = datetime.combine(day + timedelta(days=1) if crosses_midnight else day, end, tzinfo=tz)
+        if now <= closes:
+            return opens.astimezone(dt_timezone.utc), closes.astimezone(dt_timezone.utc)
+
+
+def fill_windows(apps, schema_editor):
+    Playlist = apps.get_model('playlists', 'Playlist')
+    now = timezone.now()
+    playlists = list(Playlist.objects.filter(
+        license_type='location_time', vote_start_time__isnull=False, vote_end_time__isnull=False,
+    ))
+    for playlist in playlists:
+        playlist.vote_opens_at, playlist.vote_closes_at = next_window(
+            playlist.vote_start_time, playlist.vote_end_time, playlist.timezone, now
+        )
+    Playlist.objects.bulk_update(playlists, ['vote_opens_at', 'vote_closes_at'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playlists', '0007_playlist_geohash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='playlist',
+            name='timezone',
+            field=models.CharField(default='Asia/Singapore', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='vote_closes_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='vote_opens_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='vote_window_open',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(fill_windows, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,20 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from apps.tracks.models import Track
+from apps.playlists import geohash
 
 User = get_user_model()
 
+# Vote windows used to be evaluated in UTC+8
+DEFAULT_TIMEZONE = 'Asia/Singapore'
+
+# Fields that move the vote window (see apps/playlists/vote_window.py)
+VOTE_WINDOW_FIELDS = {'license_type', 'vote_start_time', 'vote_end_time', 'timezone'}
+
+# PlaylistTrack.position is sparse: consecutive tracks are POSITION_GAP apart
+# so a move only has to rewrite the moved rows (see apps/playlists/ordering.py)
+POSITION_GAP = 1024
+
 
 class Playlist(models.Model):
 
@@ -18,27 +29,83 @@ class Playlist(models.Model):
     description = models.TextField()
     public = models.BooleanField(default=True)
     users_saved = models.ManyToManyField(User, related_name='saved_playlists', blank=True)
-    users_already_voted = models.ManyToManyField(User, related_name='already_voted', blank=True)
 
     # Event association 
     event = models.BooleanField(default=False)
+    # Events only: keep tracks ordered by points (see apps/playlists/ranking.py)
+    auto_order = models.BooleanField(default=False)
 
     # License controls
     license_type = models.CharField(max_length=20, choices=LICENSE_CHOICES, default='open')
     invited_users = models.ManyToManyField(User, blank=True, related_name='invited_to_playlists')
 
-    # Time-based voting
+    # Time-based voting, wall-clock times in `timezone`; an end time not after
+    # the start time closes the next day
     vote_start_time = models.TimeField(blank=True, null=True)
     vote_end_time = models.TimeField(blank=True, null=True)
+    timezone = models.CharField(max_length=64, default=DEFAULT_TIMEZONE)
+    # Current or next window in UTC, derived on save
+    vote_opens_at = models.DateTimeField(blank=True, null=True)
+    vote_closes_at = models.DateTimeField(blank=True, null=True)
+    # Last state announced by run_vote_scheduler
+    vote_window_open = models.BooleanField(default=False)
 
     # Location-based voting
     latitude = models.FloatField(blank=True, null=True)
     longitude = models.FloatField(blank=True, null=True)
     allowed_radius_meters = models.IntegerField(blank=True, null=True)
+    # Derived from latitude/longitude on save, indexed for nearby searches
+    geohash = models.CharField(max_length=geohash.PRECISION, blank=True, null=True, db_index=True)
+
+    # Bumped on every mutation (tracks and metadata); sent with each delta
+    # broadcast and part of the snapshot cache key (see snapshots.py)
+    revision = models.PositiveBigIntegerField(default=0)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geohash.encode(self.latitude, self.longitude)
+        else:
+            self.geohash = None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = update_fields = {*update_fields, 'geohash'}
+        if update_fields is None or VOTE_WINDOW_FIELDS & set(update_fields):
+            from apps.playlists import vote_window
+            vote_window.compute(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'vote_opens_at', 'vote_closes_at'}
+        # revision is only ever changed with an atomic F() update; never write
+        # back a possibly stale in-memory value when saving other fields
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != 'revision'
+            ]
+        super().save(*args, **kwargs)
+
+    # Set-based track copies, see apps/playlists/copying.py
+
+    def duplicate(self, user, **overrides):
+        """
+        Copy of this playlist owned by `user`; returns (playlist, track count).
+        """
+        from apps.playlists import copying
+        return copying.duplicate(self, user, **overrides)
+
+    def merge(self, *sources):
+        """
+        Append the tracks of `sources` (playlists or ids) that this playlist
+        does not have yet; returns the added PlaylistTracks.
+        """
+        from apps.playlists import copying
+        return copying.append_tracks(self.id, [getattr(source, 'id', source) for source in sources])
+
+    def append_from(self, source):
+        return self.merge(source)
+
 class PlaylistTrack(models.Model):
     playlist = models.ForeignKey(Playlist, on_delete=models.CASCADE, related_name='tracks')
     track = models.ForeignKey(Track, on_delete=models.CASCADE)
@@ -46,12 +113,39 @@ class PlaylistTrack(models.Model):
     points = models.IntegerField(blank=True, null=True, default=0)
 
     class Meta:
-        unique_together = ('playlist', 'position')
         ordering = ['position']
-
+        constraints = [
+            # Deferred so a playlist can be renumbered in a single statement
+            models.UniqueConstraint(
+                fields=['playlist', 'position'],
+                name='unique_playlist_position',
+                deferrable=models.Deferrable.DEFERRED,
+            ),
+        ]
 
     def save(self, *args, **kwargs):
-        if not self.position:
-            # Automatically set position to the next available integer
-            self.position = PlaylistTrack.objects.filter(playlist=self.playlist).count()
+        if self.position is None:
+            # Append after the last track, leaving a gap for later moves
+            max_pos = PlaylistTrack.objects.filter(playlist=self.playlist).aggregate(models.Max('position'))['position__max']
+            self.position = POSITION_GAP if max_pos is None else max_pos + POSITION_GAP
         super().save(*args, **kwargs)
+
+
+class Vote(models.Model):
+    """
+    One row per (playlist, user): the unique constraint is what prevents
+    double voting, so concurrent votes cannot both get through.
+    """
+    playlist = models.ForeignKey(Playlist, on_delete=models.CASCADE, related_name='votes')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='playlist_votes')
+    # Kept when the track is removed so the user still cannot vote twice
+    playlist_track = models.ForeignKey(PlaylistTrack, on_delete=models.SET_NULL, null=True, blank=True, related_name='votes')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['playlist', 'user'], name='unique_vote_per_playlist'),
+        ]
+
+    def __str__(self):
+        return f"{self.user} -> {self.playlist}"
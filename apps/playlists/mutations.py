@@ -0,0 +1,247 @@
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from apps.tracks.models import Track
+from apps.playlists.models import POSITION_GAP, PlaylistTrack
+from apps.playlists.decorators import playlist_access, vote_access
+from apps.playlists.broadcast import OP_INSERT, OP_INSERT_MANY, OP_MOVE, OP_POINTS, OP_REMOVE, publish, track_entry
+from apps.playlists.ordering import InvalidRange, move_tracks, next_position
+from apps.playlists.serializers import VoteSerializer
+from apps.playlists.votes import cast_vote, track_id_at
+from apps.playlists import ranking, vote_buffer
+
+
+# Playlist mutations shared by the DRF views (views.py) and their async
+# counterparts (async_views.py). The caller has already checked access and
+# passes the playlist in; each function returns (body, status) and
+# broadcasts through broadcast.publish. Every write transaction starts by
+# locking the playlist row, which orders concurrent mutations of one
+# playlist (next_position, revision bumps) and keeps the lock order the
+# same everywhere so they cannot deadlock.
+
+ADD = 'add'
+ADD_BULK = 'add_bulk'
+MOVE = 'move'
+REMOVE = 'remove'
+VOTE = 'vote'
+ACTIONS = (ADD, ADD_BULK, MOVE, REMOVE, VOTE)
+
+
+def track_fields(track_data):
+    """
+    Track columns from a Deezer track payload.
+    """
+    return {
+        'name': track_data['title'],
+        'artist': track_data['artist']['name'],
+        'album': track_data['album']['title'],
+        'url': track_data['link'],
+        'picture_small': track_data['album'].get('cover_small'),
+        'picture_medium': track_data['album'].get('cover_medium'),
+    }
+
+
+def add_track(playlist, data):
+    try:
+        track_id = data.get("track_id")
+        track = Track.objects.filter(id=track_id).first() or Track.objects.filter(deezer_track_id=track_id).first()
+        if not track:
+            from apps.deezer.deezer_client import DeezerClient
+            client = DeezerClient()
+            track_data = client.get_track(track_id)
+            if not track_data:
+                return {'error': 'Track not found on Deezer'}, 404
+            track, _ = Track.objects.get_or_create(deezer_track_id=track_data['id'], defaults=track_fields(track_data))
+        if PlaylistTrack.objects.filter(playlist=playlist, track=track).exists():
+            return {'error': 'Track already in playlist'}, 400
+
+        with transaction.atomic():
+            ranking.lock_playlist(playlist.id)
+            pt = PlaylistTrack.objects.create(playlist=playlist, track=track, position=next_position(playlist.id))
+            publish(playlist.id, OP_INSERT, {'track': track_entry(pt)})
+        return {'status': 'track added', 'track_id': track.id}, 201
+    except Exception as e:
+        return {'error': str(e)}, 400
+
+
+def resolve_tracks(track_ids):
+    """
+    Tracks for a list of ids, each a Track id or a Deezer id as in
+    add_track; returns ({requested id: Track}, [ids not found]). Known tracks
+    take two queries, unknown ones are fetched from Deezer concurrently
+    (AsyncDeezerClient) and created with one bulk_create.
+    """
+    numeric = [int(track_id) for track_id in track_ids if str(track_id).isdigit()]
+    by_id = Track.objects.in_bulk(numeric)
+    by_deezer = Track.objects.in_bulk([str(track_id) for track_id in track_ids], field_name='deezer_track_id')
+
+    found = {}
+    missing = []
+    for track_id in track_ids:
+        track = (by_id.get(int(track_id)) if str(track_id).isdigit() else None) or by_deezer.get(str(track_id))
+        if track:
+            found[track_id] = track
+        else:
+            missing.append(track_id)
+    if not missing:
+        return found, []
+
+    from apps.deezer.deezer_client import fetch_tracks
+    fetched = async_to_sync(fetch_tracks)(missing)
+    deezer_ids = {track_id: str(track_data['id']) for track_id, track_data in fetched.items() if track_data}
+    # Another request may create some of them meanwhile: keep its rows
+    Track.objects.bulk_create([
+        Track(deezer_track_id=deezer_ids[track_id], **track_fields(fetched[track_id]))
+        for track_id in dict.fromkeys(deezer_ids)
+    ], ignore_conflicts=True)
+    created = Track.objects.in_bulk(list(deezer_ids.values()), field_name='deezer_track_id')
+
+    not_found = []
+    for track_id in missing:
+        if track_id in deezer_ids:
+            found[track_id] = created[deezer_ids[track_id]]
+        else:
+            not_found.append(track_id)
+    return found, not_found
+
+
+def add_tracks(playlist, data):
+    """
+    Append several tracks in request order with one insert and one
+    broadcast. Tracks already in the playlist (or repeated) are skipped and
+    ids unknown to Deezer are reported; neither fails the request.
+    """
+    track_ids = data.get('track_ids')
+    if not isinstance(track_ids, list) or not track_ids:
+        return {'error': 'track_ids must be a non-empty list'}, 400
+    if len(track_ids) > settings.PLAYLIST_BULK_ADD_MAX:
+        return {'error': f'At most {settings.PLAYLIST_BULK_ADD_MAX} tracks per request'}, 400
+    if not all(isinstance(track_id, (int, str)) and str(track_id).strip() for track_id in track_ids):
+        return {'error': 'track_ids must be track or Deezer ids'}, 400
+
+    try:
+        found, not_found = resolve_tracks(list(dict.fromkeys(track_ids)))
+        with transaction.atomic():
+            ranking.lock_playlist(playlist.id)
+            present = set(PlaylistTrack.objects.filter(playlist=playlist).values_list('track_id', flat=True))
+            tracks = []
+            for track in found.values():
+                if track.id not in present:
+                    present.add(track.id)
+                    tracks.append(track)
+            start = next_position(playlist.id)
+            added = PlaylistTrack.objects.bulk_create([
+                PlaylistTrack(playlist=playlist, track=track, position=start + i * POSITION_GAP, points=0)
+                for i, track in enumerate(tracks)
+            ])
+            if added:
+                publish(playlist.id, OP_INSERT_MANY, {'tracks': [track_entry(pt) for pt in added]})
+    except Exception as e:
+        return {'error': str(e)}, 400
+
+    if not found:
+        return {'error': 'Tracks not found on Deezer', 'not_found': not_found}, 404
+    added_ids = [track.id for track in tracks]
+    body = {
+        'status': 'tracks added',
+        'track_ids': added_ids,
+        'skipped': [track_id for track_id in dict.fromkeys(t.id for t in found.values()) if track_id not in added_ids],
+        'not_found': not_found,
+    }
+    return body, 201 if added_ids else 200
+
+
+def move_track(playlist, data):
+    try:
+        range_start = data['range_start']
+        insert_before = data['insert_before']
+        range_length = data.get('range_length', 1)
+        if ranking.is_auto_ordered(playlist):
+            return {'error': 'Playlist is ordered by votes'}, 400
+        try:
+            with transaction.atomic():
+                ranking.lock_playlist(playlist.id)
+                moved = move_tracks(playlist.id, range_start, insert_before, range_length)
+                publish(playlist.id, OP_MOVE, {'tracks': [{'id': pt.id, 'position': pt.position} for pt in moved]})
+        except InvalidRange:
+            return {'error': 'Invalid range'}, 400
+        return {'message': 'Tracks reordered successfully'}, 200
+    except Exception as e:
+        return {'error': str(e)}, 400
+
+
+def remove_track(playlist, data):
+    try:
+        track_to_delete = PlaylistTrack.objects.get(playlist=playlist, id=data['track_id'])
+        # Positions are sparse, so the remaining tracks keep theirs
+        with transaction.atomic():
+            ranking.lock_playlist(playlist.id)
+            removed_id = track_to_delete.id
+            track_to_delete.delete()
+            publish(playlist.id, OP_REMOVE, {'id': removed_id})
+        return {'message': 'Track deleted successfully'}, 200
+    except PlaylistTrack.DoesNotExist:
+        return {'error': 'Track not found in playlist'}, 404
+    except Exception as e:
+        return {'error': str(e)}, 400
+
+
+def vote(playlist, user, data):
+    serializer = VoteSerializer(data=data)
+    if not serializer.is_valid():
+        return serializer.errors, 400
+
+    range_start = serializer.validated_data["range_start"]
+    pt_id = track_id_at(playlist.id, range_start)
+    if pt_id is None:
+        return {'error': 'Invalid track index'}, 400
+
+    if vote_buffer.is_enabled():
+        # Counted and broadcast by the run_vote_buffer worker on its next tick
+        if not vote_buffer.record_vote(playlist.id, user.id, pt_id):
+            return {'error': 'You have already voted for this playlist'}, 403
+        return {'message': 'Vote recorded'}, 202
+
+    with transaction.atomic():
+        ranking.lock_playlist(playlist.id)
+        auto_order = ranking.is_auto_ordered(playlist)
+        try:
+            with transaction.atomic():
+                result = cast_vote(playlist.id, user.id, pt_id)
+        except IntegrityError:
+            # Track removed between track_id_at and the ledger insert
+            return {'error': 'Track not found in playlist'}, 404
+        if result is None:
+            return {'error': 'You have already voted for this playlist'}, 403
+        points, position = result
+        if auto_order:
+            position = ranking.reposition(playlist.id, pt_id, points, position)
+        publish(playlist.id, OP_POINTS, {'tracks': [{'id': pt_id, 'points': points, 'position': position}]})
+
+    tracks = playlist.tracks.select_related('track')
+    track_list = [{'name': pt.track.name, 'artist': pt.track.artist, 'points': pt.points} for pt in tracks]
+    return {'playlist': [{
+        'id': playlist.id,
+        'playlist_name': playlist.name,
+        'description': playlist.description,
+        'public': playlist.public,
+        'creator': playlist.creator.username,
+        'tracks': track_list,
+    }]}, 200
+
+
+def apply(action, user, playlist_id, data, latlon=None):
+    """
+    Access check and mutation in one call, for the callers that do not go
+    through the DRF decorators: async views and websocket commands.
+    """
+    if action == VOTE:
+        playlist, error = vote_access(user, playlist_id, latlon)
+    else:
+        playlist, error = playlist_access(user, playlist_id)
+    if error:
+        return error
+
+    if action == VOTE:
+        return vote(playlist, user, data)
+    return {ADD: add_track, ADD_BULK: add_tracks, MOVE: move_track, REMOVE: remove_track}[action](playlist, data)
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+from apps.playlists import geohash
+from apps.playlists.geofence import EARTH_RADIUS_M
+from apps.playlists.models import Playlist
+
+
+# "Public events near me": the geohash prefixes of the 3x3 cells around the
+# user narrow the candidates with index range scans on Playlist.geohash, then
+# the haversine distance is computed in SQL for the exact radius filter and
+# the ordering.
+
+
+class NearbyParamError(ValueError):
+    pass
+
+
+def parse_nearby_params(request):
+    try:
+        lat = float(request.GET['lat'])
+        lon = float(request.GET['lon'])
+    except (KeyError, TypeError, ValueError):
+        raise NearbyParamError('lat and lon are required numbers.')
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise NearbyParamError('lat must be within [-90, 90] and lon within [-180, 180].')
+
+    try:
+        radius = float(request.GET.get('radius', settings.NEARBY_EVENTS_RADIUS))
+        offset = int(request.GET.get('offset', 0) or 0)
+        limit = int(request.GET.get('limit', settings.NEARBY_EVENTS_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise NearbyParamError('radius, offset and limit must be numbers.')
+    if radius <= 0 or offset < 0 or limit < 1:
+        raise NearbyParamError('radius and limit must be positive, offset >= 0.')
+
+    radius = min(radius, settings.NEARBY_EVENTS_MAX_RADIUS)
+    limit = min(limit, settings.NEARBY_EVENTS_MAX_PAGE_SIZE)
+    return lat, lon, radius, offset, limit
+
+
+def haversine_expression(lat, lon):
+    phi = Radians(F('latitude'))
+    a = (
+        Power(Sin((phi - Radians(Value(lat))) / 2), 2)
+        + Cos(Radians(Value(lat))) * Cos(phi) * Power(Sin((Radians(F('longitude')) - Radians(Value(lon))) / 2), 2)
+    )
+    return 2 * EARTH_RADIUS_M * ASin(Sqrt(a), output_field=FloatField())
+
+
+def nearby_events(lat, lon, radius, offset, limit):
+    """
+    Public events within `radius` meters, closest first.
+    Returns (events, has_more); each event is annotated with `distance`.
+    """
+    cells = Q()
+    for prefix in geohash.covering(lat, lon, radius):
+        cells |= Q(geohash__startswith=prefix)
+
+    rows = list(
+        Playlist.objects
+        .filter(cells, event=True, public=True, geohash__isnull=False)
+        .annotate(distance=haversine_expression(lat, lon))
+        .filter(distance__lte=radius)
+        .order_by('distance', 'id')[offset:offset + limit + 1]
+    )
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,124 @@
+from django.db import transaction
+from django.db.models import Max
+from apps.playlists.models import PlaylistTrack, POSITION_GAP
+
+
+# Positions are sparse integers spaced POSITION_GAP apart, so a track can be
+# moved between two neighbours by giving it a position in the gap instead of
+# renumbering the whole playlist. When a gap runs out the playlist is
+# renumbered once (see rebalance and the rebalance_positions command).
+
+
+class InvalidRange(ValueError):
+    pass
+
+
+def next_position(playlist_id):
+    max_pos = PlaylistTrack.objects.filter(playlist_id=playlist_id).aggregate(Max('position'))['position__max']
+    return POSITION_GAP if max_pos is None else max_pos + POSITION_GAP
+
+
+def rebalance(playlist_id):
+    """
+    Renumber every track of a playlist to GAP, 2*GAP, 3*GAP... keeping the
+    current order. The (playlist, position) constraint is deferred, so the
+    single bulk update cannot collide with itself.
+    """
+    with transaction.atomic():
+        ids = list(
+            PlaylistTrack.objects.select_for_update()
+            .filter(playlist_id=playlist_id)
+            .order_by('position', 'id')
+            .values_list('id', flat=True)
+        )
+        rows = [PlaylistTrack(id=pk, position=(i + 1) * POSITION_GAP) for i, pk in enumerate(ids)]
+        PlaylistTrack.objects.bulk_update(rows, ['position'], batch_size=1000)
+    return len(rows)
+
+
+def min_gap(playlist_id):
+    positions = list(
+        PlaylistTrack.objects.filter(playlist_id=playlist_id).order_by('position').values_list('position', flat=True)
+    )
+    if len(positions) < 2:
+        return None
+    return min(b - a for a, b in zip(positions, positions[1:]))
+
+
+def _position_at(queryset, index):
+    if index < 0:
+        return None
+    return queryset.values_list('position', flat=True)[index:index + 1].first()
+
+
+def slots_between(low, high, count):
+    """
+    `count` evenly spread integers strictly between low and high, or None if
+    the gap is too small. `low` is None at the head of the playlist and
+    `high` is None at the tail.
+    """
+    if low is None:
+        low = -1
+    if high is None:
+        high = low + (count + 1) * POSITION_GAP
+    step = (high - low) // (count + 1)
+    if step < 1:
+        return None
+    return [low + step * (i + 1) for i in range(count)]
+
+
+def _move_with_rebalance(playlist_id, moving, range_start, insert_before):
+    ids = list(
+        PlaylistTrack.objects.filter(playlist_id=playlist_id).order_by('position').values_list('id', flat=True)
+    )
+    moving_ids = ids[range_start:range_start + len(moving)]
+    del ids[range_start:range_start + len(moving)]
+    if insert_before > range_start:
+        insert_before -= len(moving)
+    ids[insert_before:insert_before] = moving_ids
+
+    new_positions = {pk: (i + 1) * POSITION_GAP for i, pk in enumerate(ids)}
+    rows = [PlaylistTrack(id=pk, position=position) for pk, position in new_positions.items()]
+    PlaylistTrack.objects.bulk_update(rows, ['position'], batch_size=1000)
+    for pt in moving:
+        pt.position = new_positions[pt.id]
+    return moving
+
+
+def move_tracks(playlist_id, range_start, insert_before, range_length=1):
+    """
+    Move `range_length` tracks starting at index `range_start` so that they
+    sit before the track currently at index `insert_before` (Spotify-style
+    indices). Only the moved rows are written unless the target gap is
+    exhausted, in which case the whole playlist is renumbered once.
+
+    Returns the moved PlaylistTrack rows with their new positions.
+    """
+    if range_start < 0 or range_length < 1:
+        raise InvalidRange('Invalid range')
+    insert_before = max(insert_before, 0)
+
+    with transaction.atomic():
+        ordered = PlaylistTrack.objects.filter(playlist_id=playlist_id).order_by('position')
+        moving = list(ordered.select_for_update()[range_start:range_start + range_length])
+        if not moving:
+            raise InvalidRange('Invalid range')
+
+        range_end = range_start + len(moving)
+        if range_start <= insert_before <= range_end:
+            return moving
+
+        high = _position_at(ordered, insert_before)
+        if high is None:
+            # past the end: append after the current last track
+            low = ordered.aggregate(Max('position'))['position__max']
+        else:
+            low = _position_at(ordered, insert_before - 1)
+        slots = slots_between(low, high, len(moving))
+        if slots is None:
+            return _move_with_rebalance(playlist_id, moving, range_start, insert_before)
+
+        for pt, position in zip(moving, slots):
+            pt.position = position
+        PlaylistTrack.objects.bulk_update(moving, ['position'])
+    return moving
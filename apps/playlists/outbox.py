@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from collections import Counter, defaultdict, deque
+
+
+logger = logging.getLogger(__name__)
+
+# Per-socket send queue of PlaylistConsumer.
+#
+# Group messages are queued here, already encoded (see broadcast.encode), and
+# written by a separate task, so a client that reads slowly no longer stalls
+# the consumer: it keeps draining its channel-layer queue (which drops
+# messages silently once `capacity` is reached) while the backlog is
+# coalesced here instead:
+#   - a newer playlist_update snapshot, voting notice or listener count
+#     replaces a queued one;
+#   - deltas whose revision is already covered are skipped;
+#   - a revision gap (the channel layer dropped something) or more than
+#     `max_deltas` queued deltas turns the backlog into one resync: the writer
+#     sends a fresh snapshot instead.
+
+UPDATE = 'update'
+VOTING = 'voting'
+PRESENCE = 'presence'
+DELTA = 'delta'
+RESYNC = 'resync'
+
+COALESCED = 'coalesced'
+DROPPED = 'dropped'
+RESYNCS = 'resyncs'
+
+_counters = defaultdict(Counter)
+
+
+def record(group, metric, count=1):
+    if count:
+        _counters[group][metric] += count
+
+
+def stats():
+    """
+    {group: {'coalesced': n, 'dropped': n, 'resyncs': n}} for this process.
+    """
+    return {group: dict(counter) for group, counter in _counters.items()}
+
+
+def reset_stats():
+    _counters.clear()
+
+
+class Outbox:
+    def __init__(self, group, max_deltas):
+        self.group = group
+        self.max_deltas = max_deltas
+        self.entries = deque()
+        self.revision = None  # last revision queued or sent, None until known
+        self.ready = asyncio.Event()
+
+    def _replace(self, kind, text):
+        before = len(self.entries)
+        self.entries = deque(entry for entry in self.entries if entry[0] != kind)
+        record(self.group, COALESCED, before - len(self.entries))
+        self._push(kind, None, text)
+
+    def _push(self, kind, revision, text):
+        self.entries.append((kind, revision, text))
+        self.ready.set()
+
+    def _resync_pending(self):
+        return any(entry[0] == RESYNC for entry in self.entries)
+
+    def _resync(self):
+        """
+        Collapse the queued deltas into one snapshot request.
+        """
+        queued = len(self.entries)
+        self.entries = deque(entry for entry in self.entries if entry[0] != DELTA)
+        record(self.group, COALESCED, queued - len(self.entries))
+        if not self._resync_pending():
+            record(self.group, RESYNCS)
+            self._push(RESYNC, None, None)
+
+    def put_update(self, text):
+        self._replace(UPDATE, text)
+
+    def put_voting(self, text):
+        self._replace(VOTING, text)
+
+    def put_presence(self, text):
+        self._replace(PRESENCE, text)
+
+    def put_delta(self, revision, text):
+        if self._resync_pending() or (self.revision is not None and revision <= self.revision):
+            record(self.group, COALESCED)
+            return
+        if self.revision is not None and revision > self.revision + 1:
+            missing = revision - self.revision - 1
+            logger.warning("%s: %d delta(s) dropped before reaching this socket, resyncing", self.group, missing)
+            record(self.group, DROPPED, missing)
+            self._resync()
+            return
+
+        self.revision = revision
+        self._push(DELTA, revision, text)
+        if sum(1 for entry in self.entries if entry[0] == DELTA) > self.max_deltas:
+            self._resync()
+
+    def resynced(self, revision):
+        """
+        The writer sent a snapshot at `revision`: deltas queued meanwhile
+        that it already contains are skipped.
+        """
+        queued = len(self.entries)
+        self.entries = deque(
+            entry for entry in self.entries if entry[0] != DELTA or entry[1] > revision
+        )
+        record(self.group, COALESCED, queued - len(self.entries))
+        deltas = [entry[1] for entry in self.entries if entry[0] == DELTA]
+        if not deltas:
+            self.revision = revision
+        elif deltas[0] > revision + 1:
+            record(self.group, DROPPED, deltas[0] - revision - 1)
+            self._resync()
+
+    async def get(self):
+        while not self.entries:
+            self.ready.clear()
+            await self.ready.wait()
+        kind, _, text = self.entries.popleft()
+        if kind == RESYNC:
+            # Revisions are unknown until the snapshot is read
+            self.revision = None
+        return kind, text
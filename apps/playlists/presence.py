@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+import redis
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from apps.playlists.broadcast import encode, group_name
+
+
+logger = logging.getLogger(__name__)
+
+# Live listeners per playlist room.
+#
+# presence:<playlist> is a sorted set of websocket channel names scored by
+# their last heartbeat; a member counts while its score is younger than
+# PRESENCE_TTL, so sockets of a crashed process age out on their own.
+# Joins and leaves are only recorded in memory by PlaylistConsumer; one task
+# per process writes them every PRESENCE_FLUSH_INTERVAL in a single pipeline,
+# refreshes the heartbeat of all its sockets every PRESENCE_HEARTBEAT (one
+# ZADD per playlist, not per socket), and announces the new count to the room
+# as a `presence` message when it changed.
+
+KEY_PREFIX = 'presence'
+
+_client = None
+
+
+def presence_key(playlist_id):
+    return f'{KEY_PREFIX}:{playlist_id}'
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=int(settings.REDIS_PORT),
+            socket_timeout=settings.PRESENCE_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.PRESENCE_REDIS_TIMEOUT,
+        )
+    return _client
+
+
+def count(playlist_id, now=None):
+    now = now or time.time()
+    return get_client().zcount(presence_key(playlist_id), now - settings.PRESENCE_TTL, '+inf')
+
+
+def presence_payload(playlist_id, listeners):
+    return {'type': 'presence', 'playlist_id': int(playlist_id), 'listeners': listeners}
+
+
+class Tracker:
+    def __init__(self):
+        self.local = defaultdict(set)  # playlist -> channel names on this process
+        self.left = defaultdict(set)   # playlist -> channel names to remove
+        self.dirty = set()
+        self.announced = {}
+        self.last_heartbeat = 0
+        self.task = None
+
+    def join(self, playlist_id, channel_name):
+        self.local[playlist_id].add(channel_name)
+        self.left[playlist_id].discard(channel_name)
+        self.dirty.add(playlist_id)
+        self._start()
+
+    def leave(self, playlist_id, channel_name):
+        self.local[playlist_id].discard(channel_name)
+        if not self.local[playlist_id]:
+            del self.local[playlist_id]
+        self.left[playlist_id].add(channel_name)
+        self.dirty.add(playlist_id)
+        self._start()
+
+    def _start(self):
+        loop = asyncio.get_running_loop()
+        if self.task is None or self.task.done() or self.task.get_loop() is not loop:
+            self.task = loop.create_task(self.run())
+
+    async def run(self):
+        while self.local or self.dirty:
+            await asyncio.sleep(settings.PRESENCE_FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except redis.RedisError:
+                logger.warning("Presence flush failed", exc_info=True)
+
+    def plan(self, now):
+        """
+        What the next flush writes: [(playlist, members, left)] for the
+        playlists that changed, or all local ones when a heartbeat is due.
+        Taken on the event loop, so join/leave never race with the write.
+        """
+        heartbeat = now - self.last_heartbeat >= settings.PRESENCE_HEARTBEAT
+        if heartbeat:
+            self.last_heartbeat = now
+        playlists = self.dirty | (set(self.local) if heartbeat else set())
+        self.dirty = set()
+        return [
+            (playlist_id, list(self.local.get(playlist_id, ())), self.left.pop(playlist_id, set()))
+            for playlist_id in sorted(playlists)
+        ]
+
+    @staticmethod
+    def write(plan, now):
+        """
+        One pipeline for the whole plan; returns {playlist: listener count}.
+        """
+        pipe = get_client().pipeline(transaction=False)
+        for playlist_id, members, left in plan:
+            key = presence_key(playlist_id)
+            if members:
+                pipe.zadd(key, {member: now for member in members})
+            if left:
+                pipe.zrem(key, *left)
+            pipe.zremrangebyscore(key, '-inf', now - settings.PRESENCE_TTL)
+            pipe.expire(key, settings.PRESENCE_TTL * 2)
+            pipe.zcard(key)
+        results = iter(pipe.execute())
+
+        counts = {}
+        for playlist_id, members, left in plan:
+            for _ in range(bool(members) + bool(left) + 2):
+                next(results)
+            counts[playlist_id] = next(results)
+        return counts
+
+    async def flush(self, now=None):
+        now = now or time.time()
+        plan = self.plan(now)
+        if not plan:
+            return
+        try:
+            counts = await sync_to_async(self.write, thread_sensitive=False)(plan, now)
+        except redis.RedisError:
+            # Keep the changes for the next tick
+            for playlist_id, _, left in plan:
+                self.left[playlist_id] |= left
+                self.dirty.add(playlist_id)
+            raise
+
+        layer = get_channel_layer()
+        for playlist_id, listeners in counts.items():
+            if self.announced.get(playlist_id) == listeners:
+                continue
+            if playlist_id in self.local:
+                self.announced[playlist_id] = listeners
+            else:
+                self.announced.pop(playlist_id, None)
+            await layer.group_send(group_name(playlist_id), {
+                'type': 'playlist.presence',
+                'playlist_id': int(playlist_id),
+                'listeners': listeners,
+                'text': encode(presence_payload(playlist_id, listeners)),
+            })
+
+
+tracker = Tracker()
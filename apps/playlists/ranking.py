@@ -0,0 +1,92 @@
+from django.db import transaction
+from django.db.models import F, Max, Min, Q
+from apps.playlists.models import Playlist, PlaylistTrack, POSITION_GAP
+from apps.playlists.ordering import rebalance, slots_between
+
+
+# Event auto-order: for playlists with event=True and auto_order=True the
+# track order is kept sorted by points (highest first), ties broken by
+# insertion order (PlaylistTrack.id). A vote only moves the voted row into
+# the gap between its new neighbours, like a manual move.
+
+
+def is_auto_ordered(playlist):
+    return playlist.event and playlist.auto_order
+
+
+def lock_playlist(playlist_id):
+    """
+    Serialize re-ranking per playlist. Must be taken before any PlaylistTrack
+    row lock in the same transaction to keep lock order consistent.
+    """
+    list(Playlist.objects.select_for_update().filter(id=playlist_id).values_list('id', flat=True))
+
+
+def _ranked_ahead(pt_id, points):
+    return Q(points__gt=points) | Q(points=points, id__lt=pt_id)
+
+
+def _neighbours(playlist_id, pt_id, points, pending_ids=()):
+    others = PlaylistTrack.objects.filter(playlist_id=playlist_id).exclude(id=pt_id)
+    if pending_ids:
+        others = others.exclude(id__in=pending_ids)
+    ahead = _ranked_ahead(pt_id, points)
+    low = others.filter(ahead).aggregate(Max('position'))['position__max']
+    high = others.exclude(ahead).aggregate(Min('position'))['position__min']
+    return low, high
+
+
+def reposition(playlist_id, pt_id, points, position, pending_ids=()):
+    """
+    Move one track to its ranked place and return its new position.
+    Assumes the rest of the playlist, ignoring `pending_ids` (other tracks
+    whose points changed and are yet to be repositioned), is sorted.
+    """
+    low, high = _neighbours(playlist_id, pt_id, points, pending_ids)
+    if (low is None or low < position) and (high is None or position < high):
+        return position
+
+    slots = slots_between(low, high, 1)
+    if slots is None:
+        rebalance(playlist_id)
+        low, high = _neighbours(playlist_id, pt_id, points, pending_ids)
+        slots = slots_between(low, high, 1)
+
+    PlaylistTrack.objects.filter(id=pt_id).update(position=slots[0])
+    return slots[0]
+
+
+def reposition_many(playlist_id, scores):
+    """
+    Re-rank several tracks whose points changed together (a vote buffer
+    flush). `scores` maps playlist_track_id -> (points, position); returns
+    the same mapping with updated positions.
+    """
+    pending = sorted(scores, key=lambda pk: (-scores[pk][0], pk))
+    result = {}
+    while pending:
+        pt_id = pending.pop(0)
+        points, position = scores[pt_id]
+        result[pt_id] = (points, reposition(playlist_id, pt_id, points, position, pending))
+    return result
+
+
+def sort_by_points(playlist_id):
+    """
+    Full sort, used once when auto-order is switched on.
+    Returns [{'id', 'position'}] for every track.
+    """
+    with transaction.atomic():
+        lock_playlist(playlist_id)
+        ids = list(
+            PlaylistTrack.objects.filter(playlist_id=playlist_id)
+            .order_by(F('points').desc(nulls_last=True), 'id')
+            .values_list('id', flat=True)
+        )
+        rows = [PlaylistTrack(id=pk, position=(i + 1) * POSITION_GAP) for i, pk in enumerate(ids)]
+        PlaylistTrack.objects.bulk_update(rows, ['position'], batch_size=1000)
+    return [{'id': pt.id, 'position': pt.position} for pt in rows]
+
+
+def next_up(playlist_id, limit):
+    return PlaylistTrack.objects.filter(playlist_id=playlist_id).select_related('track').order_by('position')[:limit]
@@ -1,3 +1,4 @@
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from rest_framework import serializers
 from .models import Playlist
 from django.contrib.auth import get_user_model
@@ -17,11 +18,19 @@ class Meta:
             'invited_users',
             'vote_start_time',
             'vote_end_time',
+            'timezone',
             'latitude',
             'longitude',
             'allowed_radius_meters',
         ]
 
+    def validate_timezone(self, value):
+        try:
+            ZoneInfo(value)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise serializers.ValidationError("Unknown timezone.")
+        return value
+
 
 class VoteSerializer(serializers.Serializer):
     range_start = serializers.IntegerField()
\ No newline at end of file
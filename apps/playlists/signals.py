@@ -0,0 +1,33 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from apps.playlists import access
+from apps.playlists.models import Playlist
+
+
+# Drop cached access decisions (apps/playlists/access.py) whenever one of
+# their inputs changes: the playlist row itself or one of its memberships.
+
+
+@receiver(post_save, sender=Playlist)
+@receiver(post_delete, sender=Playlist)
+def playlist_changed(sender, instance, **kwargs):
+    access.invalidate(instance.pk)
+
+
+@receiver(m2m_changed, sender=Playlist.users_saved.through)
+@receiver(m2m_changed, sender=Playlist.invited_users.through)
+def membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            access.invalidate(instance.pk)
+        return
+
+    # user.saved_playlists / user.invited_to_playlists side
+    if action in ('post_add', 'post_remove'):
+        playlist_ids = pk_set
+    elif action == 'pre_clear':
+        playlist_ids = list(sender.objects.filter(customuser_id=instance.pk).values_list('playlist_id', flat=True))
+    else:
+        return
+    for playlist_id in playlist_ids:
+        access.invalidate(playlist_id)
@@ -0,0 +1,176 @@
+import logging
+import threading
+from collections import Counter, OrderedDict
+import redis
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import Http404, HttpResponse
+from apps.playlists.broadcast import encode
+from apps.playlists.models import Playlist, PlaylistTrack
+from apps.tracks.models import Track
+from core.utils.conditional import not_modified, with_validators
+
+
+logger = logging.getLogger(__name__)
+
+# Encoded GET responses of a playlist, keyed by (view, playlist, validator).
+#
+# Every mutation bumps Playlist.revision (track changes and metadata alike,
+# see broadcast.publish), but the responses also embed rows that change
+# without a revision bump: Track metadata, refreshed by the tracks search
+# upsert, and the creator's and saved-by users' usernames. The validator is
+# therefore the revision plus a digest of those embedded rows, computed by
+# Postgres in one query (VALIDATOR_SQL) without building the response. Any
+# change to them yields a new key; old entries age out of the per-process LRU
+# and Redis (PLAYLIST_SNAPSHOT_TTL). The ETag is
+# "<playlist>-<revision>-<digest>", so a client polling with If-None-Match
+# gets a 304 without the response being built or encoded, and otherwise the
+# cached bytes are returned as is.
+
+KEY_PREFIX = 'playlist_snapshot'
+
+User = get_user_model()
+SAVED = Playlist.users_saved.through
+SAVED_PLAYLIST_COLUMN = Playlist._meta.get_field('users_saved').m2m_column_name()
+SAVED_USER_COLUMN = Playlist._meta.get_field('users_saved').m2m_reverse_name()
+
+INFO = 'info'
+TRACKS = 'tracks'
+
+_client = None
+
+
+VALIDATOR_SQL = f"""
+    SELECT p.revision, md5(ROW(
+        (SELECT u.username FROM {User._meta.db_table} u WHERE u.id = p.creator_id),
+        (SELECT string_agg(ROW(u.id, u.username)::text, ',' ORDER BY u.id)
+         FROM {SAVED._meta.db_table} saved
+         JOIN {User._meta.db_table} u ON u.id = saved.{SAVED_USER_COLUMN}
+         WHERE saved.{SAVED_PLAYLIST_COLUMN} = p.id),
+        (SELECT string_agg(ROW(t.id, t.deezer_track_id, t.name, t.artist, t.album, t.url,
+                               t.picture_small, t.picture_medium)::text, ',' ORDER BY t.id)
+         FROM {PlaylistTrack._meta.db_table} pt
+         JOIN {Track._meta.db_table} t ON t.id = pt.track_id
+         WHERE pt.playlist_id = p.id)
+    )::text)
+    FROM {Playlist._meta.db_table} p
+    WHERE p.id = %s
+"""
+
+
+def validator(playlist_id):
+    """
+    (revision, digest) of a playlist, or None if it does not exist.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(VALIDATOR_SQL, [playlist_id])
+        return cursor.fetchone()
+
+
+def cache_key(view, playlist_id, revision, digest):
+    return f'{KEY_PREFIX}:{view}:{playlist_id}:{revision}:{digest}'
+
+
+def etag(playlist_id, revision, digest):
+    return f'"{playlist_id}-{revision}-{digest}"'
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=int(settings.REDIS_PORT),
+            socket_timeout=settings.PLAYLIST_SNAPSHOT_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.PLAYLIST_SNAPSHOT_REDIS_TIMEOUT,
+        )
+    return _client
+
+
+class SnapshotCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = Counter()
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def stats(self):
+        """
+        Counters since process start: local_hits, redis_hits, misses, not_modified.
+        """
+        with self.lock:
+            return dict(self.counters)
+
+    def _local_get(self, key):
+        with self.lock:
+            body = self.entries.get(key)
+            if body is not None:
+                self.entries.move_to_end(key)
+            return body
+
+    def _local_set(self, key, body):
+        with self.lock:
+            self.entries[key] = body
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def get(self, key):
+        body = self._local_get(key)
+        if body is not None:
+            self._count('local_hits')
+            return body
+        try:
+            body = get_client().get(key)
+        except redis.RedisError as e:
+            logger.warning("Playlist snapshot cache unavailable: %s", e)
+            body = None
+        if body is not None:
+            self._count('redis_hits')
+            self._local_set(key, body)
+        return body
+
+    def set(self, key, body):
+        self._local_set(key, body)
+        try:
+            get_client().set(key, body, ex=settings.PLAYLIST_SNAPSHOT_TTL)
+        except redis.RedisError as e:
+            logger.warning("Playlist snapshot cache unavailable: %s", e)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.counters.clear()
+
+
+cache = SnapshotCache(settings.PLAYLIST_SNAPSHOT_CACHE_SIZE)
+
+
+def respond(request, view, playlist_id, build):
+    """
+    Conditional GET for a playlist read endpoint. `build(playlist_id)` returns
+    the payload and only runs on a cache miss; a missing playlist is a 404.
+    """
+    current = validator(playlist_id)
+    if current is None:
+        raise Http404('No Playlist matches the given query.')
+    tag = etag(playlist_id, *current)
+
+    response = not_modified(request, tag)
+    if response is not None:
+        cache._count('not_modified')
+        return response
+
+    key = cache_key(view, playlist_id, *current)
+    body = cache.get(key) if settings.PLAYLIST_SNAPSHOT_CACHE_ENABLED else None
+    if body is None:
+        cache._count('misses')
+        body = encode(build(playlist_id)).encode()
+        if settings.PLAYLIST_SNAPSHOT_CACHE_ENABLED:
+            cache.set(key, body)
+    return with_validators(HttpResponse(body, content_type='application/json'), tag)
@@ -0,0 +1,57 @@
+import importlib
+import fakeredis
+import pytest
+from django.urls import clear_url_caches
+from apps.playlists import access, presence, snapshots, vote_buffer
+
+
+@pytest.fixture
+def in_memory_channel_layer(settings):
+    """
+    Per-test in-memory channel layer: the Redis layer keeps per-event-loop
+    state that does not survive pytest-asyncio creating a new loop per test.
+    """
+    settings.CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch):
+    """
+    A fresh in-memory Redis per test (Lua scripts included) behind the
+    access, presence, snapshot and vote buffer clients, so the suite runs
+    without a Redis server and no keys leak from one test to the next.
+    """
+    client = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+    for module in (access, presence, snapshots, vote_buffer):
+        monkeypatch.setattr(module, '_client', client)
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_snapshot_cache():
+    """
+    Playlist ids start over with every test database, so snapshots kept in
+    this process by an earlier test could match a new playlist's (id, revision).
+    """
+    snapshots.cache.clear()
+
+
+def _reload_urls(settings):
+    # Imported here: importing the views at collection time would fix DRF's
+    # throttle classes before the root conftest disables them
+    importlib.reload(importlib.import_module('apps.playlists.urls'))
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_views_enabled(settings):
+    """
+    Mount the async mutation views, which urls.py only does when
+    PLAYLIST_ASYNC_VIEWS is set at import time.
+    """
+    settings.PLAYLIST_ASYNC_VIEWS = True
+    _reload_urls(settings)
+    yield
+    settings.PLAYLIST_ASYNC_VIEWS = False
+    _reload_urls(settings)
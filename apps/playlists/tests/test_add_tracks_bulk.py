@@ -0,0 +1,96 @@
+import pytest
+from unittest.mock import patch
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.users.tests.conftest import authenticated_user
+from apps.deezer.tests.conftest import deezer_stub
+from apps.playlists.broadcast import OP_INSERT_MANY
+from apps.playlists.models import Playlist, PlaylistTrack, POSITION_GAP
+from apps.tracks.models import Track
+
+
+def deezer_track(deezer_id, title):
+    return {
+        "id": deezer_id,
+        "title": title,
+        "link": f"https://www.deezer.com/track/{deezer_id}",
+        "artist": {"name": "Daft Punk"},
+        "album": {"title": "Discovery", "cover_small": "", "cover_medium": ""},
+    }
+
+
+@pytest.mark.django_db
+def test_add_tracks_bulk_success(authenticated_user, deezer_stub):
+    """
+        # Add a known track, two Deezer-only tracks, a repeat, a track already in the playlist and an unknown id
+        # Ensure new tracks are appended in order with one broadcast and the others are reported
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    playlist = Playlist.objects.create(name="Fav999", description="Fav999", creator=user)
+    present = Track.objects.create(name="Song A", artist="Artist A", deezer_track_id="1000")
+    known = Track.objects.create(name="Song B", artist="Artist B", deezer_track_id="1001")
+    PlaylistTrack.objects.create(playlist=playlist, track=present, position=POSITION_GAP)
+    deezer_stub.add("/track/3135556", 200, deezer_track(3135556, "Harder, Better, Faster, Stronger"))
+    deezer_stub.add("/track/3135553", 200, deezer_track(3135553, "One More Time"))
+
+    url = reverse("playlists:add_tracks_bulk", args=[playlist.id])
+    with patch("apps.playlists.mutations.publish") as publish:
+        response = client.post(url, {"track_ids": [known.id, "3135556", 3135553, known.id, "1000", "9999999"]}, format="json")
+
+    assert response.status_code == 201
+    data = response.json()
+    new = Track.objects.get(deezer_track_id="3135556"), Track.objects.get(deezer_track_id="3135553")
+    assert data == {
+        "status": "tracks added",
+        "track_ids": [known.id, new[0].id, new[1].id],
+        "skipped": [present.id],
+        "not_found": ["9999999"],
+    }
+    tracks = list(PlaylistTrack.objects.filter(playlist=playlist).values_list("track__name", flat=True))
+    assert tracks == ["Song A", "Song B", "Harder, Better, Faster, Stronger", "One More Time"]
+
+    publish.assert_called_once()
+    playlist_id, op, payload = publish.call_args.args
+    assert op == OP_INSERT_MANY
+    assert [t["track"]["id"] for t in payload["tracks"]] == data["track_ids"]
+
+
+@pytest.mark.django_db
+def test_add_tracks_bulk_invalid(authenticated_user, settings):
+    """
+        # Send no list, then more ids than allowed
+        # Ensure get response 400 for both
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    playlist = Playlist.objects.create(name="Fav999", description="Fav999", creator=user)
+    url = reverse("playlists:add_tracks_bulk", args=[playlist.id])
+    settings.PLAYLIST_BULK_ADD_MAX = 2
+
+    response = client.post(url, {"track_ids": "1000"}, format="json")
+    assert response.status_code == 400
+    assert response.json() == {"error": "track_ids must be a non-empty list"}
+
+    response = client.post(url, {"track_ids": [1, 2, 3]}, format="json")
+    assert response.status_code == 400
+    assert response.json() == {"error": "At most 2 tracks per request"}
+
+
+@pytest.mark.django_db
+def test_add_tracks_bulk_not_found(authenticated_user, deezer_stub):
+    """
+        # Add ids that exist neither locally nor on Deezer
+        # Ensure get response 404 listing them
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    playlist = Playlist.objects.create(name="Fav999", description="Fav999", creator=user)
+
+    response = client.post(reverse("playlists:add_tracks_bulk", args=[playlist.id]), {"track_ids": ["9999998", "9999999"]}, format="json")
+    assert response.status_code == 404
+    assert response.json() == {"error": "Tracks not found on Deezer", "not_found": ["9999998", "9999999"]}
+    assert not PlaylistTrack.objects.filter(playlist=playlist).exists()
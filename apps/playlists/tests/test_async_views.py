@@ -0,0 +1,169 @@
+import pytest
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.throttling import UserRateThrottle
+from rest_framework.test import APIClient
+from apps.users.tests.conftest import authenticated_user
+from apps.playlists.broadcast import group_name
+from apps.playlists.models import Playlist, Track, PlaylistTrack
+
+
+def make_playlist(user, tracks=2, license_type="open"):
+    playlist = Playlist.objects.create(
+        name="Fav999",
+        description="Fav999",
+        public=True,
+        license_type=license_type,
+        creator=user,
+        event=False
+    )
+    for i in range(tracks):
+        track, _ = Track.objects.get_or_create(
+            deezer_track_id=str(2000 + i), defaults={'name': f"Song {i}", 'artist': f"Artist {i}"}
+        )
+        PlaylistTrack.objects.create(playlist=playlist, track=track, position=i, points=0)
+    return playlist
+
+
+def api_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    return client
+
+
+pytestmark = pytest.mark.usefixtures("async_views_enabled")
+
+
+@pytest.mark.django_db
+def test_async_add_track(authenticated_user):
+    """
+        # Add a track through the async view
+        # Ensure get response 201 and the track is in the playlist
+    """
+    user, token = authenticated_user
+    playlist = make_playlist(user, tracks=0)
+    track = Track.objects.create(name="Song A", artist="Artist A", deezer_track_id="1000")
+
+    url = reverse("playlists:add_track_async", args=[playlist.id])
+    response = api_client(token).post(url, {"track_id": track.id}, format="json")
+
+    assert response.status_code == 201
+    assert response.json() == {'status': 'track added', 'track_id': track.id}
+    assert PlaylistTrack.objects.filter(playlist=playlist, track=track).exists()
+
+    response = api_client(token).post(url, {"track_id": track.id}, format="json")
+    assert response.status_code == 400
+    assert response.json() == {'error': 'Track already in playlist'}
+
+
+@pytest.mark.django_db
+def test_async_move_and_delete_track(authenticated_user):
+    """
+        # Move then delete tracks through the async views
+        # Ensure the responses match the sync views
+    """
+    user, token = authenticated_user
+    playlist = make_playlist(user)
+    first, second = PlaylistTrack.objects.filter(playlist=playlist).order_by('position')
+    client = api_client(token)
+
+    url = reverse("playlists:move_track_in_playlist_async", args=[playlist.id])
+    response = client.post(url, {"range_start": 0, "insert_before": 2}, format="json")
+    assert response.status_code == 200
+    assert response.json() == {'message': 'Tracks reordered successfully'}
+    order = list(PlaylistTrack.objects.filter(playlist=playlist).order_by('position').values_list('id', flat=True))
+    assert order == [second.id, first.id]
+
+    url = reverse("playlists:remove_items_async", args=[playlist.id])
+    response = client.post(url, {"track_id": first.id}, format="json")
+    assert response.status_code == 200
+    response = client.post(url, {"track_id": first.id}, format="json")
+    assert response.status_code == 404
+    assert response.json() == {'error': 'Track not found in playlist'}
+
+
+@pytest.mark.django_db
+def test_async_vote_for_track(authenticated_user):
+    """
+        # Vote twice through the async view
+        # Ensure the first vote counts and the second gets 403
+    """
+    user, token = authenticated_user
+    playlist = make_playlist(user)
+    client = api_client(token)
+    url = reverse("playlists:vote_for_track_async", args=[playlist.id])
+
+    response = client.post(url, {"range_start": 1}, format="json")
+    assert response.status_code == 200
+    assert [t['points'] for t in response.json()['playlist'][0]['tracks']] == [0, 1]
+
+    response = client.post(url, {"range_start": 1}, format="json")
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_async_views_check_token_and_access(authenticated_user, django_user_model):
+    """
+        # Call the async views without a token and on someone else's private playlist
+        # Ensure get response 401 and 403
+    """
+    user, token = authenticated_user
+    other = django_user_model.objects.create_user(username="other", password="Pass1234!")
+    playlist = make_playlist(other)
+    playlist.public = False
+    playlist.save()
+    url = reverse("playlists:add_track_async", args=[playlist.id])
+
+    assert APIClient().post(url, {"track_id": 1}, format="json").status_code == 401
+    assert api_client("wrong").post(url, {"track_id": 1}, format="json").status_code == 401
+    response = api_client(token).post(url, {"track_id": 1}, format="json")
+    assert response.status_code == 403
+    assert response.json() == {'error': 'Permission denied for this playlist'}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_view_broadcasts_after_commit(authenticated_user, in_memory_channel_layer):
+    """
+        # Move a track through the async view while listening on the playlist group
+        # Ensure the delta is delivered with the new revision
+    """
+    user, token = authenticated_user
+    playlist = make_playlist(user)
+    layer = get_channel_layer()
+    async_to_sync(layer.group_add)(group_name(playlist.id), "test.listener")
+
+    url = reverse("playlists:move_track_in_playlist_async", args=[playlist.id])
+    response = api_client(token).post(url, {"range_start": 0, "insert_before": 2}, format="json")
+    assert response.status_code == 200
+
+    message = async_to_sync(layer.receive)("test.listener")
+    assert message['type'] == 'playlist.delta'
+    assert message['op'] == 'move'
+    assert message['revision'] == 1
+
+
+@pytest.mark.django_db
+def test_async_views_are_throttled(authenticated_user, settings, monkeypatch):
+    """
+        # Post more requests than the user rate allows
+        # Ensure get response 429 like the sync views
+    """
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_CLASSES': ['rest_framework.throttling.UserRateThrottle'],
+    }
+    cache.clear()
+    monkeypatch.setattr(UserRateThrottle, "rate", "1/minute", raising=False)
+    user, token = authenticated_user
+    playlist = make_playlist(user, tracks=2)
+    url = reverse("playlists:vote_for_track_async", args=[playlist.id])
+
+    response = api_client(token).post(url, {"range_start": 0}, format="json")
+    assert response.status_code == 200
+
+    response = api_client(token).post(url, {"range_start": 1}, format="json")
+    assert response.status_code == 429
+    assert "throttled" in response.json()["detail"]
+    assert response["Retry-After"]
@@ -44,3 +44,71 @@ def test_get_all_shared_playlist_success(authenticated_user):
     data = response.json()
     data = data["playlists"]
     assert data[0]["id"] == playlist.id
+
+
+@pytest.mark.django_db
+def test_get_all_shared_playlist_pagination(authenticated_user, django_assert_max_num_queries):
+    """
+        # Page through public playlists with a cursor
+        # Ensure query count does not grow with the number of playlists/tracks
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    playlists = []
+    for i in range(5):
+        playlist = Playlist.objects.create(name=f"P{i}", description="", public=True, creator=user)
+        for j in range(3):
+            track = Track.objects.create(name=f"Song {i}-{j}", artist="A", deezer_track_id=f"{i}-{j}")
+            PlaylistTrack.objects.create(playlist=playlist, track=track, position=j + 1)
+        playlists.append(playlist)
+
+    url = reverse("playlists:public_playlists")
+
+    # auth + session + playlists + tracks
+    with django_assert_max_num_queries(4):
+        response = client.get(url, {"limit": 3})
+    data = response.json()
+    assert [p["id"] for p in data["playlists"]] == [p.id for p in playlists[:3]]
+    assert len(data["playlists"][0]["tracks"]) == 3
+    assert data["next_cursor"] == playlists[2].id
+
+    response = client.get(url, {"limit": 3, "cursor": data["next_cursor"], "include_tracks": "preview(2)"})
+    data = response.json()
+    assert [p["id"] for p in data["playlists"]] == [p.id for p in playlists[3:]]
+    assert [t["name"] for t in data["playlists"][0]["tracks"]] == ["Song 3-0", "Song 3-1"]
+    assert "next_cursor" not in data
+
+    response = client.get(url, {"include_tracks": "count"})
+    assert response.json()["playlists"][0]["track_count"] == 3
+
+    response = client.get(url, {"include_tracks": "bogus"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_get_all_shared_playlist_unpaginated_by_default(authenticated_user, settings):
+    """
+        # Request the public playlists without cursor or limit
+        # Ensure every playlist is returned, ignoring PLAYLIST_PAGE_SIZE
+    """
+    settings.PLAYLIST_PAGE_SIZE = 2
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    playlists = [
+        Playlist.objects.create(name=f"P{i}", description="", public=True, creator=user)
+        for i in range(3)
+    ]
+
+    url = reverse("playlists:public_playlists")
+
+    data = client.get(url).json()
+    assert [p["id"] for p in data["playlists"]] == [p.id for p in playlists]
+    assert "next_cursor" not in data
+
+    data = client.get(url, {"cursor": 0}).json()
+    assert [p["id"] for p in data["playlists"]] == [p.id for p in playlists[:2]]
+    assert data["next_cursor"] == playlists[1].id
@@ -2,7 +2,9 @@
 from django.urls import reverse
 from rest_framework.test import APIClient
 from apps.users.tests.conftest import authenticated_user
-from apps.playlists.models import Playlist
+from apps.playlists import snapshots
+from apps.playlists.models import Playlist, PlaylistTrack
+from apps.tracks.models import Track
 
 
 @pytest.mark.django_db
@@ -48,3 +50,82 @@ def test_get_playlist_info_not_found(authenticated_user):
     response = client.get(url, format="json")
     assert response.status_code == 404
     assert response.json() == {'detail': 'No Playlist matches the given query.'}
+
+
+@pytest.mark.django_db
+def test_get_playlist_info_not_modified(authenticated_user):
+    """
+        # Get playlist info twice, the second time with its ETag in If-None-Match
+        # Ensure the second response is a 304 and a rename changes the ETag
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    playlist = Playlist.objects.create(name="Fav999", description="Fav999", creator=user)
+    url = reverse("playlists:get_playlist", args=[playlist.id])
+
+    response = client.get(url)
+    etag = response["ETag"]
+    assert etag.startswith(f'"{playlist.id}-0-')
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+    client.patch(reverse("playlists:update_playlist", args=[playlist.id]), {"name": "Fav123"}, format="json")
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"].startswith(f'"{playlist.id}-1-')
+    assert response.json()["playlist"][0]["playlist_name"] == "Fav123"
+
+
+@pytest.mark.django_db
+def test_get_playlist_info_follows_embedded_rows(authenticated_user):
+    """
+        # Rename the creator, then refresh a track's metadata, without any playlist mutation
+        # Ensure each change gives a new ETag and the new data instead of a 304 or cached bytes
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    playlist = Playlist.objects.create(name="Fav999", description="Fav999", creator=user)
+    track = Track.objects.create(name="Song A", artist="Artist A", deezer_track_id="1000")
+    PlaylistTrack.objects.create(playlist=playlist, track=track, position=0)
+    url = reverse("playlists:get_playlist", args=[playlist.id])
+
+    etag = client.get(url)["ETag"]
+    type(user).objects.filter(id=user.id).update(username="renamed")
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert response.json()["playlist"][0]["creator"] == "renamed"
+
+    etag = response["ETag"]
+    Track.objects.filter(id=track.id).update(name="Song B")
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert response.json()["playlist"][0]["tracks"][0]["name"] == "Song B"
+
+
+@pytest.mark.django_db
+def test_get_playlist_info_served_from_cache(authenticated_user, django_assert_max_num_queries):
+    """
+        # Get playlist info twice, then again from another process (empty local cache)
+        # Ensure only the validator is read from the database once the snapshot is cached
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    playlist = Playlist.objects.create(name="Fav999", description="Fav999", creator=user)
+    url = reverse("playlists:get_playlist", args=[playlist.id])
+
+    first = client.get(url)
+    with django_assert_max_num_queries(2):  # token + validator
+        second = client.get(url)
+    assert second.content == first.content
+
+    snapshots.cache.entries.clear()
+    third = client.get(url)
+    assert third.content == first.content
+    assert snapshots.cache.stats() == {'misses': 1, 'local_hits': 1, 'redis_hits': 1}
@@ -73,4 +73,27 @@ def test_invite_user_not_found_user(authenticated_user):
 
     response = client.post(url, payload, format="json")
     assert response.status_code == 400
-    assert response.json() == {'error': 'CustomUser matching query does not exist.'}
\ No newline at end of file
+    assert response.json() == {'error': 'CustomUser matching query does not exist.'}
+
+@pytest.mark.django_db
+def test_invite_user_grants_cached_access(authenticated_user):
+    """
+        # Friend is denied a private playlist (decision cached), then invited
+        # Ensure the invite drops the cached decision and the friend gets access
+    """
+    user, token = authenticated_user
+    playlist = Playlist.objects.create(name="Private", description="", public=False, creator=user)
+    friend = User.objects.create_user(username="friend_cache", password="somePassword123")
+    friend_client = APIClient()
+    friend_client.force_authenticate(user=friend)
+    url = reverse("playlists:next_up", args=[playlist.id])
+
+    assert friend_client.get(url).status_code == 403
+    assert friend_client.get(url).status_code == 403
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    response = client.post(reverse("playlists:invite_user", args=[playlist.id]), {"user_id": friend.id}, format="json")
+    assert response.status_code == 201
+
+    assert friend_client.get(url).status_code == 200
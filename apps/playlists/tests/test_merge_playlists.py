@@ -0,0 +1,118 @@
+import pytest
+from datetime import time
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.users.tests.conftest import authenticated_user
+from apps.playlists.broadcast import OP_INSERT_MANY
+from apps.playlists.models import Playlist, PlaylistTrack
+from apps.tracks.models import Track
+
+User = get_user_model()
+
+
+def make_playlist(creator, name, tracks, public=True, event=False):
+    playlist = Playlist.objects.create(name=name, description="", public=public, creator=creator, event=event)
+    for i, track in enumerate(tracks):
+        PlaylistTrack.objects.create(playlist=playlist, track=track, position=(i + 1) * 1024, points=5)
+    return playlist
+
+
+def names(playlist):
+    return list(PlaylistTrack.objects.filter(playlist=playlist).values_list("track__name", flat=True))
+
+
+@pytest.mark.django_db
+def test_merge_playlists_success(authenticated_user):
+    """
+        # Seed an event with one track from two saved playlists that overlap with it and each other
+        # Ensure new tracks are appended once, in source order, with 0 points and one broadcast
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    a, b, c, d = (Track.objects.create(name=n, artist="Artist", deezer_track_id=str(6000 + i))
+                  for i, n in enumerate("ABCD"))
+    event = make_playlist(user, "Event", [b], event=True)
+    first = make_playlist(user, "First", [c, b, a])
+    second = make_playlist(user, "Second", [a, d, c])
+
+    with patch("apps.playlists.copying.publish") as publish:
+        response = client.post(reverse("playlists:merge_playlists", args=[event.id]),
+                               {"source_ids": [first.id, second.id]}, format="json")
+
+    assert response.status_code == 200
+    assert response.json()["track_ids"] == [c.id, a.id, d.id]
+    assert names(event) == ["B", "C", "A", "D"]
+    assert list(PlaylistTrack.objects.filter(playlist=event).values_list("points", flat=True)) == [5, 0, 0, 0]
+    assert names(first) == ["C", "B", "A"]
+
+    publish.assert_called_once()
+    playlist_id, op, payload = publish.call_args.args
+    assert (playlist_id, op) == (event.id, OP_INSERT_MANY)
+    assert [t["track"]["name"] for t in payload["tracks"]] == ["C", "A", "D"]
+
+
+@pytest.mark.django_db
+def test_merge_playlists_private_source(authenticated_user):
+    """
+        # Merge another user's private playlist
+        # Ensure get response 403 naming the source and nothing is appended
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    owner = User.objects.create_user(username="owner", email="owner@example.com", password="somePassword123")
+    track = Track.objects.create(name="A", artist="Artist", deezer_track_id="6100")
+    target = make_playlist(user, "Mine", [])
+    source = make_playlist(owner, "Secret", [track], public=False)
+
+    response = client.post(reverse("playlists:merge_playlists", args=[target.id]),
+                           {"source_ids": [source.id]}, format="json")
+    assert response.status_code == 403
+    assert response.json() == {"error": "Permission denied for this playlist", "playlist_id": source.id}
+    assert names(target) == []
+
+
+@pytest.mark.django_db
+def test_playlist_duplicate_and_append_from(authenticated_user):
+    """
+        # Duplicate a playlist, then append another one to the copy
+        # Ensure the copy keeps settings, positions and points, and the append adds only new tracks
+    """
+    user, _ = authenticated_user
+    a, b = (Track.objects.create(name=n, artist="Artist", deezer_track_id=str(6200 + i)) for i, n in enumerate("AB"))
+    source = make_playlist(user, "Event", [a], event=True)
+    other = make_playlist(user, "Other", [a, b])
+
+    copy, count = source.duplicate(user, name="Event 2")
+    assert (copy.name, copy.event, count) == ("Event 2", True, 1)
+    assert list(PlaylistTrack.objects.filter(playlist=copy).values_list("position", "points")) == [(1024, 5)]
+
+    added = copy.append_from(other)
+    assert [pt.track_id for pt in added] == [b.id]
+    assert names(copy) == ["A", "B"]
+
+
+@pytest.mark.django_db
+def test_playlist_duplicate_keeps_licensing(authenticated_user):
+    """
+        # Duplicate a location_time event with invited users
+        # Ensure window, timezone and area are copied and the derived fields recomputed, invitations are not
+    """
+    user, _ = authenticated_user
+    source = Playlist.objects.create(
+        name="Event", creator=user, event=True, license_type="location_time",
+        vote_start_time=time(22, 0), vote_end_time=time(2, 0), timezone="Asia/Singapore",
+        latitude=48.8566, longitude=2.3522, allowed_radius_meters=500,
+    )
+    source.invited_users.add(User.objects.create_user(username="guest", password="Pass1234!"))
+
+    copy, _ = source.duplicate(user)
+    copy.refresh_from_db()
+    for field in ("license_type", "vote_start_time", "vote_end_time", "timezone",
+                  "latitude", "longitude", "allowed_radius_meters",
+                  "geohash", "vote_opens_at", "vote_closes_at"):
+        assert getattr(copy, field) == getattr(source, field), field
+    assert not copy.invited_users.exists()
@@ -115,3 +115,53 @@ def test_move_track_in_playlist_invalid_range(authenticated_user):
     response = client.post(url, payload, format="json")
     assert response.status_code == 400
     assert response.json() == {'error': 'Invalid range'}
+
+
+@pytest.mark.django_db
+def test_move_track_in_playlist_only_moved_rows(authenticated_user):
+    """
+        # Move the last track to the front
+        # Ensure new order is applied and the other tracks keep their positions
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    playlist = Playlist.objects.create(name="Fav999", description="Fav999", creator=user)
+    pts = []
+    for i in range(4):
+        track = Track.objects.create(name=f"Song {i}", artist="A", deezer_track_id=str(2000 + i))
+        pts.append(PlaylistTrack.objects.create(playlist=playlist, track=track))
+    before = {pt.id: pt.position for pt in pts}
+
+    url = reverse("playlists:move_track_in_playlist", args=[playlist.id])
+    response = client.post(url, {"range_start": 3, "insert_before": 0}, format="json")
+    assert response.status_code == 200
+
+    order = list(PlaylistTrack.objects.filter(playlist=playlist).values_list("id", "position"))
+    assert [pk for pk, _ in order] == [pts[3].id, pts[0].id, pts[1].id, pts[2].id]
+    assert all(position == before[pk] for pk, position in order[1:])
+
+
+@pytest.mark.django_db
+def test_move_track_in_playlist_exhausted_gap(authenticated_user):
+    """
+        # Move into a gap that has no free position left
+        # Ensure the playlist is renumbered and the order is still correct
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    playlist = Playlist.objects.create(name="Fav999", description="Fav999", creator=user)
+    pts = []
+    for i in range(3):
+        track = Track.objects.create(name=f"Song {i}", artist="A", deezer_track_id=str(3000 + i))
+        pts.append(PlaylistTrack.objects.create(playlist=playlist, track=track, position=i))
+
+    url = reverse("playlists:move_track_in_playlist", args=[playlist.id])
+    response = client.post(url, {"range_start": 2, "insert_before": 1}, format="json")
+    assert response.status_code == 200
+
+    order = list(PlaylistTrack.objects.filter(playlist=playlist).values_list("id", flat=True))
+    assert order == [pts[0].id, pts[2].id, pts[1].id]
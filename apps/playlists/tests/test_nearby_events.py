@@ -0,0 +1,63 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.users.tests.conftest import authenticated_user
+from apps.playlists.models import Playlist
+
+User = get_user_model()
+
+
+def make_event(creator, name, lat, lon, public=True):
+    return Playlist.objects.create(
+        name=name, description="", creator=creator, event=True, public=public, latitude=lat, longitude=lon,
+    )
+
+
+@pytest.mark.django_db
+def test_nearby_events(authenticated_user):
+    """
+        # Events at different distances from the Louvre, one private, one far away
+        # Ensure public events within the radius come closest first, paginated
+    """
+    user, token = authenticated_user
+    pyramid = make_event(user, "Pyramid", 48.8611, 2.3358)
+    notre_dame = make_event(user, "Notre-Dame", 48.8530, 2.3499)
+    eiffel = make_event(user, "Eiffel", 48.8584, 2.2945)
+    make_event(user, "Private", 48.8606, 2.3376, public=False)
+    make_event(user, "Versailles", 48.8049, 2.1204)
+    Playlist.objects.create(name="Not an event", description="", creator=user, latitude=48.8606, longitude=2.3376)
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    url = reverse("playlists:nearby_events")
+    params = {"lat": 48.8606, "lon": 2.3376, "radius": 5000, "limit": 2}
+
+    response = client.get(url, params)
+    assert response.status_code == 200
+    data = response.json()
+    assert [event["id"] for event in data["events"]] == [pyramid.id, notre_dame.id]
+    assert data["events"][0]["distance"] == pytest.approx(145, abs=5)
+    assert data["next_offset"] == 2
+
+    response = client.get(url, {**params, "offset": 2})
+    assert [event["id"] for event in response.json()["events"]] == [eiffel.id]
+    assert "next_offset" not in response.json()
+
+    response = client.get(url, {**params, "radius": 20000, "limit": 10})
+    assert len(response.json()["events"]) == 4
+
+
+@pytest.mark.django_db
+def test_nearby_events_invalid(authenticated_user):
+    """
+        # Missing longitude
+        # Ensure 400
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    response = client.get(reverse("playlists:nearby_events"), {"lat": 48.86})
+    assert response.status_code == 400
+    assert response.json() == {"error": "lat and lon are required numbers."}
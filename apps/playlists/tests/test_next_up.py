@@ -0,0 +1,105 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from apps.users.tests.conftest import authenticated_user
+from apps.playlists.models import Playlist, Track, PlaylistTrack
+from apps.playlists import ranking
+
+User = get_user_model()
+
+
+def make_event(user, count):
+    playlist = Playlist.objects.create(name="Event", description="", creator=user, event=True, auto_order=True)
+    pts = []
+    for i in range(count):
+        track = Track.objects.create(name=f"Song {i}", artist="A", deezer_track_id=str(4000 + i))
+        pts.append(PlaylistTrack.objects.create(playlist=playlist, track=track))
+    return playlist, pts
+
+
+def vote_as(username, playlist, index):
+    user = User.objects.create_user(username=username, password="somePassword123")
+    token, _ = Token.objects.get_or_create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    url = reverse("playlists:vote_for_track", args=[playlist.id])
+    return client.post(url, {"range_start": index}, format="json")
+
+
+@pytest.mark.django_db
+def test_next_up_follows_votes(authenticated_user):
+    """
+        # Vote on an auto-ordered event
+        # Ensure voted tracks move up (ties by insertion) and next_up returns the top N
+    """
+    user, token = authenticated_user
+    playlist, pts = make_event(user, 4)
+
+    assert vote_as("v1", playlist, 2).status_code == 200   # Song 2 -> top
+    assert vote_as("v2", playlist, 3).status_code == 200   # Song 3 ties with Song 2, inserted later
+    assert vote_as("v3", playlist, 1).status_code == 200   # vote Song 3 again: 2 points -> top
+
+    order = list(PlaylistTrack.objects.filter(playlist=playlist).values_list("id", flat=True))
+    assert order == [pts[3].id, pts[2].id, pts[0].id, pts[1].id]
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    response = client.get(reverse("playlists:next_up", args=[playlist.id]), {"limit": 2})
+    assert response.status_code == 200
+    assert [t["id"] for t in response.json()["tracks"]] == [pts[3].id, pts[2].id]
+
+
+@pytest.mark.django_db
+def test_next_up_manual_move_rejected(authenticated_user):
+    """
+        # Move a track in an auto-ordered event
+        # Ensure get response error {'error': 'Playlist is ordered by votes'}
+    """
+    user, token = authenticated_user
+    playlist, pts = make_event(user, 2)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    url = reverse("playlists:move_track_in_playlist", args=[playlist.id])
+    response = client.post(url, {"range_start": 1, "insert_before": 0}, format="json")
+    assert response.status_code == 400
+    assert response.json() == {'error': 'Playlist is ordered by votes'}
+
+
+@pytest.mark.django_db
+def test_next_up_reposition_many(authenticated_user):
+    """
+        # Several tracks change points in one vote buffer flush
+        # Ensure all of them end up in ranked order
+    """
+    user, _ = authenticated_user
+    playlist, pts = make_event(user, 4)
+    for pt, points in zip(pts, [0, 1, 3, 2]):
+        PlaylistTrack.objects.filter(id=pt.id).update(points=points)
+    pts = [PlaylistTrack.objects.get(id=pt.id) for pt in pts]
+
+    scores = {pt.id: (pt.points, pt.position) for pt in pts[1:]}
+    ranking.reposition_many(playlist.id, scores)
+
+    order = list(PlaylistTrack.objects.filter(playlist=playlist).values_list("id", flat=True))
+    assert order == [pts[2].id, pts[3].id, pts[1].id, pts[0].id]
+
+
+@pytest.mark.django_db
+def test_next_up_cached_access_queries(authenticated_user, django_assert_num_queries):
+    """
+        # Second request on the same playlist
+        # Ensure the access check is served from cache and the playlist is not fetched
+    """
+    user, token = authenticated_user
+    playlist, pts = make_event(user, 2)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = reverse("playlists:next_up", args=[playlist.id])
+    assert client.get(url).status_code == 200
+
+    with django_assert_num_queries(1):
+        response = client.get(url)
+    assert response.status_code == 200
@@ -0,0 +1,119 @@
+import time
+import pytest
+from unittest.mock import patch
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from redis import RedisError
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from core.asgi import application
+from apps.users.tests.conftest import authenticated_user
+from apps.playlists import presence
+from apps.playlists.models import Playlist
+
+User = get_user_model()
+
+
+@pytest.fixture
+def tracker(settings):
+    settings.PRESENCE_FLUSH_INTERVAL = 0.05
+    tracker = presence.Tracker()
+    with patch.object(presence, "tracker", tracker):
+        yield tracker
+
+
+@pytest.fixture
+def playlist_ids():
+    ids = []
+    yield ids
+    presence.get_client().delete(*[presence.presence_key(playlist_id) for playlist_id in ids] or ['-'])
+
+
+@pytest.mark.asyncio
+async def test_tracker_batches_joins_and_leaves(tracker, playlist_ids, in_memory_channel_layer):
+    """
+        # Join three sockets and leave one, then flush once
+        # Ensure one write brings the Redis count to 2
+    """
+    playlist_ids.append(987654)
+    with patch.object(tracker, "_start"):
+        for channel in ("a", "b", "c"):
+            tracker.join(987654, channel)
+        tracker.leave(987654, "c")
+
+    with patch.object(tracker, "write", wraps=tracker.write) as write:
+        await tracker.flush()
+    assert write.call_count == 1
+    assert presence.count(987654) == 2
+
+    await tracker.flush()
+    assert tracker.dirty == set()
+
+
+@pytest.mark.asyncio
+async def test_tracker_heartbeat_expires_stale_members(tracker, playlist_ids, settings, in_memory_channel_layer):
+    """
+        # Leave a member from a crashed process in the set, then flush after the TTL
+        # Ensure it no longer counts while local sockets are refreshed
+    """
+    playlist_ids.append(987655)
+    presence.get_client().zadd(presence.presence_key(987655), {"gone": 1000})
+    with patch.object(tracker, "_start"):
+        tracker.join(987655, "local")
+
+    await tracker.flush(now=1000 + settings.PRESENCE_TTL + 1)
+    assert presence.get_client().zrange(presence.presence_key(987655), 0, -1) == [b"local"]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_ws_presence_message(tracker, playlist_ids, in_memory_channel_layer):
+    """
+        # Open two sockets on a playlist
+        # Ensure both get a presence message with 2 listeners
+    """
+    user = await database_sync_to_async(User.objects.create_user)(username="ws_presence", password="Pass1234!")
+    token = await database_sync_to_async(Token.objects.create)(user=user)
+    playlist = await database_sync_to_async(Playlist.objects.create)(creator=user, name="Party")
+    playlist_ids.append(playlist.id)
+
+    communicators = []
+    for _ in range(2):
+        communicator = WebsocketCommunicator(application, f"/ws/playlists/{playlist.id}/?token={token.key}")
+        connected, _ = await communicator.connect()
+        assert connected
+        communicators.append(communicator)
+
+    for communicator in communicators:
+        message = await communicator.receive_json_from(timeout=2)
+        assert message == {"type": "presence", "playlist_id": playlist.id, "listeners": 2}
+
+    for communicator in communicators:
+        await communicator.disconnect()
+    await tracker.flush()
+    assert presence.count(playlist.id) == 0
+
+
+@pytest.mark.django_db
+def test_playlist_presence_endpoint(authenticated_user, playlist_ids):
+    """
+        # Get the listener count of a playlist
+        # Ensure get response with the count, or 503 when Redis is down
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    playlist = Playlist.objects.create(name="Fav999", creator=user)
+    playlist_ids.append(playlist.id)
+    presence.get_client().zadd(presence.presence_key(playlist.id), {"x": time.time()})
+
+    url = reverse("playlists:playlist_presence", args=[playlist.id])
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json() == {"playlist_id": playlist.id, "listeners": 1}
+
+    with patch.object(presence, "count", side_effect=RedisError):
+        response = client.get(url)
+    assert response.status_code == 503
@@ -75,3 +75,25 @@ def test_get_playlist_not_found(authenticated_user):
 
     assert response.status_code == 404
     assert response.json() == {'detail': 'No Playlist matches the given query.'}
+
+
+@pytest.mark.django_db
+def test_get_playlist_tracks_after_add(authenticated_user):
+    """
+        # Get tracks, add one, then get them again with the old ETag
+        # Ensure the added track is returned under a new ETag
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    playlist = Playlist.objects.create(name="Fav999", description="Fav999", creator=user)
+    track = Track.objects.create(name="Song A", artist="Artist A", deezer_track_id="1000")
+    url = reverse("playlists:playlist_tracks", args=[playlist.id])
+
+    etag = client.get(url)["ETag"]
+    client.post(reverse("playlists:add_track", args=[playlist.id]), {"track_id": track.id}, format="json")
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert [t["name"] for t in response.json()["tracks"]] == ["Song A"]
@@ -0,0 +1,59 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.users.tests.conftest import authenticated_user
+from apps.playlists.models import Playlist, PlaylistTrack
+from apps.tracks.models import Track
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+def test_save_shared_playlist_success(authenticated_user, django_assert_max_num_queries):
+    """
+        # Save a copy of another user's public playlist
+        # Ensure the copy is owned and saved by the user with the same tracks, positions and points
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    owner = User.objects.create_user(username="owner", email="owner@example.com", password="somePassword123")
+    source = Playlist.objects.create(name="Party", description="Best of", public=True, creator=owner)
+    for i in range(30):
+        track = Track.objects.create(name=f"Song {i}", artist="Artist", deezer_track_id=str(5000 + i))
+        PlaylistTrack.objects.create(playlist=source, track=track, position=(30 - i) * 100, points=i)
+
+    url = reverse("playlists:save_shared_playlist", args=[source.id])
+    with django_assert_max_num_queries(12):
+        response = client.post(url, {"name": "My Party"}, format="json")
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["track_count"] == 30
+    copy = Playlist.objects.get(id=data["playlist_id"])
+    assert (copy.name, copy.description, copy.public, copy.creator) == ("My Party", "Best of", False, user)
+    assert user.saved_playlists.filter(id=copy.id).exists()
+
+    def rows(playlist):
+        return list(PlaylistTrack.objects.filter(playlist=playlist).values_list("track_id", "position", "points"))
+    assert rows(copy) == rows(source)
+
+
+@pytest.mark.django_db
+def test_save_shared_playlist_private(authenticated_user):
+    """
+        # Save a copy of another user's private playlist
+        # Ensure get response 403 and nothing is created
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    owner = User.objects.create_user(username="owner", email="owner@example.com", password="somePassword123")
+    source = Playlist.objects.create(name="Secret", description="", public=False, creator=owner)
+
+    response = client.post(reverse("playlists:save_shared_playlist", args=[source.id]), format="json")
+    assert response.status_code == 403
+    assert not Playlist.objects.filter(creator=user).exists()
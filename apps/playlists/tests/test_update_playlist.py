@@ -2,7 +2,7 @@
 from django.urls import reverse
 from rest_framework.test import APIClient
 from apps.users.tests.conftest import authenticated_user
-from apps.playlists.models import Playlist
+from apps.playlists.models import Playlist, PlaylistTrack, Track
 
 
 @pytest.mark.django_db
@@ -58,3 +58,54 @@ def test_get_update_playlist_not_found(authenticated_user):
     response = client.patch(url, payload, format="json")
     assert response.status_code == 404
     assert response.json() == {'detail': 'No Playlist matches the given query.'}
+
+
+@pytest.mark.django_db
+def test_update_playlist_auto_order_form_encoded(authenticated_user):
+    """
+        # Switch auto ordering on, then off with a form-encoded "false"
+        # Ensure auto_order ends up False and an invalid value gets 400
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    playlist = Playlist.objects.create(name="Fav999", description="Fav999", public=True, creator=user)
+    url = reverse("playlists:update_playlist", args=[playlist.id])
+
+    response = client.patch(url, {"auto_order": "true"}, format="multipart")
+    assert response.status_code == 200
+    playlist.refresh_from_db()
+    assert playlist.auto_order is True
+
+    response = client.patch(url, {"auto_order": "false"}, format="multipart")
+    assert response.status_code == 200
+    playlist.refresh_from_db()
+    assert playlist.auto_order is False
+
+    response = client.patch(url, {"auto_order": "sometimes"}, format="multipart")
+    assert response.status_code == 400
+    assert "auto_order" in response.json()
+
+
+@pytest.mark.django_db
+def test_update_playlist_event_sorts_auto_ordered(authenticated_user):
+    """
+        # Turn event on for a playlist whose auto_order is already True
+        # Ensure the tracks are re-sorted by points right away
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    playlist = Playlist.objects.create(name="Party", description="", public=True, creator=user,
+                                       event=False, auto_order=True)
+    for position, points in enumerate([0, 5, 2]):
+        track = Track.objects.create(name=f"Song {points}", artist="A", deezer_track_id=str(points))
+        PlaylistTrack.objects.create(playlist=playlist, track=track, position=position, points=points)
+    url = reverse("playlists:update_playlist", args=[playlist.id])
+
+    response = client.patch(url, {"event": True}, format="json")
+    assert response.status_code == 200
+    playlist.refresh_from_db()
+    assert playlist.event is True
+    ordered = playlist.tracks.order_by("position").values_list("points", flat=True)
+    assert list(ordered) == [5, 2, 0]
@@ -0,0 +1,62 @@
+import pytest
+from datetime import time
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from geopy.distance import geodesic
+from rest_framework.test import APIClient
+from apps.users.tests.conftest import authenticated_user
+from apps.playlists.models import Playlist
+from apps.playlists import geofence
+
+User = get_user_model()
+
+PARIS = (48.8566, 2.3522)
+ALL_DAY = {"vote_start_time": time(0, 0), "vote_end_time": time(23, 59, 59)}
+
+
+def make_event(creator, name, **kwargs):
+    return Playlist.objects.create(name=name, description="", creator=creator, event=True, **kwargs)
+
+
+@pytest.mark.django_db
+def test_votable_events(authenticated_user):
+    """
+        # Open, invite-only and location-restricted events around the user
+        # Ensure only the events the user can vote in right now are returned
+    """
+    user, token = authenticated_user
+    host = User.objects.create_user(username="host_votable", password="somePassword123")
+
+    open_event = make_event(host, "Open")
+    not_invited = make_event(host, "Not invited", license_type="invite_only")
+    invited = make_event(host, "Invited", license_type="invite_only")
+    invited.invited_users.add(user)
+    nearby = make_event(host, "Nearby", license_type="location_time",
+                        latitude=PARIS[0], longitude=PARIS[1], allowed_radius_meters=500, **ALL_DAY)
+    make_event(host, "Far", license_type="location_time",
+               latitude=45.764, longitude=4.8357, allowed_radius_meters=500, **ALL_DAY)
+    make_event(host, "Closed", license_type="location_time",
+               latitude=PARIS[0], longitude=PARIS[1], allowed_radius_meters=500)
+    make_event(host, "Private", public=False)
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    url = reverse("playlists:votable_events")
+
+    response = client.get(url, HTTP_X_USER_LATITUDE=str(PARIS[0] + 0.001), HTTP_X_USER_LONGITUDE=str(PARIS[1]))
+    assert response.status_code == 200
+    assert [event["id"] for event in response.json()["events"]] == [open_event.id, invited.id, nearby.id]
+
+    response = client.get(url)
+    assert [event["id"] for event in response.json()["events"]] == [open_event.id, invited.id]
+
+
+def test_geofence_matches_geodesic():
+    """
+        # Points around the radius boundary in every direction
+        # Ensure the fast path agrees with the exact geodesic distance
+    """
+    fence = geofence.build(PARIS[0], PARIS[1], 1000)
+    for dlat, dlon in [(0.0089, 0), (0.0091, 0), (0, 0.0136), (0, 0.0137), (0.0063, 0.0096), (-0.0064, -0.0097), (1, 1)]:
+        point = (PARIS[0] + dlat, PARIS[1] + dlon)
+        assert geofence.contains(fence, *point) == (geodesic(point, PARIS).meters <= 1000)
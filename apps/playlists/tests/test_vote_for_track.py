@@ -1,8 +1,19 @@
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APIClient
 from apps.users.tests.conftest import authenticated_user
-from apps.playlists.models import Playlist, Track, PlaylistTrack
+from apps.playlists.models import Playlist, Track, PlaylistTrack, Vote
+from apps.playlists.votes import cast_vote
+from apps.playlists import vote_buffer, vote_window
+
+User = get_user_model()
 
 
 @pytest.mark.django_db
@@ -138,3 +149,179 @@ def test_vote_for_track_invalid_range(authenticated_user):
     response = client.post(url, payload, format="json")
     assert response.status_code == 400
     assert response.json() == {'error': 'Invalid track index'}
+
+
+@pytest.mark.django_db
+def test_vote_for_track_removed_before_vote(authenticated_user):
+    """
+        # The track is removed between the index lookup and the ledger insert
+        # Ensure get response 404 {'error': 'Track not found in playlist'} and no vote is kept
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    playlist = Playlist.objects.create(name="Fav999", description="Fav999", public=True,
+                                       license_type="open", creator=user, event=False)
+    track = Track.objects.create(name="Song A", artist="Artist A", deezer_track_id="1000")
+    playlist_track = PlaylistTrack.objects.create(playlist=playlist, track=track, position=0, points=0)
+
+    def lookup_then_remove(playlist_id, index):
+        pt_id = playlist_track.id
+        playlist_track.delete()
+        return pt_id
+
+    url = reverse("playlists:vote_for_track", args=[playlist.id])
+    with patch("apps.playlists.mutations.track_id_at", side_effect=lookup_then_remove):
+        response = client.post(url, {"range_start": 0}, format="json")
+
+    assert response.status_code == 404
+    assert response.json() == {'error': 'Track not found in playlist'}
+    assert not Vote.objects.filter(playlist=playlist, user=user).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_vote_for_track_concurrent_votes():
+    """
+        # Many users (each voting twice) vote concurrently
+        # Ensure every first vote is counted once and duplicates are rejected
+    """
+    creator = User.objects.create_user(username="creator", password="somePassword123")
+    playlist = Playlist.objects.create(name="Event", description="", creator=creator, event=True)
+    track1 = Track.objects.create(name="Song A", artist="Artist A", deezer_track_id="1000")
+    pt = PlaylistTrack.objects.create(playlist=playlist, track=track1)
+    voters = [User.objects.create_user(username=f"voter{i}", password="somePassword123") for i in range(10)]
+
+    def vote(user):
+        try:
+            return cast_vote(playlist.id, user.id, pt.id)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(vote, voters + voters))
+
+    assert sum(r is not None for r in results) == len(voters)
+    pt.refresh_from_db()
+    assert pt.points == len(voters)
+    assert Vote.objects.filter(playlist=playlist).count() == len(voters)
+
+
+@pytest.mark.django_db
+def test_vote_for_track_buffered(authenticated_user, settings, fake_redis):
+    """
+        # Vote with the Redis vote buffer enabled, then flush
+        # Ensure the vote is only written to Postgres by the flush, and only once
+    """
+    settings.VOTE_BUFFER_ENABLED = True
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    playlist = Playlist.objects.create(name="Event", description="", creator=user, event=True)
+    track1 = Track.objects.create(name="Song A", artist="Artist A", deezer_track_id="1000")
+    pt = PlaylistTrack.objects.create(playlist=playlist, track=track1)
+
+    url = reverse("playlists:vote_for_track", args=[playlist.id])
+    response = client.post(url, {"range_start": 0}, format="json")
+    assert response.status_code == 202
+    response = client.post(url, {"range_start": 0}, format="json")
+    assert response.status_code == 403
+
+    pt.refresh_from_db()
+    assert pt.points == 0
+
+    assert vote_buffer.flush_playlist(playlist.id) == 1
+    pt.refresh_from_db()
+    assert pt.points == 1
+    assert Vote.objects.filter(playlist=playlist, user=user).exists()
+
+    # once the voters hash has expired the ledger still refuses a second vote
+    fake_redis.delete(vote_buffer.voters_key(playlist.id))
+    response = client.post(url, {"range_start": 0}, format="json")
+    assert response.status_code == 403
+    assert response.json() == {'error': 'You have already voted for this playlist'}
+    assert fake_redis.llen(vote_buffer.pending_key(playlist.id)) == 0
+
+    # replaying an already applied batch does not count it twice
+    fake_redis.rpush(vote_buffer.inflight_key(playlist.id), f"{user.id}:{pt.id}")
+    assert vote_buffer.replay_inflight() == 1
+    pt.refresh_from_db()
+    assert pt.points == 1
+
+
+def location_time_event(user, start, end, tz="America/New_York"):
+    playlist = Playlist.objects.create(
+        name="Rooftop", description="", creator=user, event=True, license_type="location_time",
+        vote_start_time=start, vote_end_time=end, timezone=tz,
+        latitude=40.7128, longitude=-74.0060, allowed_radius_meters=1000,
+    )
+    track, _ = Track.objects.get_or_create(deezer_track_id="7000", defaults={"name": "Song A", "artist": "Artist A"})
+    PlaylistTrack.objects.create(playlist=playlist, track=track)
+    return playlist
+
+
+@pytest.mark.django_db
+def test_vote_for_track_window_in_playlist_timezone(authenticated_user):
+    """
+        # Window crossing midnight that is open now in New York, and one that opens in an hour
+        # Ensure the first accepts the vote and the second refuses it
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    headers = {"HTTP_X_USER_LATITUDE": "40.7130", "HTTP_X_USER_LONGITUDE": "-74.0062"}
+    local_now = timezone.now().astimezone(ZoneInfo("America/New_York"))
+
+    open_now = location_time_event(
+        user, (local_now - timedelta(hours=1)).time(), (local_now - timedelta(hours=2)).time(),
+    )
+    response = client.post(reverse("playlists:vote_for_track", args=[open_now.id]), {"range_start": 0},
+                           format="json", **headers)
+    assert response.status_code == 200
+
+    later = location_time_event(
+        user, (local_now + timedelta(hours=1)).time(), (local_now + timedelta(hours=2)).time(),
+    )
+    response = client.post(reverse("playlists:vote_for_track", args=[later.id]), {"range_start": 0},
+                           format="json", **headers)
+    assert response.status_code == 403
+    assert response.json() == {"detail": "Voting is not allowed at this time."}
+
+
+def test_next_window_crosses_midnight():
+    """
+        # 22:00 -> 02:00 window in Singapore
+        # Ensure it is open at 01:00 local and the next one starts at 22:00
+    """
+    sgt = ZoneInfo("Asia/Singapore")
+    now = datetime(2026, 3, 10, 1, 0, tzinfo=sgt)
+    opens, closes = vote_window.next_window(time(22, 0), time(2, 0), "Asia/Singapore", now)
+    assert (opens, closes) == (datetime(2026, 3, 9, 22, 0, tzinfo=sgt), datetime(2026, 3, 10, 2, 0, tzinfo=sgt))
+
+    opens, closes = vote_window.next_window(time(22, 0), time(2, 0), "Asia/Singapore", now + timedelta(hours=2))
+    assert opens == datetime(2026, 3, 10, 22, 0, tzinfo=sgt)
+
+
+@pytest.mark.django_db
+def test_vote_scheduler_broadcasts_state(authenticated_user, django_capture_on_commit_callbacks):
+    """
+        # Window opens, then closes, while the scheduler ticks
+        # Ensure one 'opened' and one 'closed' notice and the window rolls to the next day
+    """
+    user, token = authenticated_user
+    local_now = timezone.now().astimezone(ZoneInfo("America/New_York"))
+    playlist = location_time_event(
+        user, (local_now - timedelta(minutes=5)).time(), (local_now + timedelta(minutes=5)).time(),
+    )
+    opens_at, closes_at = playlist.vote_opens_at, playlist.vote_closes_at
+
+    with patch("apps.playlists.vote_window.send_voting_state") as send:
+        assert vote_window.tick() == 1
+        assert vote_window.tick() == 0
+        assert vote_window.tick(closes_at + timedelta(seconds=1)) == 1
+
+    assert [c.args[1] for c in send.call_args_list] == [vote_window.OPENED, vote_window.CLOSED]
+    playlist.refresh_from_db()
+    assert playlist.vote_opens_at == opens_at + timedelta(days=1)
+    assert playlist.vote_window_open is False
@@ -1,9 +1,14 @@
+import json
 import pytest
 from channels.testing import WebsocketCommunicator
 from core.asgi import application
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
-from apps.playlists.models import Playlist
+from apps.playlists.models import Playlist, PlaylistTrack
+from django.db import transaction
+from apps.playlists.broadcast import OP_INSERT, encode, publish, send_update, snapshot, track_entry, update_payload
+from apps.tracks.models import Track
+from rest_framework.authtoken.models import Token
 
 User = get_user_model()
 
@@ -17,7 +22,8 @@ async def test_websocket_playlist_connect_and_receive():
     playlist = await database_sync_to_async(Playlist.objects.create)(
         creator=user, description="Anna's Playlist"
     )
-    communicator = WebsocketCommunicator(application, f"/ws/playlists/{playlist.id}/")
+    token = await database_sync_to_async(Token.objects.create)(user=user)
+    communicator = WebsocketCommunicator(application, f"/ws/playlists/{playlist.id}/?token={token.key}")
     connected, _ = await communicator.connect()
     assert connected
 
@@ -34,3 +40,76 @@ async def test_websocket_playlist_connect_and_receive():
     assert response["playlist_id"] == playlist.id
 
     await communicator.disconnect()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_websocket_playlist_delta_and_snapshot(in_memory_channel_layer):
+    user = await database_sync_to_async(User.objects.create_user)(
+        username="anna_delta", password="Pass1234!"
+    )
+    playlist = await database_sync_to_async(Playlist.objects.create)(
+        creator=user, description="Anna's Playlist"
+    )
+    track = await database_sync_to_async(Track.objects.create)(
+        name="Song A", artist="Artist A", deezer_track_id="1000"
+    )
+    token = await database_sync_to_async(Token.objects.create)(user=user)
+    communicator = WebsocketCommunicator(application, f"/ws/playlists/{playlist.id}/?token={token.key}")
+    connected, _ = await communicator.connect()
+    assert connected
+
+    def add_track():
+        pt = PlaylistTrack.objects.create(playlist=playlist, track=track)
+        return pt, publish(playlist.id, OP_INSERT, {"track": track_entry(pt)})
+
+    pt, revision = await database_sync_to_async(add_track)()
+    response = await communicator.receive_json_from()
+    assert response["type"] == "playlist_delta"
+    assert response["op"] == "insert"
+    assert response["revision"] == revision == 1
+    assert response["data"]["track"]["id"] == pt.id
+
+    await communicator.send_json_to({"type": "snapshot", "revision": 0})
+    response = await communicator.receive_json_from()
+    assert response["type"] == "playlist_snapshot"
+    assert response["revision"] == 1
+    assert [t["id"] for t in response["data"]] == [pt.id]
+    assert response["data"] == [track_entry(pt)]
+
+    await communicator.disconnect()
+
+
+@pytest.mark.django_db
+def test_snapshot_of_empty_and_missing_playlist():
+    user = User.objects.create_user(username="anna_empty", password="Pass1234!")
+    playlist = Playlist.objects.create(creator=user, description="Anna's Playlist", revision=3)
+
+    assert snapshot(playlist.id) == {"revision": 3, "tracks": []}
+    assert snapshot(playlist.id + 1) is None
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_websocket_forwards_encoded_text(in_memory_channel_layer):
+    user = await database_sync_to_async(User.objects.create_user)(
+        username="anna_text", password="Pass1234!"
+    )
+    playlist = await database_sync_to_async(Playlist.objects.create)(
+        creator=user, description="Anna's Playlist"
+    )
+    token = await database_sync_to_async(Token.objects.create)(user=user)
+    communicator = WebsocketCommunicator(application, f"/ws/playlists/{playlist.id}/?token={token.key}")
+    connected, _ = await communicator.connect()
+    assert connected
+
+    def send():
+        with transaction.atomic():
+            send_update(playlist.id, [{"user_id": 7, "text": "User invited to the playlist"}])
+
+    await database_sync_to_async(send)()
+    text = await communicator.receive_from()
+    assert text == encode(update_payload(playlist.id, [{"user_id": 7, "text": "User invited to the playlist"}]))
+    assert json.loads(text)["type"] == "playlist_update"
+
+    await communicator.disconnect()
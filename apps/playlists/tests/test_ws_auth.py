@@ -0,0 +1,108 @@
+import pytest
+from unittest.mock import patch
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from rest_framework.authtoken.models import Token
+from core.asgi import application
+from core.utils.custom_auth import websocket
+from apps.playlists.models import Playlist
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    websocket.token_cache.clear()
+    yield
+    websocket.token_cache.clear()
+
+
+@database_sync_to_async
+def make_user(username):
+    user = User.objects.create_user(username=username, password="Pass1234!")
+    return user, Token.objects.create(user=user).key
+
+
+@database_sync_to_async
+def make_playlist(creator, public=True):
+    return Playlist.objects.create(creator=creator, name="Party", public=public)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_ws_token_in_query_string(in_memory_channel_layer):
+    """
+        # Connect with ?token=<key>
+        # Ensure the socket is accepted and the user is set in the scope
+    """
+    user, key = await make_user("ws_query")
+    playlist = await make_playlist(user)
+
+    communicator = WebsocketCommunicator(application, f"/ws/playlists/{playlist.id}/?token={key}")
+    connected, _ = await communicator.connect()
+    assert connected
+    await communicator.disconnect()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_ws_token_in_subprotocol(in_memory_channel_layer):
+    """
+        # Connect with the ["token", <key>] subprotocols
+        # Ensure the socket is accepted with the "token" subprotocol
+    """
+    user, key = await make_user("ws_subprotocol")
+    playlist = await make_playlist(user)
+
+    communicator = WebsocketCommunicator(application, f"/ws/playlists/{playlist.id}/", subprotocols=["token", key])
+    connected, subprotocol = await communicator.connect()
+    assert connected
+    assert subprotocol == "token"
+    await communicator.disconnect()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_ws_rejects_missing_or_invalid_token_and_private_playlist(in_memory_channel_layer):
+    """
+        # Connect without a token, with a bad token and to someone else's private playlist
+        # Ensure every connection is rejected
+    """
+    owner, _ = await make_user("ws_owner")
+    _, key = await make_user("ws_stranger")
+    playlist = await make_playlist(owner, public=False)
+
+    for path in (
+        f"/ws/playlists/{playlist.id}/",
+        f"/ws/playlists/{playlist.id}/?token=wrong",
+        f"/ws/playlists/{playlist.id}/?token={key}",
+    ):
+        communicator = WebsocketCommunicator(application, path)
+        connected, _ = await communicator.connect()
+        assert not connected
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_ws_token_lookups_are_cached_until_logout(in_memory_channel_layer):
+    """
+        # Connect twice with the same token, then delete the token
+        # Ensure one token lookup for both connections and none after the token is gone
+    """
+    user, key = await make_user("ws_cached")
+    playlist = await make_playlist(user)
+    path = f"/ws/playlists/{playlist.id}/?token={key}"
+
+    with patch.object(websocket, "load_user", wraps=websocket.load_user) as load_user:
+        for _ in range(2):
+            communicator = WebsocketCommunicator(application, path)
+            connected, _ = await communicator.connect()
+            assert connected
+            await communicator.disconnect()
+        assert load_user.call_count == 1
+
+    await database_sync_to_async(Token.objects.filter(key=key).delete)()
+    communicator = WebsocketCommunicator(application, path)
+    connected, _ = await communicator.connect()
+    assert not connected
@@ -0,0 +1,112 @@
+import pytest
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from rest_framework.authtoken.models import Token
+from core.asgi import application
+from apps.playlists import outbox
+from apps.playlists.broadcast import group_name
+from apps.playlists.models import Playlist
+from apps.playlists.outbox import DELTA, RESYNC, UPDATE, VOTING, Outbox
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_stats():
+    outbox.reset_stats()
+    yield
+    outbox.reset_stats()
+
+
+def delta(revision):
+    return f'{{"type": "playlist_delta", "revision": {revision}}}'
+
+
+def drain(box):
+    entries = list(box.entries)
+    box.entries.clear()
+    return entries
+
+
+def test_outbox_keeps_latest_update_and_voting():
+    """
+        # Queue several snapshots and voting notices for a lagging socket
+        # Ensure only the latest of each is kept and the rest are counted as coalesced
+    """
+    box = Outbox('playlist_1', max_deltas=10)
+    for i in range(3):
+        box.put_update(f'update {i}')
+        box.put_voting(f'voting {i}')
+
+    assert drain(box) == [(UPDATE, None, 'update 2'), (VOTING, None, 'voting 2')]
+    assert outbox.stats() == {'playlist_1': {'coalesced': 4}}
+
+
+def test_outbox_revision_gap_becomes_resync():
+    """
+        # Queue deltas 1, 2 then 5
+        # Ensure the gap is counted as 2 dropped and the backlog becomes one resync
+    """
+    box = Outbox('playlist_1', max_deltas=10)
+    box.put_delta(1, delta(1))
+    box.put_delta(2, delta(2))
+    box.put_delta(5, delta(5))
+    box.put_delta(6, delta(6))
+
+    assert drain(box) == [(RESYNC, None, None)]
+    assert outbox.stats() == {'playlist_1': {'dropped': 2, 'coalesced': 3, 'resyncs': 1}}
+
+
+def test_outbox_overflow_and_resynced():
+    """
+        # Queue more deltas than allowed, then report the snapshot revision
+        # Ensure the backlog collapses into a resync and covered deltas are skipped afterwards
+    """
+    box = Outbox('playlist_1', max_deltas=2)
+    for revision in (1, 2, 3):
+        box.put_delta(revision, delta(revision))
+    assert list(box.entries) == [(RESYNC, None, None)]
+
+    box.entries.popleft()
+    box.revision = None
+    box.put_delta(4, delta(4))
+    box.put_delta(5, delta(5))
+    box.resynced(4)
+    assert drain(box) == [(DELTA, 5, delta(5))]
+    assert box.revision == 5
+
+    box.put_delta(5, delta(5))
+    assert drain(box) == []
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_ws_missing_delta_triggers_snapshot(in_memory_channel_layer):
+    """
+        # Deliver deltas 1 and 3 to a connected socket
+        # Ensure the client gets delta 1 then a snapshot instead of delta 3
+    """
+    user = await database_sync_to_async(User.objects.create_user)(username="ws_lag", password="Pass1234!")
+    token = await database_sync_to_async(Token.objects.create)(user=user)
+    playlist = await database_sync_to_async(Playlist.objects.create)(creator=user, name="Party", revision=3)
+
+    communicator = WebsocketCommunicator(application, f"/ws/playlists/{playlist.id}/?token={token.key}")
+    connected, _ = await communicator.connect()
+    assert connected
+
+    layer = get_channel_layer()
+    for revision in (1, 3):
+        await layer.group_send(group_name(playlist.id), {
+            'type': 'playlist.delta', 'playlist_id': playlist.id, 'revision': revision, 'op': 'remove',
+            'data': {'id': revision},
+        })
+
+    first = await communicator.receive_json_from()
+    assert (first['type'], first['revision']) == ('playlist_delta', 1)
+    second = await communicator.receive_json_from()
+    assert (second['type'], second['revision']) == ('playlist_snapshot', 3)
+    assert outbox.stats()[group_name(playlist.id)]['dropped'] == 1
+
+    await communicator.disconnect()
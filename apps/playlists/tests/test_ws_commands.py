@@ -0,0 +1,107 @@
+import pytest
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from apps.playlists.models import Playlist, PlaylistTrack
+from apps.playlists.routing import websocket_urlpatterns
+from apps.tracks.models import Track
+
+User = get_user_model()
+
+
+@database_sync_to_async
+def make_playlist(username, license_type="open"):
+    user = User.objects.create_user(username=username, password="Pass1234!")
+    playlist = Playlist.objects.create(creator=user, name="Party", license_type=license_type)
+    for i in range(2):
+        track = Track.objects.create(name=f"Song {i}", artist="Artist", deezer_track_id=str(3000 + i))
+        PlaylistTrack.objects.create(playlist=playlist, track=track, position=i)
+    return user, playlist
+
+
+async def connect(playlist, user):
+    communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/ws/playlists/{playlist.id}/")
+    communicator.scope['user'] = user
+    connected, _ = await communicator.connect()
+    assert connected
+    return communicator
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_ws_vote_command_acks_and_broadcasts(in_memory_channel_layer):
+    """
+        # Vote over the socket with a request id
+        # Ensure the ack carries the id and HTTP status, then the delta follows
+    """
+    user, playlist = await make_playlist("ws_voter")
+    communicator = await connect(playlist, user)
+
+    await communicator.send_json_to({"type": "command", "id": "r1", "action": "vote", "data": {"range_start": 1}})
+    ack = await communicator.receive_json_from()
+    assert ack["type"] == "ack"
+    assert ack["id"] == "r1"
+    assert ack["status"] == 200
+    assert [t["points"] for t in ack["data"]["playlist"][0]["tracks"]] == [0, 1]
+
+    delta = await communicator.receive_json_from()
+    assert delta["type"] == "playlist_delta"
+    assert delta["op"] == "points"
+    assert delta["revision"] == 1
+
+    await communicator.send_json_to({"type": "command", "id": "r2", "action": "vote", "data": {"range_start": 0}})
+    ack = await communicator.receive_json_from()
+    assert (ack["id"], ack["status"]) == ("r2", 403)
+
+    await communicator.disconnect()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_ws_move_and_remove_commands(in_memory_channel_layer):
+    """
+        # Move then remove tracks over the socket
+        # Ensure both are acked with the HTTP endpoint's responses
+    """
+    user, playlist = await make_playlist("ws_editor")
+    first = await database_sync_to_async(
+        lambda: PlaylistTrack.objects.filter(playlist=playlist).order_by('position').first()
+    )()
+    communicator = await connect(playlist, user)
+
+    await communicator.send_json_to({
+        "type": "command", "id": 1, "action": "move", "data": {"range_start": 0, "insert_before": 2},
+    })
+    ack = await communicator.receive_json_from()
+    assert ack == {"type": "ack", "id": 1, "status": 200, "data": {"message": "Tracks reordered successfully"}}
+    assert (await communicator.receive_json_from())["op"] == "move"
+
+    await communicator.send_json_to({"type": "command", "id": 2, "action": "remove", "data": {"track_id": first.id}})
+    ack = await communicator.receive_json_from()
+    assert ack["status"] == 200
+    assert (await communicator.receive_json_from())["data"] == {"id": first.id}
+
+    await communicator.disconnect()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_ws_command_rejections(in_memory_channel_layer):
+    """
+        # Send commands with an unknown action and with a bad license
+        # Ensure each is acked with an error status and nothing is broadcast
+    """
+    user, playlist = await make_playlist("ws_rejected", license_type="invite_only")
+
+    communicator = await connect(playlist, user)
+    await communicator.send_json_to({"type": "command", "id": "b", "action": "shuffle", "data": {}})
+    assert (await communicator.receive_json_from())["status"] == 400
+
+    await communicator.send_json_to({"type": "command", "id": "c", "action": "vote", "data": {"range_start": 0}})
+    ack = await communicator.receive_json_from()
+    assert ack["status"] == 403
+    assert ack["data"] == {"detail": "You are not invited to vote on this playlist."}
+    assert await communicator.receive_nothing()
+
+    await communicator.disconnect()
@@ -1,27 +1,49 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 
 app_name = "playlists"
 
+# PLAYLIST_ASYNC_VIEWS serves the mutation routes from async_views, and also
+# mounts them under async/ (see below).
+mutations = async_views if settings.PLAYLIST_ASYNC_VIEWS else views
+
 
 urlpatterns = [
     path('playlists', views.create_new_playlist, name='playlists'),
     path('playlists/<int:playlist_id>', views.get_playlist_info, name='get_playlist'),
     path('update_playlist/<int:playlist_id>', views.update_playlist, name='update_playlist'),
     path('delete_playlist/<int:playlist_id>', views.delete_playlist, name='delete_playlist'),
-    path('playlists/<int:playlist_id>/remove_tracks', views.delete_track_from_playlist, name='remove_items'),
+    path('playlists/<int:playlist_id>/remove_tracks', mutations.delete_track_from_playlist, name='remove_items'),
     path('saved_playlists/', views.get_user_saved_playlists, name='saved_playlists'),
     path('public_playlists/', views.get_all_shared_playlists, name='public_playlists'),
     path('playlist/<int:playlist_id>/tracks/', views.playlist_tracks, name='playlist_tracks'),
-    path('<int:playlist_id>/add/', views.add_track, name='add_track'),
-    path('<int:playlist_id>/move-track/', views.move_track_in_playlist, name='move_track_in_playlist'),
+    path('<int:playlist_id>/add/', mutations.add_track, name='add_track'),
+    path('<int:playlist_id>/add_bulk/', mutations.add_tracks_bulk, name='add_tracks_bulk'),
+    path('<int:playlist_id>/move-track/', mutations.move_track_in_playlist, name='move_track_in_playlist'),
     path('<int:playlist_id>/change-visibility/', views.change_visibility, name='change_visibility'),
+    path('<int:playlist_id>/save/', views.save_shared_playlist, name='save_shared_playlist'),
+    path('<int:playlist_id>/merge/', views.merge_playlists, name='merge_playlists'),
     path('<int:playlist_id>/invite-user/', views.invite_user, name='invite_user'),
     path('<int:playlist_id>/license/', views.patch_playlist_license, name='patch_playlist_license'),
-    path('<int:playlist_id>/tracks/vote/', views.vote_for_track, name='vote_for_track'),
+    path('<int:playlist_id>/tracks/vote/', mutations.vote_for_track, name='vote_for_track'),
+    path('<int:playlist_id>/next_up/', views.next_up, name='next_up'),
+    path('<int:playlist_id>/presence/', views.playlist_presence, name='playlist_presence'),
 
     # GET events
     path('saved_events/', views.get_user_saved_events, name='saved_events'),
     path('public_events/', views.get_all_shared_events, name='public_events'),
+    path('votable_events/', views.votable_events, name='votable_events'),
+    path('nearby_events/', views.nearby_events, name='nearby_events'),
 ]
+
+if settings.PLAYLIST_ASYNC_VIEWS:
+    # Async mutation views
+    urlpatterns += [
+        path('async/<int:playlist_id>/remove_tracks', async_views.delete_track_from_playlist, name='remove_items_async'),
+        path('async/<int:playlist_id>/add/', async_views.add_track, name='add_track_async'),
+        path('async/<int:playlist_id>/add_bulk/', async_views.add_tracks_bulk, name='add_tracks_bulk_async'),
+        path('async/<int:playlist_id>/move-track/', async_views.move_track_in_playlist, name='move_track_in_playlist_async'),
+        path('async/<int:playlist_id>/tracks/vote/', async_views.vote_for_track, name='vote_for_track_async'),
+    ]
@@ -6,19 +6,18 @@
 from django.shortcuts import get_object_or_404
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
-from rest_framework import status
+from rest_framework import serializers, status
 from apps.playlists.models import Playlist, PlaylistTrack
-from django.db import models
 from django.db import transaction
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
-from django.forms.models import model_to_dict
-from .decorators import check_access_to_playlist, check_license
+from .decorators import check_access_to_playlist, check_license, get_user_coordinates, playlist_access
+from .listing import playlist_listing_response
+from .broadcast import OP_META, OP_MOVE, publish, send_update, track_entry
+from . import licensing, mutations, presence, ranking, snapshots
+from .nearby import NearbyParamError, nearby_events as find_nearby_events, parse_nearby_params
 from .serializers import PlaylistLicenseSerializer
-from apps.deezer.deezer_client import DeezerClient
-from .serializers import PlaylistLicenseSerializer, VoteSerializer
 from django.contrib.auth import get_user_model
 from django.db.models import Q
+from redis import RedisError
 from drf_spectacular.utils import extend_schema
 from .docs import *
 
@@ -73,19 +72,35 @@ def update_playlist(request, playlist_id):
     public = request.data.get('public')
     license_type = request.data.get('license_type')
     event = request.data.get('event')
+    auto_order = request.data.get('auto_order')
+    # Form-encoded bodies send "false" / "0" as strings
+    try:
+        if event is not None:
+            event = serializers.BooleanField().to_internal_value(event)
+    except serializers.ValidationError as e:
+        return JsonResponse({'event': e.detail}, status=400)
+    try:
+        if auto_order is not None:
+            auto_order = serializers.BooleanField().to_internal_value(auto_order)
+    except serializers.ValidationError as e:
+        return JsonResponse({'auto_order': e.detail}, status=400)
+
+    was_auto_ordered = ranking.is_auto_ordered(playlist)
+    fields = {'name': name, 'description': description, 'public': public,
+              'license_type': license_type, 'event': event, 'auto_order': auto_order}
+    changed = [field for field, value in fields.items() if value is not None]
+    for field in changed:
+        setattr(playlist, field, fields[field])
+
+    with transaction.atomic():
+        playlist.save()
+        if changed:
+            publish(playlist.id, OP_META, {'fields': changed})
 
-    if name is not None:
-        playlist.name = name
-    if description is not None:
-        playlist.description = description
-    if public is not None:
-        playlist.public = public
-    if license_type is not None:
-        playlist.license_type = license_type
-    if event is not None:
-        playlist.event = event
-
-    playlist.save()
+    # Turning on event or auto_order both make the playlist auto-ordered
+    if ranking.is_auto_ordered(playlist) and not was_auto_ordered:
+        with transaction.atomic():
+            publish(playlist.id, OP_MOVE, {'tracks': ranking.sort_by_points(playlist.id)})
 
     return JsonResponse({"message": "Playlist updated successfully."}, status=200)
 
@@ -113,27 +128,8 @@ def delete_playlist(request, playlist_id):
 @permission_classes([IsAuthenticated])
 def get_user_saved_playlists(request):
     user = request.user
-
-    
-    playlists = Playlist.objects.filter(Q(users_saved=user) | Q(creator=user),
-    event=False)
-
-    playlist_data = []
-    for playlist in playlists:
-        tracks = playlist.tracks.all()
-        track_list = [{'name': pt.track.name, 'artist': pt.track.artist} for pt in tracks]
-
-        playlist_data.append({
-            'id': playlist.id,
-            'name': playlist.name,
-            'description': playlist.description,
-            'public': playlist.public,
-            'creator': playlist.creator.username,
-            #'license_type': playlist.license_type,
-            'tracks': track_list,
-        })
-
-    return JsonResponse({'playlists': playlist_data})
+    playlists = Playlist.objects.filter(Q(users_saved=user) | Q(creator=user), event=False)
+    return playlist_listing_response(request, playlists, 'playlists')
 
 
 @get_all_shared_playlists_schema
@@ -141,107 +137,92 @@ def get_user_saved_playlists(request):
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_all_shared_playlists(request):
-
     playlists = Playlist.objects.filter(public=True, event=False)
-
-    playlist_data = []
-    for playlist in playlists:
-        tracks = playlist.tracks.all()
-        track_list = [{'name': pt.track.name, 'artist': pt.track.artist} for pt in tracks]
-
-        playlist_data.append({
-            'id': playlist.id,
-            'name': playlist.name,
-            'description': playlist.description,
-            'public': playlist.public,
-            'creator': playlist.creator.username,  # Show the creator of the playlist
-            'tracks': track_list,
-        })
-
-    return JsonResponse({'playlists': playlist_data})
+    return playlist_listing_response(request, playlists, 'playlists')
 
 
+@save_shared_playlist_schema
 @api_view(['POST'])
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
-def save_shared_playlist(request):
-    if not request.user.is_authenticated:
-        return JsonResponse({"error": "Authentication required."}, status=401)
-
-    user = request.user
-    name = request.data.get('name')
-    description = request.data.get('description', '')
-    public = request.data.get('public', False)
-    track_ids = request.data.get('track_ids', [])  # List of track IDs to associate with the playlist
-
-    if not name:
-        return JsonResponse({"error": "Playlist name is required."}, status=400)
-
-    playlist = Playlist.objects.create(
-        name=name,
-        description=description,
-        public=public,
-        creator=user
+@check_access_to_playlist
+def save_shared_playlist(request, playlist_id):
+    playlist, count = request.playlist.duplicate(
+        request.user,
+        name=request.data.get('name'),
+        description=request.data.get('description'),
+        public=request.data.get('public', False),
+        license_type='open',
+        event=False,
+        auto_order=False,
     )
-
-    tracks = Track.objects.filter(id__in=track_ids)
-
-    if tracks.exists():
-        playlist.tracks.add(*tracks)
-    else:
-        return JsonResponse({"error": "One or more tracks not found."}, status=404)
-
-    user.saved_playlists.add(playlist)
-
     return JsonResponse({
-        "message": "Playlist created and tracks added successfully.",
+        "message": "Playlist saved successfully.",
         "playlist_id": playlist.id,
-        "tracks": [track.id for track in tracks]
+        "track_count": count,
     }, status=201)
 
 
+@merge_playlists_schema
+@api_view(['POST'])
+@authentication_classes([TokenAuthentication])
+@permission_classes([IsAuthenticated])
+@check_access_to_playlist
+def merge_playlists(request, playlist_id):
+    source_ids = request.data.get('source_ids')
+    if not isinstance(source_ids, list) or not source_ids or not all(isinstance(i, int) for i in source_ids):
+        return JsonResponse({'error': 'source_ids must be a non-empty list of playlist ids'}, status=400)
+    for source_id in source_ids:
+        _, error = playlist_access(request.user, source_id)
+        if error:
+            body, status_code = error
+            return JsonResponse({**body, 'playlist_id': source_id}, status=status_code)
+
+    added = request.playlist.merge(*source_ids)
+    return JsonResponse({
+        'message': 'Playlists merged successfully.',
+        'track_ids': [pt.track_id for pt in added],
+    }, status=200)
+
+
 @get_playlist_info_schema
 @api_view(['GET'])
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_playlist_info(request, playlist_id):
-    try:
-        user = request.user
-        playlist = get_object_or_404(Playlist, id=playlist_id)
-
-
-        playlist_data = []
-        tracks = playlist.tracks.all()
-        track_list = [{
-            'track_id': pt.track.id,
-            'playlist_track_id': pt.id,
-            'deezer_track_id': pt.track.deezer_track_id,
-            'name': pt.track.name,
-            'artist': pt.track.artist,
-            'position': pt.position,
-            'points': pt.points,
-            'url': pt.track.url,
-            'picture_small': pt.track.picture_small,
-            'picture_medium': pt.track.picture_medium,
-        } for pt in tracks]
-
-        shared_users = [{'id': user.id, 'username': user.username} for user in playlist.users_saved.all()]
-        
-        playlist_data.append({
-            'id': playlist.id,
-            'playlist_name': playlist.name,
-            'description': playlist.description,
-            'public': playlist.public,
-            'creator': playlist.creator.username,
-            'license_type': playlist.license_type,
-            'tracks': track_list,
-            'shared_with': shared_users,
-            'event': playlist.event,
-        })
-
-        return JsonResponse({'playlist': playlist_data})
-    except Playlist.DoesNotExist:
-        return JsonResponse({"error": "Playlist not found."}, status=404)
+    return snapshots.respond(request, snapshots.INFO, playlist_id, playlist_info)
+
+
+def playlist_info(playlist_id):
+    playlist = Playlist.objects.select_related('creator').get(id=playlist_id)
+    tracks = PlaylistTrack.objects.filter(playlist_id=playlist_id).select_related('track')
+    track_list = [{
+        'track_id': pt.track.id,
+        'playlist_track_id': pt.id,
+        'deezer_track_id': pt.track.deezer_track_id,
+        'name': pt.track.name,
+        'artist': pt.track.artist,
+        'position': pt.position,
+        'points': pt.points,
+        'url': pt.track.url,
+        'picture_small': pt.track.picture_small,
+        'picture_medium': pt.track.picture_medium,
+    } for pt in tracks]
+
+    shared_users = list(playlist.users_saved.values('id', 'username'))
+
+    return {'playlist': [{
+        'id': playlist.id,
+        'playlist_name': playlist.name,
+        'description': playlist.description,
+        'public': playlist.public,
+        'creator': playlist.creator.username,
+        'license_type': playlist.license_type,
+        'tracks': track_list,
+        'shared_with': shared_users,
+        'event': playlist.event,
+        'revision': playlist.revision,
+    }]}
 
 
 @playlist_tracks_schema
@@ -249,8 +230,12 @@ def get_playlist_info(request, playlist_id):
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
 def playlist_tracks(request, playlist_id):
-    playlist = get_object_or_404(Playlist, id=playlist_id)
-    tracks = PlaylistTrack.objects.filter(playlist=playlist).select_related('track')
+    return snapshots.respond(request, snapshots.TRACKS, playlist_id, playlist_track_list)
+
+
+def playlist_track_list(playlist_id):
+    name, revision = Playlist.objects.values_list('name', 'revision').get(id=playlist_id)
+    tracks = PlaylistTrack.objects.filter(playlist_id=playlist_id).select_related('track')
 
     data = [{
         'track_id': pt.track.id,
@@ -261,7 +246,7 @@ def playlist_tracks(request, playlist_id):
         'points': pt.points,
     } for pt in tracks]
 
-    return JsonResponse({'playlist': playlist.name, 'tracks': data})
+    return {'playlist': name, 'revision': revision, 'tracks': data}
 
 
 @add_track_schema
@@ -270,55 +255,18 @@ def playlist_tracks(request, playlist_id):
 @permission_classes([IsAuthenticated])
 @check_access_to_playlist
 def add_track(request, playlist_id):
-    if request.method != 'POST':
-        return JsonResponse({'error': 'Invalid method'}, status=405)
-    try:
-        print('add_track starts')
-        playlist = get_object_or_404(Playlist, id=playlist_id)
-        data = request.data
-
-        track_id = data.get("track_id")
-        track = Track.objects.filter(id=track_id).first() or Track.objects.filter(deezer_track_id=track_id).first()
-        if not track:
-            from apps.deezer.deezer_client import DeezerClient
-            client = DeezerClient()
-            track_data = client.get_track(track_id)
-            if not track_data:
-                return JsonResponse({'error': 'Track not found on Deezer'}, status=404)
-            track, _ = Track.objects.get_or_create(
-                deezer_track_id=track_data['id'],
-                defaults={
-                    'name': track_data['title'],
-                    'artist': track_data['artist']['name'],
-                    'album': track_data['album']['title'],
-                    'url': track_data['link'],
-                    'picture_small': track_data['album'].get('cover_small'),
-                    'picture_medium': track_data['album'].get('cover_medium'),
-                }
-            )
-        if PlaylistTrack.objects.filter(playlist=playlist, track=track).exists():
-            return JsonResponse({'error': 'Track already in playlist'}, status=400)
-
-        max_pos = PlaylistTrack.objects.filter(playlist=playlist).aggregate(models.Max('position'))['position__max'] or 0
-        PlaylistTrack.objects.create(playlist=playlist, track=track, position=max_pos + 1)
-        tracks = list(PlaylistTrack.objects.filter(playlist=playlist).order_by('position'))
-        # Broadcast
-        data = [{"id": t.id, "track": model_to_dict(t.track),"position": t.position} for t in tracks] 
-        channel_layer = get_channel_layer()
-        print(channel_layer)
-        async_to_sync(channel_layer.group_send)(
-            f'playlist_{playlist_id}',
-            {
-                'type': 'playlist.update',
-                'playlist_id': playlist_id,
-                'data': data,
-            }
-        )
-        return JsonResponse({'status': 'track added', 'track_id': track.id}, status=201)
-    except Playlist.DoesNotExist:
-        return JsonResponse({'error': 'Playlist not found'}, status=404)
-    except Exception as e:
-        return JsonResponse({'error': str(e)}, status=400)
+    body, status_code = mutations.add_track(request.playlist, request.data)
+    return JsonResponse(body, status=status_code)
+
+
+@add_tracks_bulk_schema
+@api_view(['POST'])
+@authentication_classes([TokenAuthentication])
+@permission_classes([IsAuthenticated])
+@check_access_to_playlist
+def add_tracks_bulk(request, playlist_id):
+    body, status_code = mutations.add_tracks(request.playlist, request.data)
+    return JsonResponse(body, status=status_code)
 
 
 @move_track_in_playlist_schema
@@ -327,56 +275,12 @@ def add_track(request, playlist_id):
 @permission_classes([IsAuthenticated])
 @check_access_to_playlist
 def move_track_in_playlist(request, playlist_id):
-    if request.method != 'POST':
-        return JsonResponse({'error': 'Invalid method'}, status=405)
-
     try:
-        print('move_track_in_playlist starts')
         data = json.loads(request.body)
-        range_start = data['range_start']
-        insert_before = data['insert_before']
-        range_length = data.get('range_length', 1)
-        playlist = Playlist.objects.get(id=playlist_id)
-        tracks = list(PlaylistTrack.objects.filter(playlist=playlist).order_by('position'))
-        moving_slice = tracks[range_start:range_start + range_length]
-        if not moving_slice:
-            return JsonResponse({'error': 'Invalid range'}, status=400)
-
-        del tracks[range_start:range_start + range_length]
-
-        if insert_before > range_start:
-            insert_before -= range_length
-
-        for i, track in enumerate(moving_slice):
-            tracks.insert(insert_before + i, track)
-
-        TEMP_OFFSET = 1000
-        with transaction.atomic():
-            for i, pt in enumerate(tracks):
-                pt.position = i + TEMP_OFFSET
-            PlaylistTrack.objects.bulk_update(tracks, ['position'])
-
-            for i, pt in enumerate(tracks):
-                pt.position = i
-            PlaylistTrack.objects.bulk_update(tracks, ['position'])
-        # Broadcast
-        data = [{"id": t.id, "track": model_to_dict(t.track),"position": t.position} for t in tracks]   
-        channel_layer = get_channel_layer()
-        print(channel_layer)
-        async_to_sync(channel_layer.group_send)(
-            f'playlist_{playlist_id}',
-            {
-                'type': 'playlist.update',
-                'playlist_id': playlist_id,
-                'data': data,
-            }
-        )
-        return JsonResponse({'message': 'Tracks reordered successfully'})
-
-    except Playlist.DoesNotExist:
-        return JsonResponse({'error': 'Playlist not found'}, status=404)
-    except Exception as e:
+    except ValueError as e:
         return JsonResponse({'error': str(e)}, status=400)
+    body, status_code = mutations.move_track(request.playlist, data)
+    return JsonResponse(body, status=status_code)
 
 
 @delete_track_from_playlist_schema
@@ -385,53 +289,12 @@ def move_track_in_playlist(request, playlist_id):
 @permission_classes([IsAuthenticated])
 @check_access_to_playlist
 def delete_track_from_playlist(request, playlist_id):
-    if request.method != 'POST':
-        return JsonResponse({'error': 'Invalid method'}, status=405)
-
     try:
-        print('delete_track_from_playlist starts')
         data = json.loads(request.body)
-
-        track_id = data['track_id']
-        playlist = Playlist.objects.get(id=playlist_id)
-        track_to_delete = PlaylistTrack.objects.get(playlist=playlist, id=track_id)
-        print(track_to_delete.id)
-        with transaction.atomic():
-            track_to_delete.delete()
-
-            # Reorder
-            remaining_tracks = list(PlaylistTrack.objects.filter(playlist=playlist).order_by('position'))
-
-            TEMP_OFFSET = 1000
-            for i, pt in enumerate(remaining_tracks):
-                pt.position = i + TEMP_OFFSET
-            PlaylistTrack.objects.bulk_update(remaining_tracks, ['position'])
-
-            for i, pt in enumerate(remaining_tracks):
-                pt.position = i
-            PlaylistTrack.objects.bulk_update(remaining_tracks, ['position'])
-
-        # Broadcast
-        tracks = list(PlaylistTrack.objects.filter(playlist=playlist).order_by('position'))
-        data = [{"id": t.id, "track": model_to_dict(t.track),"position": t.position} for t in tracks] 
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f'playlist_{playlist_id}',
-            {
-                'type': 'playlist.update',
-                'playlist_id': playlist_id,
-                'data': data,
-            }
-        )
-
-        return JsonResponse({'message': 'Track deleted successfully'})
-
-    except Playlist.DoesNotExist:
-        return JsonResponse({'error': 'Playlist not found'}, status=404)
-    except PlaylistTrack.DoesNotExist:
-        return JsonResponse({'error': 'Track not found in playlist'}, status=404)
-    except Exception as e:
+    except ValueError as e:
         return JsonResponse({'error': str(e)}, status=400)
+    body, status_code = mutations.remove_track(request.playlist, data)
+    return JsonResponse(body, status=status_code)
 
 
 @change_visibility_schema
@@ -443,8 +306,9 @@ def change_visibility(request, playlist_id):
         public = request.data.get('public', True)
         playlist = Playlist.objects.get(id=playlist_id)
         playlist.public = public
-        playlist.save()
-        print(playlist.users_saved.all())
+        with transaction.atomic():
+            playlist.save()
+            publish(playlist.id, OP_META, {'fields': ['public']})
         return JsonResponse({'message': 'Playlist visibility changed successfully'})
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)    
@@ -459,25 +323,15 @@ def invite_user(request, playlist_id):
     try:
         
         user_id=request.data.get('user_id')
-        playlist = Playlist.objects.get(id=playlist_id)
-        print(playlist.users_saved.all())
+        playlist = request.playlist
         user_to_invite = User.objects.get(id=user_id)
-        if user_to_invite in playlist.users_saved.all():
+        if playlist.users_saved.filter(id=user_to_invite.id).exists():
             return JsonResponse({'message': 'User already invited'}, status=200)
-        playlist.users_saved.add(user_to_invite)
-        print(playlist.users_saved.all())
+        with transaction.atomic():
+            playlist.users_saved.add(user_to_invite)
+            publish(playlist.id, OP_META, {'fields': ['shared_with']})
         data = [{"user_id": user_id, "text": "User invited to the playlist"}]
-        channel_layer = get_channel_layer()
-
-        # Broadcast
-        async_to_sync(channel_layer.group_send)(
-            f'playlist_{playlist_id}',
-            {
-                'type': 'playlist.update',
-                'playlist_id': playlist_id,
-                'data': data,
-            }
-        )
+        send_update(playlist_id, data)
         return JsonResponse({'message': 'User invited to the playlist'}, status=201)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)
@@ -502,7 +356,9 @@ def patch_playlist_license(request, playlist_id):
 
     serializer = PlaylistLicenseSerializer(playlist, data=request.data, partial=True)
     if serializer.is_valid():
-        serializer.save()
+        with transaction.atomic():
+            serializer.save()
+            publish(playlist.id, OP_META, {'fields': list(serializer.validated_data)})
         return JsonResponse(serializer.data, status=200)
     return JsonResponse(serializer.errors, status=400)
 
@@ -513,53 +369,38 @@ def patch_playlist_license(request, playlist_id):
 @permission_classes([IsAuthenticated])
 @check_license
 def vote_for_track(request, playlist_id):
+    body, status_code = mutations.vote(request.playlist, request.user, request.data)
+    return JsonResponse(body, status=status_code)
+
+
+@next_up_schema
+@api_view(['GET'])
+@authentication_classes([TokenAuthentication])
+@permission_classes([IsAuthenticated])
+@check_access_to_playlist
+def next_up(request, playlist_id):
     try:
-        playlist = Playlist.objects.get(id=playlist_id)
-    except Playlist.DoesNotExist:
-        return JsonResponse({'detail': 'Playlist not found'}, status=404)
-    serializer = VoteSerializer(data=request.data)
-    if serializer.is_valid():
-        range_start = serializer.validated_data["range_start"]
-        tracks = list(PlaylistTrack.objects.filter(playlist=playlist).order_by('position'))
-        if range_start >= len(tracks) or range_start < 0:
-            return JsonResponse({'error': 'Invalid track index'}, status=400)
-        print(tracks[range_start])
-        pt = tracks[range_start]
-        user = request.user
-        print("Users who already voted:", list(playlist.users_already_voted.all()))
-        if not playlist.users_already_voted.filter(id=user.id).exists():
-            with transaction.atomic():
-                pt.points += 1
-                pt.save()
-                playlist.users_already_voted.add(request.user)
-                playlist.save()
-        else:
-            return JsonResponse({'error': 'You have already voted for this playlist'}, status=403)
-        data = [{"id": t.id, "track": model_to_dict(t.track),"position": t.position, "points": t.points} for t in tracks]
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            f'playlist_{playlist_id}',
-            {
-                'type': 'playlist.update',
-                'playlist_id': playlist_id,
-                'data': data,
-            }
-        )
-        playlist_data = []
-        tracks = playlist.tracks.all()
-        track_list = [{'name': pt.track.name, 'artist': pt.track.artist, 'points': pt.points} for pt in tracks]
-
-        playlist_data.append({
-            'id': playlist.id,
-            'playlist_name': playlist.name,
-            'description': playlist.description,
-            'public': playlist.public,
-            'creator': playlist.creator.username,
-            'tracks': track_list,
-        })
-
-        return JsonResponse({'playlist': playlist_data})
-    return JsonResponse(serializer.errors, status=400)
+        limit = min(int(request.GET.get('limit', 5)), 50)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be an integer'}, status=400)
+    if limit < 1:
+        return JsonResponse({'error': 'limit must be >= 1'}, status=400)
+
+    tracks = [track_entry(pt) for pt in ranking.next_up(playlist_id, limit)]
+    return JsonResponse({'playlist_id': playlist_id, 'tracks': tracks})
+
+
+@playlist_presence_schema
+@api_view(['GET'])
+@authentication_classes([TokenAuthentication])
+@permission_classes([IsAuthenticated])
+@check_access_to_playlist
+def playlist_presence(request, playlist_id):
+    try:
+        listeners = presence.count(playlist_id)
+    except RedisError:
+        return JsonResponse({'error': 'Presence is unavailable'}, status=503)
+    return JsonResponse({'playlist_id': playlist_id, 'listeners': listeners})
 
 
 @get_user_saved_events_schema
@@ -568,25 +409,8 @@ def vote_for_track(request, playlist_id):
 @permission_classes([IsAuthenticated])
 def get_user_saved_events(request):
     user = request.user
-
     playlists = Playlist.objects.filter(Q(users_saved=user) | Q(creator=user), event=True)
-
-    playlist_data = []
-    for playlist in playlists:
-        tracks = playlist.tracks.all()
-        track_list = [{'name': pt.track.name, 'artist': pt.track.artist} for pt in tracks]
-
-        playlist_data.append({
-            'id': playlist.id,
-            'name': playlist.name,
-            'description': playlist.description,
-            'public': playlist.public,
-            'creator': playlist.creator.username,
-            'license_type': playlist.license_type,
-            'tracks': track_list,
-        })
-
-    return JsonResponse({'events': playlist_data})
+    return playlist_listing_response(request, playlists, 'events', fields=('license_type',))
 
 
 @get_all_shared_events_schema
@@ -594,22 +418,42 @@ def get_user_saved_events(request):
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_all_shared_events(request):
-
     playlists = Playlist.objects.filter(public=True, event=True)
+    return playlist_listing_response(request, playlists, 'events', fields=('license_type',))
+
+
+@votable_events_schema
+@api_view(['GET'])
+@authentication_classes([TokenAuthentication])
+@permission_classes([IsAuthenticated])
+def votable_events(request):
+    events = licensing.votable_events(request.user, get_user_coordinates(request))
+    return JsonResponse({
+        'events': [{'id': p.id, 'name': p.name, 'license_type': p.license_type} for p in events],
+    })
+
+
+@nearby_events_schema
+@api_view(['GET'])
+@authentication_classes([TokenAuthentication])
+@permission_classes([IsAuthenticated])
+def nearby_events(request):
+    try:
+        lat, lon, radius, offset, limit = parse_nearby_params(request)
+    except NearbyParamError as e:
+        return JsonResponse({'error': str(e)}, status=400)
 
-    playlist_data = []
-    for playlist in playlists:
-        tracks = playlist.tracks.all()
-        track_list = [{'name': pt.track.name, 'artist': pt.track.artist} for pt in tracks]
-
-        playlist_data.append({
-            'id': playlist.id,
-            'name': playlist.name,
-            'description': playlist.description,
-            'public': playlist.public,
-            'creator': playlist.creator.username,  # Show the creator of the playlist
-            'tracks': track_list,
-            'license_type': playlist.license_type,
-        })
-
-    return JsonResponse({'events': playlist_data})
\ No newline at end of file
+    events, has_more = find_nearby_events(lat, lon, radius, offset, limit)
+    data = {
+        'events': [{
+            'id': p.id,
+            'name': p.name,
+            'license_type': p.license_type,
+            'latitude': p.latitude,
+            'longitude': p.longitude,
+            'distance': round(p.distance),
+        } for p in events],
+    }
+    if has_more:
+        data['next_offset'] = offset + limit
+    return JsonResponse(data)
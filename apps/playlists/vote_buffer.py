@@ -0,0 +1,210 @@
+import logging
+import redis
+from django.conf import settings
+from django.db import connection, transaction
+from apps.playlists import ranking
+from apps.playlists.broadcast import OP_POINTS, publish
+from apps.playlists.models import Playlist, PlaylistTrack, Vote
+
+
+logger = logging.getLogger(__name__)
+
+# Optional vote-buffer mode (settings.VOTE_BUFFER_ENABLED).
+#
+# vote_for_track checks the Vote ledger with one indexed read and otherwise
+# only touches Redis:
+#   vote_buffer:voters:<playlist>    hash user -> playlist_track, HSETNX dedup
+#   vote_buffer:pending:<playlist>   list of "user:playlist_track" not yet in Postgres
+#   vote_buffer:dirty                set of playlists with pending votes
+# The voters hash covers votes not flushed yet and the ledger those already
+# flushed, including after the hash has expired (VOTE_BUFFER_VOTERS_TTL).
+# The run_vote_buffer worker wakes up every VOTE_BUFFER_TICK_MS, moves a batch
+# of pending votes to vote_buffer:inflight:<playlist>, writes them to the Vote
+# ledger and PlaylistTrack.points in one statement, broadcasts the new scores
+# as a single coalesced 'points' op, then drops the inflight list. If the
+# worker dies mid-flush the inflight list is replayed on startup; replaying is
+# idempotent because the ledger insert skips (playlist, user) pairs that
+# already made it to Postgres.
+
+KEY_PREFIX = 'vote_buffer'
+DIRTY_KEY = f'{KEY_PREFIX}:dirty'
+
+
+def voters_key(playlist_id):
+    return f'{KEY_PREFIX}:voters:{playlist_id}'
+
+
+def pending_key(playlist_id):
+    return f'{KEY_PREFIX}:pending:{playlist_id}'
+
+
+def inflight_key(playlist_id):
+    return f'{KEY_PREFIX}:inflight:{playlist_id}'
+
+
+RECORD_VOTE_LUA = """
+if redis.call('HSETNX', KEYS[1], ARGV[1], ARGV[2]) == 0 then
+    return 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('RPUSH', KEYS[2], ARGV[1] .. ':' .. ARGV[2])
+redis.call('SADD', KEYS[3], ARGV[3])
+return 1
+"""
+
+# Move up to ARGV[1] pending votes to the inflight list, unless a previous
+# batch is still inflight (then that one is returned again for a retry).
+TAKE_BATCH_LUA = """
+local inflight = redis.call('LRANGE', KEYS[2], 0, -1)
+if #inflight > 0 then
+    return inflight
+end
+local batch = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #batch == 0 then
+    redis.call('SREM', KEYS[3], ARGV[2])
+    return batch
+end
+redis.call('RPUSH', KEYS[2], unpack(batch))
+redis.call('LTRIM', KEYS[1], #batch, -1)
+return batch
+"""
+
+FLUSH_SQL = """
+    WITH batch (user_id, playlist_track_id) AS (
+        VALUES {values}
+    ),
+    inserted AS (
+        INSERT INTO {vote} (playlist_id, user_id, playlist_track_id, created_at)
+        SELECT %s, batch.user_id::uuid, pt.id, now()
+        FROM batch
+        JOIN {track} pt ON pt.id = batch.playlist_track_id::bigint AND pt.playlist_id = %s
+        ON CONFLICT (playlist_id, user_id) DO NOTHING
+        RETURNING playlist_track_id
+    ),
+    counts AS (
+        SELECT playlist_track_id AS id, COUNT(*) AS n FROM inserted GROUP BY playlist_track_id
+    )
+    UPDATE {track} pt
+    SET points = COALESCE(pt.points, 0) + counts.n
+    FROM counts
+    WHERE pt.id = counts.id
+    RETURNING pt.id, pt.points, pt.position
+"""
+
+_client = None
+
+
+def is_enabled():
+    return getattr(settings, 'VOTE_BUFFER_ENABLED', False)
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = redis.Redis(host=settings.REDIS_HOST, port=int(settings.REDIS_PORT))
+    return _client
+
+
+def record_vote(playlist_id, user_id, playlist_track_id):
+    """
+    Buffer one vote. Returns False if this user already voted for the
+    playlist, whether the vote is still buffered or already in the ledger.
+    """
+    if Vote.objects.filter(playlist_id=playlist_id, user_id=user_id).exists():
+        return False
+    client = get_client()
+    recorded = client.eval(
+        RECORD_VOTE_LUA, 3,
+        voters_key(playlist_id), pending_key(playlist_id), DIRTY_KEY,
+        str(user_id), str(playlist_track_id), str(playlist_id),
+        settings.VOTE_BUFFER_VOTERS_TTL,
+    )
+    return bool(recorded)
+
+
+def _parse(entries):
+    votes = []
+    for entry in entries:
+        user_id, _, pt_id = entry.decode().rpartition(':')
+        votes.append((user_id, int(pt_id)))
+    return votes
+
+
+def apply_votes(playlist_id, votes):
+    """
+    Write buffered (user_id, playlist_track_id) pairs to Postgres in a single
+    statement and return {playlist_track_id: (points, position)} for the tracks
+    that actually changed. Votes for tracks removed in the meantime are
+    dropped.
+    """
+    if not votes:
+        return {}
+    sql = FLUSH_SQL.format(
+        values=', '.join(['(%s, %s)'] * len(votes)),
+        vote=Vote._meta.db_table,
+        track=PlaylistTrack._meta.db_table,
+    )
+    params = [value for vote in votes for value in vote] + [playlist_id, playlist_id]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {pt_id: (points, position) for pt_id, points, position in cursor.fetchall()}
+
+
+def flush_playlist(playlist_id, batch_size=None):
+    """
+    Flush one batch of a playlist's buffered votes. Returns the number of
+    buffered entries processed (0 when nothing was pending).
+    """
+    client = get_client()
+    batch_size = batch_size or settings.VOTE_BUFFER_FLUSH_BATCH
+    entries = client.eval(
+        TAKE_BATCH_LUA, 3,
+        pending_key(playlist_id), inflight_key(playlist_id), DIRTY_KEY,
+        batch_size, str(playlist_id),
+    )
+    if not entries:
+        return 0
+
+    with transaction.atomic():
+        # Playlist row first, then the track rows, like every other mutation
+        ranking.lock_playlist(playlist_id)
+        playlist = Playlist.objects.filter(id=playlist_id).only('event', 'auto_order').first()
+        auto_order = playlist is not None and ranking.is_auto_ordered(playlist)
+        scores = apply_votes(playlist_id, _parse(entries))
+        if scores and auto_order:
+            scores = ranking.reposition_many(playlist_id, scores)
+        if scores:
+            publish(playlist_id, OP_POINTS, {
+                'tracks': [
+                    {'id': pt_id, 'points': points, 'position': position}
+                    for pt_id, (points, position) in sorted(scores.items())
+                ],
+            })
+    client.delete(inflight_key(playlist_id))
+    return len(entries)
+
+
+def flush_all(batch_size=None):
+    """
+    One tick of the worker: flush a batch for every playlist with pending votes.
+    """
+    flushed = 0
+    for playlist_id in get_client().smembers(DIRTY_KEY):
+        try:
+            flushed += flush_playlist(int(playlist_id), batch_size)
+        except Exception:
+            logger.exception("Failed to flush buffered votes for playlist %s", playlist_id)
+    return flushed
+
+
+def replay_inflight():
+    """
+    Startup recovery: re-apply batches that were taken but never confirmed.
+    """
+    client = get_client()
+    replayed = 0
+    for key in client.scan_iter(match=inflight_key('*')):
+        playlist_id = int(key.decode().rsplit(':', 1)[1])
+        client.sadd(DIRTY_KEY, playlist_id)
+        replayed += flush_playlist(playlist_id)
+    return replayed
@@ -0,0 +1,122 @@
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.db.models import Min, Q
+from django.utils import timezone
+from apps.playlists.broadcast import send_voting_state
+from apps.playlists.models import Playlist
+
+
+logger = logging.getLogger(__name__)
+
+# Vote windows of location_time playlists.
+#
+# vote_start_time / vote_end_time are wall-clock times in the playlist's
+# timezone; a window whose end is not after its start crosses midnight
+# (22:00 -> 02:00 closes the next day). Playlist.save() stores the current
+# or next occurrence as UTC instants (vote_opens_at, vote_closes_at), so
+# checking a vote is a comparison against those. The run_vote_scheduler
+# worker flips vote_window_open when an instant passes, rolls closed windows
+# to their next occurrence and pushes "voting opened/closed" to the
+# playlist's channel group.
+
+OPENED = 'opened'
+CLOSED = 'closed'
+
+
+def zone(name):
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning("Unknown timezone %r, using UTC", name)
+        return ZoneInfo('UTC')
+
+
+def next_window(start, end, tz_name, now):
+    """
+    The window containing `now`, or the next one: (opens, closes) in UTC.
+    """
+    tz = zone(tz_name)
+    today = now.astimezone(tz).date()
+    crosses_midnight = end <= start
+    for day in (today - timedelta(days=1), today, today + timedelta(days=1)):
+        opens = datetime.combine(day, start, tzinfo=tz)
+        closes = datetime.combine(day + timedelta(days=1) if crosses_midnight else day, end, tzinfo=tz)
+        if now <= closes:
+            return opens.astimezone(dt_timezone.utc), closes.astimezone(dt_timezone.utc)
+    raise AssertionError("a window always closes within two days")
+
+
+def compute(playlist, now=None):
+    """
+    Fill vote_opens_at / vote_closes_at from the playlist's settings.
+    """
+    if playlist.license_type == 'location_time' and playlist.vote_start_time and playlist.vote_end_time:
+        playlist.vote_opens_at, playlist.vote_closes_at = next_window(
+            playlist.vote_start_time, playlist.vote_end_time, playlist.timezone, now or timezone.now()
+        )
+    else:
+        playlist.vote_opens_at = playlist.vote_closes_at = None
+
+
+def current(playlist, now):
+    """
+    (opens, closes) for `now`, or None if the window is not configured.
+    Uses the stored instants unless they are already in the past.
+    """
+    if not (playlist.vote_start_time and playlist.vote_end_time):
+        return None
+    if playlist.vote_closes_at is not None and now <= playlist.vote_closes_at:
+        return playlist.vote_opens_at, playlist.vote_closes_at
+    return next_window(playlist.vote_start_time, playlist.vote_end_time, playlist.timezone, now)
+
+
+def is_open(window, now):
+    return window is not None and window[0] <= now <= window[1]
+
+
+def due(now):
+    """
+    Playlists whose announced state or stored window is out of date.
+    """
+    return Playlist.objects.filter(
+        Q(vote_closes_at__lt=now)
+        | Q(license_type='location_time', vote_window_open=False, vote_opens_at__lte=now)
+        | Q(license_type='location_time', vote_start_time__isnull=False, vote_end_time__isnull=False,
+            vote_closes_at__isnull=True)
+        | Q(vote_window_open=True) & (
+            ~Q(license_type='location_time') | Q(vote_opens_at__isnull=True) | Q(vote_opens_at__gt=now)
+        )
+    )
+
+
+def tick(now=None):
+    """
+    Bring every due playlist up to date and broadcast the state changes.
+    Returns the number of broadcasts.
+    """
+    now = now or timezone.now()
+    sent = 0
+    for playlist in due(now):
+        compute(playlist, now)
+        state = is_open((playlist.vote_opens_at, playlist.vote_closes_at) if playlist.vote_opens_at else None, now)
+        changed = state != playlist.vote_window_open
+        playlist.vote_window_open = state
+        playlist.save(update_fields=['vote_opens_at', 'vote_closes_at', 'vote_window_open'])
+        if changed:
+            send_voting_state(playlist.id, OPENED if state else CLOSED, playlist.vote_opens_at, playlist.vote_closes_at)
+            sent += 1
+    return sent
+
+
+def next_due(now=None):
+    """
+    Earliest upcoming instant at which some playlist opens or closes.
+    """
+    now = now or timezone.now()
+    upcoming = Playlist.objects.filter(license_type='location_time').aggregate(
+        opens=Min('vote_opens_at', filter=Q(vote_window_open=False, vote_opens_at__gt=now)),
+        closes=Min('vote_closes_at', filter=Q(vote_window_open=True, vote_closes_at__gte=now)),
+    )
+    instants = [instant for instant in upcoming.values() if instant is not None]
+    return min(instants) if instants else None
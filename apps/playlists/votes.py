@@ -0,0 +1,50 @@
+from django.db import connection
+from apps.playlists.models import PlaylistTrack, Vote
+
+
+# Record the vote and increment the track in a single statement: the insert
+# into the ledger only succeeds once per (playlist, user), and the UPDATE only
+# runs for the row the insert returned, so two concurrent votes by the same
+# user cannot both count and concurrent votes by different users never lose
+# an increment (points = points + 1 is evaluated under the row lock).
+CAST_VOTE_SQL = f"""
+    WITH vote AS (
+        INSERT INTO {Vote._meta.db_table} (playlist_id, user_id, playlist_track_id, created_at)
+        VALUES (%s, %s, %s, now())
+        ON CONFLICT (playlist_id, user_id) DO NOTHING
+        RETURNING playlist_track_id
+    )
+    UPDATE {PlaylistTrack._meta.db_table}
+    SET points = COALESCE(points, 0) + 1
+    WHERE id IN (SELECT playlist_track_id FROM vote)
+    RETURNING points, position
+"""
+
+
+def track_id_at(playlist_id, index):
+    """
+    Id of the PlaylistTrack at `index` in playlist order, or None.
+    """
+    if index < 0:
+        return None
+    return (
+        PlaylistTrack.objects.filter(playlist_id=playlist_id)
+        .order_by('position')
+        .values_list('id', flat=True)[index:index + 1]
+        .first()
+    )
+
+
+def cast_vote(playlist_id, user_id, playlist_track_id):
+    """
+    Returns the track's new (points, position), or None if the user already
+    voted on this playlist. Raises IntegrityError if the track was removed in
+    the meantime; the ledger's foreign keys are deferred, so they are checked
+    here rather than at commit.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(CAST_VOTE_SQL, [playlist_id, str(user_id), playlist_track_id])
+        result = cursor.fetchone()
+    connection.check_constraints()
+    return result
+
@@ -4,3 +4,6 @@
 class UserProfileConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.profile'
+
+    def ready(self):
+        from apps.profile import signals  # noqa: F401
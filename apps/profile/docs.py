@@ -1,4 +1,4 @@
-from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample, OpenApiParameter
 from .docs_serializers import *
 from .serializers import ProfileSerializer, MusicPreferenceSerializer
 
@@ -31,12 +31,20 @@
             "description": "User ID",
             "schema": {"type": "string"},
         },
+        OpenApiParameter(
+            name="If-None-Match",
+            location=OpenApiParameter.HEADER,
+            type=str,
+            required=False,
+            description="ETag of a previous response; 304 if nothing changed since",
+        ),
     ],
     responses={
         200: OpenApiResponse(
             description="Return profile details",
             response=ProfileSerializer
         ),
+        304: OpenApiResponse(description="Not modified since the ETag given in If-None-Match"),
         401: OpenApiResponse(
             description="Authentication credentials invalid", 
             response=ErrorSerializer,
@@ -100,11 +108,21 @@
 music_preferences_list_schema = extend_schema(
     methods=["GET"],
     summary="List music preferences",
+    parameters=[
+        OpenApiParameter(
+            name="If-None-Match",
+            location=OpenApiParameter.HEADER,
+            type=str,
+            required=False,
+            description="ETag of a previous response; 304 if nothing changed since",
+        ),
+    ],
     responses={
         200: OpenApiResponse(
             description="A list of music preferences",
             response=MusicPreferenceSerializer(many=True)
         ),
+        304: OpenApiResponse(description="Not modified since the ETag given in If-None-Match"),
         401: OpenApiResponse(
             description="Authentication credentials invalid", 
             response=ErrorSerializer,
@@ -0,0 +1,32 @@
+from django.contrib.postgres.aggregates import ArrayAgg
+from core.utils.conditional import make_etag
+from .models import Profile, MusicPreference
+from .utils import is_friend
+
+
+def profile_detail_etag(request, pk):
+    """
+    Which fields are shown depends on the viewer: self, friend or anyone else.
+    Besides the profile row the response shows the username and the names of
+    the preferences, which change without touching the profile. None for a
+    missing profile, so the view answers the 404.
+    """
+    row = Profile.objects.filter(user=pk).annotate(
+        preferences=ArrayAgg('music_preferences__name', ordering='music_preferences__id'),
+    ).values_list('updated_at', 'user__username', 'preferences').first()
+    if row is None:
+        return None
+    viewer = request.user
+    if viewer.pk == pk:
+        relation = 'self'
+    else:
+        relation = 'friend' if is_friend(viewer, pk) else 'other'
+    return make_etag(pk, *row, relation)
+
+
+def music_preferences_etag(request):
+    """
+    Preferences can be renamed or deleted in the admin, so the (id, name)
+    pairs themselves; the table is a short fixed list.
+    """
+    return make_etag(*MusicPreference.objects.order_by('id').values_list('id', 'name'))
@@ -44,6 +44,9 @@ class Profile(models.Model):
     music_preferences = models.ManyToManyField(MusicPreference, blank=True)
     music_preferences_visibility = models.CharField(max_length=10, choices=VisibilityChoices.choices, default=VisibilityChoices.PUBLIC)
 
+    # Validator for conditional GETs; also touched when music_preferences change
+    updated_at = models.DateTimeField(auto_now=True)
+
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
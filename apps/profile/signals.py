@@ -0,0 +1,26 @@
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+from apps.profile.models import Profile
+
+
+# Profile.updated_at is the validator of profile_detail (see
+# core/utils/conditional.py); auto_now does not see m2m changes.
+
+
+def touch(profile_ids):
+    Profile.objects.filter(pk__in=profile_ids).update(updated_at=timezone.now())
+
+
+@receiver(m2m_changed, sender=Profile.music_preferences.through)
+def music_preferences_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            touch([instance.pk])
+        return
+
+    # preference.profile_set side
+    if action in ('post_add', 'post_remove'):
+        touch(pk_set)
+    elif action == 'pre_clear':
+        touch(sender.objects.filter(musicpreference_id=instance.pk).values_list('profile_id', flat=True))
@@ -30,4 +30,31 @@ def test_music_preferences_list(authenticated_user):
     prefs_names = [item["name"] for item in data]
     assert p1.name in prefs_names
     assert p2.name in prefs_names
-    assert p3.name in prefs_names
\ No newline at end of file
+    assert p3.name in prefs_names
+
+@pytest.mark.django_db
+def test_music_preferences_list_not_modified(authenticated_user):
+    """
+        # Get the list, then again with its ETag before and after preference changes
+        # Ensure 304 while unchanged and 200 once a preference is added or renamed
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    url = reverse("profile:music-preferences-list")
+    MusicPreference.objects.create(name="rock")
+
+    etag = client.get(url)["ETag"]
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    MusicPreference.objects.create(name="jazz")
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+    etag = response["ETag"]
+    MusicPreference.objects.filter(name="jazz").update(name="blues")
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert "blues" in [item["name"] for item in response.json()]
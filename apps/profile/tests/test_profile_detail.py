@@ -4,6 +4,12 @@
 from apps.users.tests.conftest import authenticated_user
 from apps.profile.tests.conftest import user_init_profile
 import uuid
+from django.contrib.auth import get_user_model
+from apps.profile.models import MusicPreference, Profile
+from apps.users.models import Friendship
+
+
+User = get_user_model()
 
 
 def test_profile_view_own(authenticated_user):
@@ -46,3 +52,40 @@ def test_profile_view_not_found(authenticated_user):
     response = client.get(url)
     assert response.status_code == 404
     assert response.json() == {'detail': 'No Profile matches the given query.'}
+
+
+def test_profile_view_not_modified(authenticated_user):
+    """
+        # Get another user's profile, then again with its ETag while things change
+        # Ensure 304 while unchanged, 200 after a preference change, a new friendship or a rename
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    other = User.objects.create_user(username="other123", email="other123@example.com", password="somePassword123")
+    Profile.objects.create(user=other, friend_info="Hello Friend !", friend_info_visibility="friends")
+    url = reverse('profile:profile-detail', kwargs={'pk': other.id})
+
+    etag = client.get(url)["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    other.profile.music_preferences.add(MusicPreference.objects.create(name="rock"))
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json()["music_preferences"] == ["rock"]
+    assert "friend_info" not in response.json()
+
+    etag = response["ETag"]
+    Friendship.objects.create(from_user=user, to_user=other, status="accepted")
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json()["friend_info"] == "Hello Friend !"
+
+    etag = response["ETag"]
+    MusicPreference.objects.filter(name="rock").update(name="hard rock")
+    User.objects.filter(id=other.id).update(username="other456")
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json()["music_preferences"] == ["hard rock"]
+    assert response.json()["user"] == "other456"
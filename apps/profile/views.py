@@ -8,6 +8,8 @@
 from .utils import can_view_field
 from django.shortcuts import get_object_or_404
 from .models import Profile, MusicPreference
+from .etags import profile_detail_etag, music_preferences_etag
+from core.utils.conditional import conditional
 from rest_framework.decorators import api_view, authentication_classes
 from .docs import *
 
@@ -34,6 +36,7 @@ def profile_update(request):
 @api_view(['GET'])
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
+@conditional(profile_detail_etag)
 def profile_detail(request, pk):
     profile = get_object_or_404(Profile, user=pk)
     viewer = request.user
@@ -87,6 +90,7 @@ def delete_avatar(request):
 @api_view(['GET'])
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
+@conditional(music_preferences_etag)
 def music_preferences_list(request):
     preferences = MusicPreference.objects.all()
     serializer = MusicPreferenceSerializer(preferences, many=True)
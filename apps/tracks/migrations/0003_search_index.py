@@ -0,0 +1,49 @@
+# Generated by Django 5.1 on 2026-10-18 06:28
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+TRIGRAM_INDEXES = {
+    'track_name_trgm': 'name',
+    'track_artist_trgm': 'artist',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm is a contrib extension: skip the typo-tolerant indexes on
+    # servers that don't ship it, search then falls back to full-text only.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    table = schema_editor.quote_name(apps.get_model('tracks', 'Track')._meta.db_table)
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)')
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracks', '0002_track_picture_medium_track_picture_small'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='track',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('name', 'artist', 'album', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='track',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='track_search_vector'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
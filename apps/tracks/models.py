@@ -2,6 +2,8 @@
 # akolgano
 # ================================
 
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 
 
@@ -13,6 +15,18 @@ class Track(models.Model):
     url = models.URLField(default='')
     picture_small = models.URLField(default='')
     picture_medium = models.URLField(default='')
+    search_vector = models.GeneratedField(
+        expression=SearchVector('name', 'artist', 'album', config='simple'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='track_search_vector'),
+        ]
+        # Trigram indexes on name and artist are created by migration 0003
+        # when the server ships pg_trgm (see apps/tracks/search.py).
 
     def __str__(self):
         return f"{self.name} by {self.artist}"
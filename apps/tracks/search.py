@@ -0,0 +1,55 @@
+from functools import lru_cache
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from .models import Track
+
+
+# Local catalog search: Track.search_vector (name + artist + album, GIN
+# indexed) is matched with websearch syntax, and when pg_trgm is installed
+# trigram similarity on name and artist also catches typos ("daft pnuk").
+# Results are ordered by full-text rank plus the best trigram similarity.
+
+
+class SearchParamError(ValueError):
+    pass
+
+
+@lru_cache(maxsize=None)
+def trigram_available():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def parse_search_params(request, default_limit, max_limit):
+    try:
+        offset = int(request.GET.get('offset', 0) or 0)
+        limit = int(request.GET.get('limit', default_limit))
+    except (TypeError, ValueError):
+        raise SearchParamError('offset and limit must be integers.')
+    if offset < 0 or limit < 1:
+        raise SearchParamError('offset must be >= 0 and limit >= 1.')
+    return offset, min(limit, max_limit)
+
+
+def search_catalog(query, offset, limit):
+    """
+    Ranked page of local tracks matching `query`.
+    Returns (tracks, has_more).
+    """
+    search_query = SearchQuery(query, search_type='websearch', config='simple')
+    match = Q(search_vector=search_query)
+    rank = SearchRank(F('search_vector'), search_query)
+    if trigram_available():
+        match |= Q(name__trigram_similar=query) | Q(artist__trigram_similar=query)
+        rank = rank + Greatest(TrigramSimilarity('name', query), TrigramSimilarity('artist', query))
+
+    rows = list(
+        Track.objects.filter(match)
+        .defer('search_vector')
+        .annotate(rank=rank)
+        .order_by('-rank', 'id')[offset:offset + limit + 1]
+    )
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,146 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from apps.tracks.models import Track
+from apps.tracks.search import trigram_available
+
+
+def deezer_track(deezer_id, title):
+    return {
+        "id": deezer_id,
+        "title": title,
+        "link": f"https://www.deezer.com/track/{deezer_id}",
+        "artist": {"name": "Daft Punk"},
+        "album": {
+            "title": "Discovery",
+            "cover_small": "https://cdn.example.com/small.jpg",
+            "cover_medium": "https://cdn.example.com/medium.jpg",
+        },
+    }
+
+
+@pytest.mark.django_db
+@patch('apps.tracks.views.DeezerClient')
+def test_search_tracks_upserts_results(mock_deezer_client):
+    """
+        # One result is already in the catalog with an old title, one is new
+        # Ensure both are saved once and returned in Deezer's order
+    """
+    existing = Track.objects.create(name="Old title", artist="Daft Punk", deezer_track_id="3135556")
+    mock_deezer_client.return_value.search_tracks.return_value = {
+        "data": [deezer_track(3135553, "One More Time"), deezer_track(3135556, "Harder, Better, Faster, Stronger")],
+    }
+
+    response = APIClient().get(reverse("search_tracks"), {"query": "daft punk"})
+
+    assert response.status_code == 200
+    tracks = response.json()["tracks"]
+    assert [track["deezer_track_id"] for track in tracks] == ["3135553", "3135556"]
+    assert tracks[1]["id"] == existing.id
+    assert tracks[1]["name"] == "Harder, Better, Faster, Stronger"
+    assert Track.objects.count() == 2
+    mock_deezer_client.return_value.search_tracks.assert_called_once_with("daft punk")
+
+
+@pytest.mark.django_db
+@patch('apps.tracks.views.DeezerClient')
+def test_search_tracks_deezer_unavailable(mock_deezer_client):
+    """
+        # Deezer request fails
+        # Ensure an empty list is returned
+    """
+    mock_deezer_client.return_value.search_tracks.return_value = None
+
+    response = APIClient().get(reverse("search_tracks"), {"query": "daft punk"})
+
+    assert response.status_code == 200
+    assert response.json() == {"tracks": []}
+
+
+@pytest.mark.django_db
+@patch('apps.tracks.views.DeezerClient')
+def test_search_tracks_missing_album(mock_deezer_client):
+    """
+        # One Deezer result has no album, another an album without covers
+        # Ensure the search still succeeds and both are saved without pictures
+    """
+    no_album = deezer_track(1, "Single")
+    del no_album["album"]
+    no_cover = deezer_track(2, "Bonus")
+    no_cover["album"] = {"title": "Rarities"}
+    mock_deezer_client.return_value.search_tracks.return_value = {"data": [no_album, no_cover]}
+
+    response = APIClient().get(reverse("search_tracks"), {"query": "daft punk"})
+
+    assert response.status_code == 200
+    assert [track["name"] for track in response.json()["tracks"]] == ["Single", "Bonus"]
+    assert Track.objects.get(deezer_track_id="1").album is None
+    assert Track.objects.get(deezer_track_id="2").picture_small == ""
+
+
+def create_catalog():
+    for i, (name, artist, album) in enumerate([
+        ("One More Time", "Daft Punk", "Discovery"),
+        ("Digital Love", "Daft Punk", "Discovery"),
+        ("Aerodynamic", "Daft Punk", "Discovery"),
+        ("Around the World", "Daft Punk", "Homework"),
+        ("Da Funk", "Daft Punk", "Homework"),
+        ("Discovery", "Daft Punk", "Discovery"),
+        ("Clair de lune", "Debussy", "Suite bergamasque"),
+    ]):
+        Track.objects.create(name=name, artist=artist, album=album, deezer_track_id=str(i))
+
+
+@pytest.mark.django_db
+@patch('apps.tracks.views.DeezerClient')
+def test_search_tracks_served_locally(mock_deezer_client):
+    """
+        # Catalog already has enough matches over name, artist and album
+        # Ensure Deezer is not called, best match first, next_offset for the next page
+    """
+    create_catalog()
+    client = APIClient()
+
+    response = client.get(reverse("search_tracks"), {"query": "daft punk discovery", "limit": 3})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["tracks"][0]["name"] == "Discovery"
+    assert len(data["tracks"]) == 3
+    assert data["next_offset"] == 3
+    mock_deezer_client.assert_not_called()
+
+    response = client.get(reverse("search_tracks"), {"query": "daft punk discovery", "limit": 3, "offset": 3})
+
+    assert len(response.json()["tracks"]) == 1
+    assert "next_offset" not in response.json()
+
+
+@pytest.mark.django_db
+def test_search_tracks_invalid_limit():
+    """
+        # limit is not an integer
+        # Ensure 400
+    """
+    response = APIClient().get(reverse("search_tracks"), {"query": "daft punk", "limit": "ten"})
+
+    assert response.status_code == 400
+    assert response.json() == {"error": "offset and limit must be integers."}
+
+
+@pytest.mark.django_db
+@patch('apps.tracks.views.DeezerClient')
+def test_search_tracks_typo(mock_deezer_client):
+    """
+        # Misspelled artist
+        # Ensure trigram similarity still finds the catalog tracks
+    """
+    if not trigram_available():
+        pytest.skip("pg_trgm is not installed on this server")
+    create_catalog()
+
+    response = APIClient().get(reverse("search_tracks"), {"query": "daft pnuk"})
+
+    assert len(response.json()["tracks"]) == 6
+    mock_deezer_client.assert_not_called()
@@ -1,5 +1,6 @@
 from .models import Track
-import requests
+from .search import SearchParamError, parse_search_params, search_catalog
+from django.conf import settings
 from django.http import JsonResponse
 from apps.deezer.deezer_client import DeezerClient
 from django.views.decorators.csrf import csrf_exempt
@@ -9,43 +10,68 @@ def get_deezer_tracks(query):
     """
     Fetch tracks from Deezer API based on a search query.
     """
-    url = f"http://127.0.0.1:8000/deezer/search/?q={query}"
-    response = requests.get(url)
-
-    if response.status_code == 200:
-        tracks = response.json().get('data', [])
-        return tracks
-    else:
+    results = DeezerClient().search_tracks(query)
+    if results is None:
         return None
+    return results.get('data', [])
 
 
-def search_tracks(request):
-    query = request.GET.get('query', '')
-    tracks = []
+def upsert_deezer_tracks(tracks_data):
+    """
+    Insert or refresh Deezer search results in a single statement, keyed on
+    deezer_track_id. Returns the saved rows in Deezer's result order.
+    """
+    tracks = {}
+    for track_data in tracks_data:
+        # Some Deezer items come without an album or cover art
+        album = track_data.get('album') or {}
+        tracks[str(track_data['id'])] = Track(
+            deezer_track_id=str(track_data['id']),
+            name=track_data['title'],
+            artist=track_data['artist']['name'],
+            album=album.get('title'),
+            url=track_data.get('link', ''),
+            picture_small=album.get('cover_small') or '',
+            picture_medium=album.get('cover_medium') or '',
+        )
+    if not tracks:
+        return []
+    return Track.objects.bulk_create(
+        list(tracks.values()),
+        update_conflicts=True,
+        unique_fields=['deezer_track_id'],
+        update_fields=['name', 'artist', 'album', 'url', 'picture_small', 'picture_medium'],
+    )
 
-    if query:
-        tracks_data = get_deezer_tracks(query)
 
+def search_tracks(request):
+    """
+    Search the local catalog; Deezer is only consulted when the first page
+    has fewer than TRACK_SEARCH_MIN_LOCAL_RESULTS matches, and its results
+    are saved to the catalog for the next searches.
+    """
+    query = ' '.join(request.GET.get('query', '').split())
+    if not query:
+        return JsonResponse({'tracks': []})
+
+    try:
+        offset, limit = parse_search_params(
+            request, settings.TRACK_SEARCH_PAGE_SIZE, settings.TRACK_SEARCH_MAX_PAGE_SIZE
+        )
+    except SearchParamError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    tracks, has_more = search_catalog(query, offset, limit)
+    if offset == 0 and len(tracks) < min(limit, settings.TRACK_SEARCH_MIN_LOCAL_RESULTS):
+        tracks_data = get_deezer_tracks(query)
         if tracks_data:
-            for track_data in tracks_data:
-                Track.objects.update_or_create(
-                    deezer_track_id=track_data['id'],
-                    defaults={
-                        'name': track_data['title'],
-                        'artist': track_data['artist']['name'],
-                        'album': track_data['album']['title'],
-                        'url': track_data['link'],
-                        'picture_small': track_data['album']['cover_small'],
-                        'picture_medium': track_data['album']['cover_medium'],
-
-                    }
-                )
-
-            tracks = Track.objects.filter(name__icontains=query)
-        else:
-            tracks = []
+            tracks, has_more = upsert_deezer_tracks(tracks_data)[:limit], False
 
-    return JsonResponse({'tracks': list(tracks.values())})
+    fields = [field.attname for field in Track._meta.concrete_fields if field.name != 'search_vector']
+    data = {'tracks': [{name: getattr(track, name) for name in fields} for track in tracks]}
+    if has_more:
+        data['next_offset'] = offset + limit
+    return JsonResponse(data)
 
 
 @csrf_exempt
@@ -578,6 +578,15 @@
 get_friends_list_schema = extend_schema(
     methods=["GET"],
     summary="Get list of friends for the authenticated user",
+    parameters=[
+        OpenApiParameter(
+            name="If-None-Match",
+            location=OpenApiParameter.HEADER,
+            type=str,
+            required=False,
+            description="ETag of a previous response; 304 if nothing changed since",
+        ),
+    ],
     responses={
         200: OpenApiResponse(
             description="List of friends",
@@ -602,6 +611,7 @@
                 )
             ]
         ),
+        304: OpenApiResponse(description="Not modified since the ETag given in If-None-Match"),
         400: OpenApiResponse(
             description="Error retrieving friends list",
             response=ErrorResponseSerializer,
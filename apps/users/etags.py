@@ -0,0 +1,25 @@
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Count, Max, Q
+from core.utils.conditional import make_etag
+from .models import Friendship
+
+
+def friends_list_etag(request):
+    """
+    The list changes when a friendship is accepted (updated_at), removed
+    (count), when a friend's profile changes (avatar) or a friend is renamed
+    (usernames of both sides); one aggregate query.
+    """
+    user = request.user
+    validators = Friendship.objects.filter(
+        Q(from_user=user) | Q(to_user=user),
+        status='accepted'
+    ).aggregate(
+        count=Count('id'),
+        updated_at=Max('updated_at'),
+        from_profile=Max('from_user__profile__updated_at'),
+        to_profile=Max('to_user__profile__updated_at'),
+        from_usernames=ArrayAgg('from_user__username', ordering='id'),
+        to_usernames=ArrayAgg('to_user__username', ordering='id'),
+    )
+    return make_etag(user.pk, *validators.values())
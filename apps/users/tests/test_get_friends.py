@@ -69,3 +69,52 @@ def test_get_friends_no_friends(authenticated_user):
     response = client.get(url)
     assert response.status_code == 200
     assert response.json() == {'friends': []}
+
+
+@pytest.mark.django_db
+def test_get_friends_not_modified(authenticated_user):
+    """
+        # List friends, then again with the ETag before and after accepting a new friend
+        # Ensure 304 while unchanged and 200 with both friends afterwards
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    friend1 = User.objects.create_user(username="friend1", email="friend1@example.com", password="somePassword123")
+    friend2 = User.objects.create_user(username="friend2", email="friend2@example.com", password="somePassword123")
+    Friendship.objects.create(from_user=friend1, to_user=user, status="accepted")
+    pending = Friendship.objects.create(from_user=friend2, to_user=user, status="pending")
+
+    url = reverse("users:get_friends")
+    etag = client.get(url)["ETag"]
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    client.post(reverse("users:accept_friend_request", args=[pending.id]))
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert {f["friend_username"] for f in response.json()["friends"]} == {"friend1", "friend2"}
+
+
+@pytest.mark.django_db
+def test_get_friends_friend_renamed(authenticated_user):
+    """
+        # List friends, then a friend renames their account
+        # Ensure the old ETag gets a 200 with a new ETag and the new username
+    """
+    user, token = authenticated_user
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    friend = User.objects.create_user(username="friend1", email="friend1@example.com", password="somePassword123")
+    Friendship.objects.create(from_user=friend, to_user=user, status="accepted")
+
+    url = reverse("users:get_friends")
+    etag = client.get(url)["ETag"]
+    User.objects.filter(id=friend.id).update(username="friend1_renamed")
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert [f["friend_username"] for f in response.json()["friends"]] == ["friend1_renamed"]
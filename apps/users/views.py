@@ -14,6 +14,8 @@
 from django.utils import timezone
 from .serializers import UserSerializer, FriendSerializer
 from .models import Friendship
+from .etags import friends_list_etag
+from core.utils.conditional import conditional
 from django.http import JsonResponse
 from django.db.models import Q
 from . import email_sender
@@ -148,6 +150,7 @@ def remove_friend(request, user_id):
 @api_view(['GET'])
 @authentication_classes([TokenAuthentication])
 @permission_classes([IsAuthenticated])
+@conditional(friends_list_etag)
 def get_friends_list(request):
     user = request.user
     profile_picture_url = 'TODO'
@@ -12,15 +12,15 @@
 from django.core.asgi import get_asgi_application
 #from channels.staticfiles import StaticFilesWrapper
 from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
-from channels.auth import AuthMiddlewareStack
 from channels.routing import ProtocolTypeRouter, URLRouter
 from apps.playlists.routing import websocket_urlpatterns
+from core.utils.custom_auth.websocket import TokenAuthMiddlewareStack
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = ProtocolTypeRouter({
     "http": ASGIStaticFilesHandler(get_asgi_application()),
-    "websocket": AuthMiddlewareStack(
+    "websocket": TokenAuthMiddlewareStack(
         URLRouter(
             websocket_urlpatterns
         )
@@ -45,6 +45,7 @@
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'apps.deezer',
@@ -191,12 +192,30 @@
     }
 }
 
+# Keyset pagination for the saved/public playlist and event listings,
+# applied only when the client sends ?cursor or ?limit
+PLAYLIST_PAGE_SIZE = 50
+PLAYLIST_MAX_PAGE_SIZE = 200
+
+# Nearby public events (apps/playlists/nearby.py), distances in meters
+NEARBY_EVENTS_RADIUS = 5000
+NEARBY_EVENTS_MAX_RADIUS = 50000
+NEARBY_EVENTS_PAGE_SIZE = 20
+NEARBY_EVENTS_MAX_PAGE_SIZE = 100
+
+# Track search (apps/tracks/search.py)
+TRACK_SEARCH_PAGE_SIZE = 20
+TRACK_SEARCH_MAX_PAGE_SIZE = 100
+TRACK_SEARCH_MIN_LOCAL_RESULTS = 5  # fewer local matches -> ask Deezer
+
 # Channel layer for Redis
 CHANNEL_LAYERS = {
     'default': {
         'BACKEND': 'channels_redis.core.RedisChannelLayer',
         'CONFIG': {
             'hosts': [('redis', 6379)],
+            # Messages queued per channel before channels_redis drops new ones
+            'capacity': int(os.getenv('CHANNEL_LAYER_CAPACITY', '100')),
         },
     },
 }
@@ -205,6 +224,68 @@
 REDIS_HOST = os.getenv('REDIS_HOST', 'redis')
 REDIS_PORT = os.getenv('REDIS_PORT', '6379')
 
+# Cached playlist access decisions (apps/playlists/access.py)
+PLAYLIST_ACCESS_CACHE_ENABLED = True
+PLAYLIST_ACCESS_CACHE_TTL = 60 * 10
+PLAYLIST_ACCESS_REDIS_TIMEOUT = 0.2
+
+# Encoded get_playlist_info / playlist_tracks responses per (playlist, revision)
+# (apps/playlists/snapshots.py): per-process LRU + shared Redis
+PLAYLIST_SNAPSHOT_CACHE_ENABLED = True
+PLAYLIST_SNAPSHOT_CACHE_SIZE = 512
+PLAYLIST_SNAPSHOT_TTL = 60 * 10
+PLAYLIST_SNAPSHOT_REDIS_TIMEOUT = 0.2
+
+# Websocket token auth (core/utils/custom_auth/websocket.py): token -> user cache
+WS_TOKEN_CACHE_TTL = 60
+WS_TOKEN_CACHE_SIZE = 10000
+
+# PlaylistConsumer: queued deltas per socket before the backlog is replaced
+# by one snapshot (apps/playlists/outbox.py)
+PLAYLIST_WS_MAX_PENDING_DELTAS = 50
+
+# Listeners per playlist room (apps/playlists/presence.py), in seconds
+PRESENCE_TTL = 45
+PRESENCE_HEARTBEAT = 15
+PRESENCE_FLUSH_INTERVAL = 1
+PRESENCE_REDIS_TIMEOUT = 0.2
+
+# Most tracks accepted by one add_bulk request
+PLAYLIST_BULK_ADD_MAX = 500
+
+# Serve add/move/remove/vote from apps/playlists/async_views.py
+PLAYLIST_ASYNC_VIEWS = os.getenv('PLAYLIST_ASYNC_VIEWS', '0') == '1'
+
+# Buffer event votes in Redis and flush them with `manage.py run_vote_buffer`
+VOTE_BUFFER_ENABLED = os.getenv('VOTE_BUFFER_ENABLED', '0') == '1'
+VOTE_BUFFER_TICK_MS = int(os.getenv('VOTE_BUFFER_TICK_MS', '250'))
+VOTE_BUFFER_FLUSH_BATCH = 500
+VOTE_BUFFER_VOTERS_TTL = 60 * 60 * 24
+
+# run_vote_scheduler: longest pause between vote window checks (seconds)
+VOTE_SCHEDULER_MAX_SLEEP = 30
+
+# Deezer HTTP client (apps/deezer/deezer_client.py)
+DEEZER_API_URL = os.getenv('DEEZER_API_URL', 'https://api.deezer.com')
+DEEZER_TIMEOUT = (3.05, 10)  # (connect, read) seconds
+DEEZER_POOL_SIZE = 10
+DEEZER_MAX_RETRIES = 3
+DEEZER_BACKOFF_FACTOR = 0.3
+
+# Deezer response cache (apps/deezer/cache.py): per-process LRU + shared Redis
+DEEZER_CACHE_ENABLED = os.getenv('DEEZER_CACHE_ENABLED', '1') == '1'
+DEEZER_CACHE_REDIS = True
+DEEZER_CACHE_REDIS_TIMEOUT = 0.2
+DEEZER_CACHE_SIZE = 2048
+DEEZER_CACHE_TTL = {  # seconds an entry is fresh, per endpoint
+    'track': 60 * 60 * 24,
+    'album': 60 * 60 * 24,
+    'artist': 60 * 60 * 6,
+    'search': 60 * 10,
+}
+DEEZER_CACHE_NEGATIVE_TTL = 60
+DEEZER_CACHE_STALE_TTL = 60 * 60  # served while refreshed in the background
+
 # Email settings
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
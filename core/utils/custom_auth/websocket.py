@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs
+from channels.auth import AuthMiddlewareStack
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+
+# DRF token authentication for websockets. The Flutter client has no session
+# cookie, so it passes its token either in the query string
+# (/ws/playlists/1/?token=<key>) or as the subprotocol pair ["token", <key>];
+# in the latter case the consumer must accept with the "token" subprotocol,
+# which is recorded in scope['auth_subprotocol'].
+#
+# token -> user lookups are cached in memory for WS_TOKEN_CACHE_TTL seconds so
+# that the connection burst at the start of an event costs one query per
+# distinct token. Deleting a token (logout) evicts it from this process's
+# cache; other processes notice within the TTL.
+
+SUBPROTOCOL = 'token'
+
+
+class TokenCache:
+    def __init__(self, ttl, size):
+        self.ttl = ttl
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        (hit, user): user is None for a key known to be invalid.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return False, None
+            self.entries.move_to_end(key)
+            return True, entry[1]
+
+    def set(self, key, user):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, user)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def discard(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+token_cache = TokenCache(settings.WS_TOKEN_CACHE_TTL, settings.WS_TOKEN_CACHE_SIZE)
+
+
+@receiver(post_delete, sender=Token)
+def forget_token(sender, instance, **kwargs):
+    token_cache.discard(instance.key)
+
+
+def token_from_scope(scope):
+    """
+    (key, via_subprotocol) or (None, False).
+    """
+    subprotocols = scope.get('subprotocols') or []
+    if len(subprotocols) >= 2 and subprotocols[0] == SUBPROTOCOL:
+        return subprotocols[1], True
+    keys = parse_qs(scope.get('query_string', b'').decode()).get('token')
+    if keys:
+        return keys[0], False
+    return None, False
+
+
+@database_sync_to_async
+def load_user(key):
+    token = Token.objects.select_related('user').filter(key=key).first()
+    if token is None or not token.user.is_active:
+        return None
+    return token.user
+
+
+async def get_user(key):
+    hit, user = token_cache.get(key)
+    if not hit:
+        user = await load_user(key)
+        token_cache.set(key, user)
+    return user
+
+
+class TokenAuthMiddleware(BaseMiddleware):
+    """
+    Sets scope['user'] from a DRF token when one is given, otherwise leaves
+    what the session middleware found.
+    """
+    async def __call__(self, scope, receive, send):
+        key, via_subprotocol = token_from_scope(scope)
+        if key:
+            scope = dict(scope)
+            scope['user'] = await get_user(key) or AnonymousUser()
+            if via_subprotocol:
+                scope['auth_subprotocol'] = SUBPROTOCOL
+        return await super().__call__(scope, receive, send)
+
+
+def TokenAuthMiddlewareStack(inner):
+    return AuthMiddlewareStack(TokenAuthMiddleware(inner))
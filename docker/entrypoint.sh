@@ -40,6 +40,14 @@ fi
 # exec gunicorn pong.wsgi:application --bind 0.0.0.0:8000
 
 
+echo "Starting vote window scheduler..."
+python manage.py run_vote_scheduler &
+
+if [ "$VOTE_BUFFER_ENABLED" = "1" ]; then
+  echo "Starting vote buffer worker..."
+  python manage.py run_vote_buffer &
+fi
+
 echo "Starting development server..."
 #exec python manage.py runserver 0.0.0.0:8000
 #exec daphne -b 0.0.0.0 -p 8000 core.asgi:application